@@ -0,0 +1,264 @@
+"""
+Bulk exports of parliament models. Rows are read with server-side cursors
+(COPY TO STDOUT for CSV, chunked iterator otherwise) and encoded chunk by
+chunk, so memory use does not depend on export size.
+"""
+
+from collections import OrderedDict
+import csv
+import io
+import json
+from queue import Empty, Full, Queue
+import threading
+
+from django.contrib.postgres.fields import ArrayField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+
+from parliament.models import (
+    Amendment,
+    Bill,
+    DebateAppearance,
+    Interpellation,
+    Voting,
+    VotingVote
+)
+from parliament_stats.models import ClubStats, GlobalStats, MemberStats
+
+CHUNK_SIZE = 2000
+
+
+class Export:
+    """Exported model with lookup of its period number"""
+
+    def __init__(self, model, period_lookup, exclude=()):
+        self.model = model
+        self.period_lookup = period_lookup
+        self.fields = [
+            x for x in model._meta.concrete_fields if x.name not in exclude
+        ]
+
+    @property
+    def columns(self):
+        return [x.attname for x in self.fields]
+
+    def queryset(self, period_num=None):
+        queryset = self.model._base_manager.all()
+        if period_num is not None:
+            queryset = queryset.filter(**{self.period_lookup: period_num})
+        return queryset.values_list(*self.columns).order_by('pk')
+
+
+EXPORTS = OrderedDict((
+    ('votings', Export(Voting, 'session__period__period_num')),
+    ('voting-votes', Export(VotingVote, 'voting__session__period__period_num')),
+    # text is emptied once transcripts are moved into DebateTranscript
+    ('debate-appearances', Export(
+        DebateAppearance, 'session__period__period_num', exclude=('text',))),
+    ('bills', Export(Bill, 'press__period__period_num')),
+    ('amendments', Export(Amendment, 'press__period__period_num')),
+    ('interpellations', Export(Interpellation, 'period__period_num')),
+    ('global-stats', Export(GlobalStats, 'period__period_num')),
+    ('club-stats', Export(ClubStats, 'club__period__period_num')),
+    ('member-stats', Export(MemberStats, 'member__period__period_num')),
+))
+
+
+class ExportUnavailable(Exception):
+    """Requested format can not be produced"""
+
+
+class _CopyBuffer(io.RawIOBase):
+    """File object handing COPY output over to the streaming thread"""
+
+    def __init__(self, queue, cancelled):
+        super().__init__()
+        self.queue = queue
+        self.cancelled = cancelled
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        while True:
+            if self.cancelled.is_set():
+                raise IOError('Export cancelled')
+            try:
+                self.queue.put(bytes(data), timeout=1)
+                return len(data)
+            except Full:
+                continue
+
+
+def _copy_worker(alias, sql, queue, cancelled):
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.cursor.copy_expert(sql, _CopyBuffer(queue, cancelled))
+        queue.put(None)
+    except Exception as exc:
+        queue.put(exc)
+    finally:
+        connections[alias].close()
+
+
+def stream_csv(export, period_num=None):
+    """CSV produced by Postgres COPY TO STDOUT"""
+    header = io.StringIO()
+    csv.writer(header).writerow(export.columns)
+    yield header.getvalue().encode()
+
+    queryset = export.queryset(period_num)
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        sql = cursor.mogrify(sql, params).decode()
+
+    queue = Queue(maxsize=16)
+    cancelled = threading.Event()
+    worker = threading.Thread(
+        target=_copy_worker,
+        args=(queryset.db, 'COPY ({}) TO STDOUT WITH (FORMAT csv)'.format(sql), queue, cancelled),
+        daemon=True
+    )
+    worker.start()
+    try:
+        while True:
+            try:
+                chunk = queue.get(timeout=1)
+            except Empty:
+                continue
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        cancelled.set()
+
+
+def stream_jsonl(export, period_num=None):
+    """One JSON object per line"""
+    columns = export.columns
+    lines = []
+    for row in export.queryset(period_num).iterator(chunk_size=CHUNK_SIZE):
+        lines.append(json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False))
+        if len(lines) >= CHUNK_SIZE:
+            yield ('\n'.join(lines) + '\n').encode()
+            lines = []
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+def _arrow_schema(export):
+    import pyarrow as pa
+
+    types = (
+        (models.BooleanField, pa.bool_()),
+        (models.AutoField, pa.int64()),
+        (models.ForeignKey, pa.int64()),
+        (models.IntegerField, pa.int64()),
+        (models.FloatField, pa.float64()),
+        (models.DateTimeField, pa.timestamp('us')),
+        (models.DateField, pa.date32()),
+        (ArrayField, pa.list_(pa.string())),
+    )
+    fields = []
+    for field in export.fields:
+        arrow_type = next(
+            (arrow_type for cls, arrow_type in types if isinstance(field, cls)), pa.string())
+        fields.append(pa.field(field.attname, arrow_type, nullable=field.null))
+    return pa.schema(fields)
+
+
+def _arrow_batches(export, schema, period_num=None):
+    import pyarrow as pa
+
+    rows = []
+    for row in export.queryset(period_num).iterator(chunk_size=CHUNK_SIZE):
+        rows.append(row)
+        if len(rows) >= CHUNK_SIZE:
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(column, type=x.type) for column, x in zip(zip(*rows), schema)],
+                schema=schema)
+            rows = []
+    if rows:
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(column, type=x.type) for column, x in zip(zip(*rows), schema)],
+            schema=schema)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Writable file collecting written bytes until they are drained"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ExportUnavailable('Parquet and Arrow exports require pyarrow')
+    return pyarrow
+
+
+def stream_parquet(export, period_num=None):
+    """Parquet file, one row group per chunk"""
+    pa = _import_pyarrow()
+    schema = _arrow_schema(export)
+    sink = _ChunkSink()
+    writer = pa.parquet.ParquetWriter(sink, schema, compression='zstd')
+    for batch in _arrow_batches(export, schema, period_num):
+        writer.write_table(pa.Table.from_batches([batch], schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_arrow(export, period_num=None):
+    """Arrow IPC stream, one record batch per chunk"""
+    pa = _import_pyarrow()
+    schema = _arrow_schema(export)
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    for batch in _arrow_batches(export, schema, period_num):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+FORMATS = OrderedDict((
+    ('csv', (stream_csv, 'text/csv; charset=utf-8')),
+    ('jsonl', (stream_jsonl, 'application/x-ndjson; charset=utf-8')),
+    ('parquet', (stream_parquet, 'application/vnd.apache.parquet')),
+    ('arrow', (stream_arrow, 'application/vnd.apache.arrow.stream')),
+))
+
+
+def stream_export(name, fmt, period_num=None):
+    """Generator of export bytes, raises ExportUnavailable for missing pyarrow"""
+    export = EXPORTS[name]
+    stream = FORMATS[fmt][0]
+    if fmt in ('parquet', 'arrow'):
+        _import_pyarrow()
+    return stream(export, period_num)
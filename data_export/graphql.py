@@ -0,0 +1,60 @@
+"""
+GraphQL listing of dataset snapshots, read from snapshot manifests on disk
+"""
+
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+import graphene
+from graphene import ObjectType
+
+from data_export.snapshots import list_snapshots
+
+
+class DatasetSnapshotFileType(ObjectType):
+
+    name = graphene.String()
+    format = graphene.String()
+    file = graphene.String()
+    rows = graphene.Int()
+    size = graphene.Float(description='File size in bytes')
+    sha256 = graphene.String()
+    url = graphene.String()
+
+
+class DatasetSnapshotType(ObjectType):
+
+    period_num = graphene.Int()
+    version = graphene.String()
+    created = graphene.DateTime()
+    files = graphene.List(DatasetSnapshotFileType)
+
+
+class DataExportQueries(ObjectType):
+
+    dataset_snapshots = graphene.List(
+        DatasetSnapshotType,
+        period_num=graphene.Int(),
+        all_versions=graphene.Boolean(default_value=False)
+    )
+
+    def resolve_dataset_snapshots(self, info, period_num=None, all_versions=False):
+        snapshots = []
+        for manifest in list_snapshots(period_num, all_versions):
+            files = [
+                DatasetSnapshotFileType(
+                    url=info.context.build_absolute_uri(reverse('snapshot', kwargs={
+                        'period_num': manifest['period_num'],
+                        'version': manifest['version'],
+                        'filename': x['file'],
+                    })),
+                    **x
+                )
+                for x in manifest['files']
+            ]
+            snapshots.append(DatasetSnapshotType(
+                period_num=manifest['period_num'],
+                version=manifest['version'],
+                created=parse_datetime(manifest['created']),
+                files=files
+            ))
+        return snapshots
@@ -0,0 +1,52 @@
+"""
+Build dataset snapshots of periods. Meant to run after each ingestion,
+unchanged periods keep their current snapshot version.
+"""
+
+from django.core.management.base import BaseCommand
+
+from data_export.snapshots import SNAPSHOT_FORMATS, build_snapshot
+from parliament.models import Period
+
+
+class Command(BaseCommand):
+
+    help = 'Write compressed per-period dumps with manifest into SNAPSHOT_ROOT'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            action='append',
+            dest='periods',
+            type=int,
+            help='Period number to snapshot, can be repeated, defaults to all periods'
+        )
+        parser.add_argument(
+            '--format',
+            action='append',
+            dest='formats',
+            choices=sorted(SNAPSHOT_FORMATS),
+            help='Snapshot file format, can be repeated, defaults to csv and parquet'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store',
+            dest='keep',
+            type=int,
+            default=3,
+            help='Number of snapshot versions kept per period'
+        )
+
+    def handle(self, *args, **options):
+        periods = Period.objects.all()
+        if options['periods']:
+            periods = periods.filter(period_num__in=options['periods'])
+
+        for period in periods:
+            manifest = build_snapshot(
+                period,
+                formats=options['formats'] or ('csv', 'parquet'),
+                keep=options['keep']
+            )
+            self.stdout.write('Period {}: snapshot {}'.format(
+                period.period_num, manifest['version']))
@@ -0,0 +1,42 @@
+"""
+Mark ingested data as changed. Conditional GraphQL requests revalidate
+against the bumped generations, so run this after every data change.
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from data_export.models import DataGeneration
+
+# apps with data served over GraphQL
+DATA_APPS = ('flatpages', 'geo', 'parliament', 'parliament_stats', 'person')
+
+
+class Command(BaseCommand):
+
+    help = 'Bump global data generation and generations of changed models'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Changed model as app_label.ModelName, can be repeated, '
+                 'defaults to all models. Models read by custom resolvers of '
+                 'other types must be listed with them.'
+        )
+
+    def handle(self, *args, **options):
+        if options['models']:
+            try:
+                models = [apps.get_model(x) for x in options['models']]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc))
+        else:
+            models = [
+                model for app_label in DATA_APPS
+                for model in apps.get_app_config(app_label).get_models()
+            ]
+
+        DataGeneration.objects.bump([x._meta.label_lower for x in models])
+        self.stdout.write('Bumped generation of {} models'.format(len(models)))
@@ -0,0 +1,61 @@
+"""
+Write GraphQL schema as SDL and introspection JSON, so clients can cache
+it instead of introspecting the API. Run after every deploy.
+"""
+
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from otvorenyparlament.introspection import (
+    introspection_result,
+    prime_cache,
+    schema_hash,
+    schema_sdl
+)
+
+
+def _write(path, content):
+    tmp_path = '{}.tmp'.format(path)
+    with open(tmp_path, 'w') as handle:
+        handle.write(content)
+    os.rename(tmp_path, path)
+
+
+class Command(BaseCommand):
+
+    help = 'Write schema.graphql and schema.json of GraphQL schema'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            action='store',
+            dest='output_dir',
+            default=os.path.join(settings.SNAPSHOT_ROOT, 'schema'),
+            help='Directory of written files, defaults to SNAPSHOT_ROOT/schema'
+        )
+        parser.add_argument(
+            '--prime-cache',
+            action='store_true',
+            dest='prime_cache',
+            help='Also store introspection result in cache, useful with shared cache backend'
+        )
+
+    def handle(self, *args, **options):
+        from otvorenyparlament.graphql import SCHEMA
+
+        if options['prime_cache']:
+            data = prime_cache(SCHEMA)
+        else:
+            data = introspection_result(SCHEMA)
+
+        os.makedirs(options['output_dir'], exist_ok=True)
+        _write(os.path.join(options['output_dir'], 'schema.graphql'), schema_sdl(SCHEMA) + '\n')
+        _write(
+            os.path.join(options['output_dir'], 'schema.json'),
+            json.dumps({'data': data}, indent=2, sort_keys=True)
+        )
+        self.stdout.write('Wrote schema {} to {}'.format(
+            schema_hash(SCHEMA), options['output_dir']))
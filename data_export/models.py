@@ -0,0 +1,41 @@
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class DataGenerationManager(models.Manager):
+
+    def bump(self, labels=()):
+        """Increase global generation and generations of given model labels"""
+        labels = {DataGeneration.GLOBAL, *labels}
+        with transaction.atomic():
+            existing = set(self.select_for_update().filter(
+                label__in=labels).values_list('label', flat=True))
+            self.filter(label__in=existing).update(
+                generation=F('generation') + 1, updated=timezone.now())
+            self.bulk_create([
+                DataGeneration(label=x, generation=1) for x in labels - existing
+            ])
+
+    def current(self, labels):
+        """Generations of given labels, labels never bumped are at generation 0"""
+        generations = dict.fromkeys(labels, 0)
+        generations.update(self.filter(label__in=labels).values_list('label', 'generation'))
+        return generations
+
+
+class DataGeneration(models.Model):
+    """
+    Counter of data changes, bumped by ingestion. Label is model label
+    (app_label.model_name) or GLOBAL for data as a whole.
+    """
+    GLOBAL = '__all__'
+
+    label = models.CharField(max_length=128, unique=True)
+    generation = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = DataGenerationManager()
+
+    def __str__(self):
+        return '{} {}'.format(self.label, self.generation)
@@ -0,0 +1,168 @@
+"""
+Versioned per-period dataset snapshots. Every export of a period is written
+as a compressed file into SNAPSHOT_ROOT/<period_num>/<version>/ together with
+manifest.json listing row counts, sizes and SHA-256 checksums. Snapshots are
+listed and served from disk only, so downloads never touch the database.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.utils import timezone
+
+from data_export.exports import EXPORTS, ExportUnavailable, stream_export
+
+MANIFEST = 'manifest.json'
+# extension of snapshot file and whether it is gzipped
+SNAPSHOT_FORMATS = {
+    'csv': ('csv.gz', True),
+    'jsonl': ('jsonl.gz', True),
+    'parquet': ('parquet', False),
+}
+
+
+def period_dir(period_num):
+    return os.path.join(settings.SNAPSHOT_ROOT, str(period_num))
+
+
+def _write_file(path, chunks, compress):
+    """Write chunks, gzip without timestamp so equal data give equal files"""
+    digest = hashlib.sha256()
+    with open(path, 'wb') as raw:
+        out = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) if compress else raw
+        for chunk in chunks:
+            out.write(chunk)
+        if compress:
+            out.close()
+    with open(path, 'rb') as written:
+        for block in iter(lambda: written.read(1 << 20), b''):
+            digest.update(block)
+    return os.path.getsize(path), digest.hexdigest()
+
+
+def _write_snapshot(period, version, tmp_dir, formats):
+    """
+    Write files and manifest of snapshot version into tmp_dir, latest
+    manifest when all files equal the latest snapshot
+    """
+    files = []
+    for name, export in EXPORTS.items():
+        rows = export.queryset(period.period_num).count()
+        for fmt in formats:
+            extension, compress = SNAPSHOT_FORMATS[fmt]
+            filename = '{}.{}'.format(name, extension)
+            try:
+                chunks = stream_export(name, fmt, period.period_num)
+            except ExportUnavailable:
+                continue
+            size, sha256 = _write_file(os.path.join(tmp_dir, filename), chunks, compress)
+            files.append({
+                'name': name,
+                'format': fmt,
+                'file': filename,
+                'rows': rows,
+                'size': size,
+                'sha256': sha256,
+            })
+
+    latest = latest_manifest(period.period_num)
+    if latest and [x['sha256'] for x in latest['files']] == [x['sha256'] for x in files]:
+        return latest
+
+    manifest = {
+        'period_num': period.period_num,
+        'version': version,
+        'created': timezone.now().isoformat(),
+        'files': files,
+    }
+    with open(os.path.join(tmp_dir, MANIFEST), 'w') as handle:
+        json.dump(manifest, handle, indent=2)
+    return manifest
+
+
+def build_snapshot(period, formats=('csv', 'parquet'), keep=3):
+    """
+    Write snapshot of period and return its manifest. New version is
+    discarded when all files equal the latest snapshot.
+    """
+    # microseconds keep versions of builds started within a second apart
+    version = timezone.now().strftime('%Y%m%d%H%M%S%f')
+    root = period_dir(period.period_num)
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.{}.'.format(version), dir=root)
+    try:
+        manifest = _write_snapshot(period, version, tmp_dir, formats)
+        if manifest['version'] != version:
+            return manifest
+        os.rename(tmp_dir, os.path.join(root, version))
+    finally:
+        # left only by failed or discarded builds
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    for old in versions(period.period_num)[keep:]:
+        shutil.rmtree(os.path.join(root, old))
+    return manifest
+
+
+def versions(period_num):
+    """Complete snapshot versions of period, newest first"""
+    root = period_dir(period_num)
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        (x for x in os.listdir(root)
+         if not x.startswith('.') and os.path.isfile(os.path.join(root, x, MANIFEST))),
+        reverse=True
+    )
+
+
+def read_manifest(period_num, version):
+    with open(os.path.join(period_dir(period_num), version, MANIFEST)) as handle:
+        return json.load(handle)
+
+
+def latest_manifest(period_num):
+    period_versions = versions(period_num)
+    if not period_versions:
+        return None
+    return read_manifest(period_num, period_versions[0])
+
+
+def list_snapshots(period_num=None, all_versions=False):
+    """Manifests of snapshots, newest version of each period unless all_versions"""
+    if period_num is not None:
+        period_nums = [period_num]
+    elif os.path.isdir(settings.SNAPSHOT_ROOT):
+        period_nums = sorted(
+            (int(x) for x in os.listdir(settings.SNAPSHOT_ROOT) if x.isdigit()), reverse=True)
+    else:
+        period_nums = []
+
+    manifests = []
+    for num in period_nums:
+        period_versions = versions(num)
+        for version in period_versions if all_versions else period_versions[:1]:
+            manifests.append(read_manifest(num, version))
+    return manifests
+
+
+def snapshot_file(period_num, version, filename):
+    """
+    Absolute path and manifest entry of snapshot file, None when it is not
+    part of snapshot. Version 'latest' stands for the newest version.
+    """
+    period_versions = versions(period_num)
+    if version == 'latest' and period_versions:
+        version = period_versions[0]
+    if version not in period_versions:
+        return None
+    entry = next(
+        (x for x in read_manifest(period_num, version)['files'] if x['file'] == filename), None)
+    if entry is None:
+        return None
+    return os.path.join(period_dir(period_num), version, filename), entry
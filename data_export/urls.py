@@ -0,0 +1,17 @@
+"""
+Export URLs
+"""
+
+from django.urls import path
+
+from data_export.views import export, snapshot
+
+
+urlpatterns = [
+    path(
+        'snapshots/<int:period_num>/<slug:version>/<str:filename>',
+        snapshot,
+        name='snapshot'
+    ),
+    path('<slug:name>.<slug:fmt>', export, name='export'),
+]
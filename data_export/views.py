@@ -0,0 +1,127 @@
+"""
+Streaming export and snapshot views
+"""
+
+import os
+
+from django.db import transaction
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotModified,
+    StreamingHttpResponse
+)
+from django.views.decorators.http import require_GET
+
+from data_export.exports import EXPORTS, FORMATS, ExportUnavailable, stream_export
+from data_export.snapshots import snapshot_file
+from otvorenyparlament.routers import on_replicas
+
+
+@require_GET
+def export(request, name, fmt):
+    """Stream whole model export, optionally filtered by ?period=<period_num>"""
+    if name not in EXPORTS or fmt not in FORMATS:
+        raise Http404('Unknown export')
+
+    period_num = request.GET.get('period')
+    if period_num is not None:
+        try:
+            period_num = int(period_num)
+        except ValueError:
+            return HttpResponseBadRequest('Malformed period number')
+
+    try:
+        content = stream_export(name, fmt, period_num)
+    except ExportUnavailable as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    response = StreamingHttpResponse(on_replicas(content), content_type=FORMATS[fmt][1])
+    response['Content-Disposition'] = 'attachment; filename="{}{}.{}"'.format(
+        name, '-{}'.format(period_num) if period_num is not None else '', fmt)
+    return response
+
+
+def _parse_range(header, size):
+    """Single byte range of Range header as (start, end), None if absent, False if invalid"""
+    if not header or not header.startswith('bytes='):
+        return None
+    if size == 0:
+        # no byte of an empty file is satisfiable
+        return False
+    ranges = header[len('bytes='):].split(',')
+    if len(ranges) != 1:
+        # multipart ranges are not supported, whole file is sent instead
+        return None
+    start, _, end = ranges[0].strip().partition('-')
+    try:
+        if not start:
+            length = int(end)
+            if length <= 0:
+                return False
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _file_chunks(path, start, length, block_size=1 << 16):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            block = handle.read(min(block_size, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+@transaction.non_atomic_requests
+@require_GET
+def snapshot(request, period_num, version, filename):
+    """
+    Serve snapshot file with ETag and single Range support. Production
+    deployments should let the web server serve SNAPSHOT_ROOT directly.
+    """
+    found = snapshot_file(period_num, version, filename)
+    if found is None:
+        raise Http404('Unknown snapshot file')
+    path, entry = found
+    size = os.path.getsize(path)
+    etag = '"{}"'.format(entry['sha256'])
+
+    if etag in [x.strip() for x in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    byte_range = _parse_range(request.META.get('HTTP_RANGE'), size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag:
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */{}'.format(size)
+    elif byte_range is None:
+        response = StreamingHttpResponse(_file_chunks(path, 0, size))
+        response['Content-Length'] = str(size)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_file_chunks(path, start, end - start + 1), status=206)
+        response['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, size)
+        response['Content-Length'] = str(end - start + 1)
+
+    response['Content-Type'] = 'application/gzip' if filename.endswith('.gz') else \
+        FORMATS[entry['format']][1]
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    if version != 'latest':
+        # versioned files never change
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
@@ -3,12 +3,67 @@ GraphQL Common utils
 """
 
 from functools import partial
+import hashlib
+import json
 
+from django.core.cache import cache
 from django.db.models import F, Q
 import graphene
 from graphene_django.filter import DjangoFilterConnectionField
 from graphql_relay.node.node import from_global_id
 from promise import Promise
+from promise.dataloader import DataLoader
+
+from data_export.models import DataGeneration
+from otvorenyparlament.slowlog import current_field, resolving
+
+
+def get_loader(info, loader_class):
+    """Per request instance of DataLoader so batches span whole query"""
+    loaders = getattr(info.context, 'dataloaders', None)
+    if loaders is None:
+        loaders = info.context.dataloaders = {}
+    if loader_class not in loaders:
+        loaders[loader_class] = loader_class()
+    return loaders[loader_class]
+
+
+class FieldDataLoader(DataLoader):
+    """
+    DataLoader running batches under the field which loaded their first
+    key, so that slow batch queries are logged with the path of that field
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields = {}
+        batch_load_fn = self.batch_load_fn
+
+        def batch_load_in_field(keys):
+            fields = [self.fields.pop(x, None) for x in keys]
+            with resolving(fields[0] if fields else None):
+                return batch_load_fn(keys)
+
+        self.batch_load_fn = batch_load_in_field
+
+    def load(self, key=None):
+        self.fields.setdefault(key, current_field())
+        return super().load(key)
+
+
+def cached(key, labels, compute):
+    """
+    Result of compute cached until data of any of given labels changes,
+    key identifies the computation and must be JSON serializable
+    """
+    cache_key = 'data-generation:{}'.format(hashlib.sha256(json.dumps(
+        [key, sorted(DataGeneration.objects.current(labels).items())], default=str
+    ).encode()).hexdigest())
+    value = cache.get(cache_key)
+    if value is None:
+        value = compute()
+        cache.set(cache_key, value, None)
+    return value
 
 
 class OrderedDjangoFilterConnectionField(DjangoFilterConnectionField):
@@ -93,7 +148,5 @@ class CountableConnectionBase(graphene.relay.Connection):
 
     total_count = graphene.Int()
     def resolve_total_count(self, info, **kwargs):
-        print(self.iterable.explain(verbose=True))
-        print(self.iterable.query)
-        print("PES")
-        return self.iterable.count()
+        # counted by resolve_connection already
+        return self.length
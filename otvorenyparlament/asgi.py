@@ -0,0 +1,46 @@
+"""
+ASGI config for otvorenyparlament project.
+
+Django views run in threads of the ASGI server, GraphQL operations are
+executed on its event loop with root fields resolved concurrently in the
+ORM thread pool (see otvorenyparlament.execution).
+
+It exposes the ASGI callable as a module-level variable named ``application``,
+serve it with e.g. ``uvicorn otvorenyparlament.asgi:application``.
+"""
+
+import asyncio
+import os
+
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+from otvorenyparlament.execution import ASGI_EVENT_LOOP
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'otvorenyparlament.settings')
+
+
+class EventLoopInstance(WsgiToAsgiInstance):
+    """Request handler passing the server event loop to views"""
+
+    async def __call__(self, scope, receive, send):
+        self.loop = asyncio.get_event_loop()
+        await super().__call__(scope, receive, send)
+
+    def build_environ(self, scope, body):
+        environ = super().build_environ(scope, body)
+        environ[ASGI_EVENT_LOOP] = self.loop
+        return environ
+
+
+class EventLoopWsgiToAsgi(WsgiToAsgi):
+
+    async def __call__(self, scope, receive, send):
+        await EventLoopInstance(self.wsgi_application)(scope, receive, send)
+
+
+application = EventLoopWsgiToAsgi(get_wsgi_application())
+
+if settings.GRAPHQL_PRELOAD_SCHEMA:
+    from otvorenyparlament.graphql import SCHEMA  # noqa: F401
@@ -0,0 +1,153 @@
+"""
+Concurrent execution of GraphQL root fields.
+
+A query operation is split into documents with a single root field each.
+The documents are executed in a bounded pool of ORM threads, every thread
+using its own database connection, and their results are merged in the
+order of the original selections. At most GRAPHQL_MAX_PARALLEL_FIELDS
+branches of one request run at once, so a single wide query can not take
+all threads and connections.
+"""
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from graphql.execution import ExecutionResult, execute
+from graphql.language import ast
+from graphql.utils.get_operation_ast import get_operation_ast
+
+from otvorenyparlament.routers import use_replicas
+from otvorenyparlament.slowlog import capture_slow_queries
+
+# WSGI environ key holding event loop of ASGI server
+ASGI_EVENT_LOOP = 'asgi.event_loop'
+# fields which must see the whole operation
+UNSPLITTABLE_FIELDS = ('_debug',)
+
+_orm_executor = None
+_orm_executor_lock = threading.Lock()
+
+
+def orm_executor():
+    """Process wide pool of threads running ORM work"""
+    global _orm_executor
+    with _orm_executor_lock:
+        if _orm_executor is None:
+            _orm_executor = ThreadPoolExecutor(
+                max_workers=settings.GRAPHQL_ORM_THREADS, thread_name_prefix='orm')
+    return _orm_executor
+
+
+def call_with_connection(func, *args, **kwargs):
+    """Run func in ORM thread, closing its connection when unusable or expired"""
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    """Await func running in the ORM thread pool"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        orm_executor(), partial(call_with_connection, func, *args, **kwargs))
+
+
+class BranchContext:
+    """
+    Context of one root field. Reads fall through to the request, while
+    per-execution state such as DataLoaders stays in the branch, because
+    loaders must not be shared between threads.
+    """
+
+    def __init__(self, context):
+        self._context = context
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+def split_operation(document_ast, operation_name=None):
+    """
+    Single root field documents of query operation, None when the operation
+    is not a query or has nothing to run concurrently
+    """
+    operation = get_operation_ast(document_ast, operation_name)
+    if operation is None or operation.operation != 'query':
+        return None
+    selections = operation.selection_set.selections
+    if len(selections) < 2 or not all(
+            isinstance(x, ast.Field) and x.name.value not in UNSPLITTABLE_FIELDS
+            for x in selections):
+        return None
+
+    fragments = [x for x in document_ast.definitions if isinstance(x, ast.FragmentDefinition)]
+    return [
+        ast.Document(definitions=[
+            ast.OperationDefinition(
+                operation=operation.operation,
+                name=operation.name,
+                variable_definitions=operation.variable_definitions,
+                directives=operation.directives,
+                selection_set=ast.SelectionSet(selections=[selection])
+            )
+        ] + fragments)
+        for selection in selections
+    ]
+
+
+def execute_branch(schema, document_ast, root_value=None, context_value=None,
+                   variable_values=None, operation_name=None, middleware=None, database=None):
+    """Execute single root field document, reading from given database alias"""
+    with use_replicas(database), capture_slow_queries():
+        return execute(
+            schema,
+            document_ast,
+            root_value=root_value,
+            context_value=BranchContext(context_value),
+            variable_values=variable_values,
+            operation_name=operation_name,
+            middleware=middleware
+        )
+
+
+def merge_results(results):
+    """Single result of branches, in order of branches"""
+    data = OrderedDict()
+    errors = []
+    for result in results:
+        errors.extend(result.errors or ())
+        if data is not None:
+            # null root field that is non-null in schema nulls the whole data
+            data = None if result.data is None else OrderedDict(data, **result.data)
+    return ExecutionResult(data=data, errors=errors or None)
+
+
+async def execute_concurrently(schema, branches, **kwargs):
+    """Execute branches of split operation in the ORM thread pool from event loop"""
+    slots = asyncio.Semaphore(settings.GRAPHQL_MAX_PARALLEL_FIELDS)
+
+    async def run_branch(branch):
+        async with slots:
+            return await run_sync(execute_branch, schema, branch, **kwargs)
+
+    results = await asyncio.gather(*(run_branch(x) for x in branches))
+    return merge_results(results)
+
+
+def execute_parallel(schema, branches, **kwargs):
+    """Execute branches of split operation in the ORM thread pool, blocking caller"""
+    slots = threading.BoundedSemaphore(settings.GRAPHQL_MAX_PARALLEL_FIELDS)
+    futures = []
+    for branch in branches:
+        slots.acquire()
+        future = orm_executor().submit(
+            call_with_connection, execute_branch, schema, branch, **kwargs)
+        future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+    return merge_results([x.result() for x in futures])
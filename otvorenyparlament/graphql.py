@@ -1,19 +1,32 @@
 """
 GraphQL Schema
+
+Schema is built on first access of SCHEMA, so processes not serving
+GraphQL (management commands, admin) never import the type modules.
 """
 
 import graphene
 
-from flatpages_api.graphql import FlatPageQueries
-from geo.graphql import GeoQueries
-from parliament.graphql import ParliamentQueries
-from parliament_stats.graphql import ParliamentStatsQueries
-from person.graphql import PersonQueries
 
+def build_schema():
+    from data_export.graphql import DataExportQueries
+    from flatpages_api.graphql import FlatPageQueries
+    from geo.graphql import GeoQueries
+    from parliament.graphql import ParliamentQueries
+    from parliament_stats.graphql import ParliamentStatsQueries
+    from person.graphql import PersonQueries
+
+    class Queries(DataExportQueries, FlatPageQueries, GeoQueries, ParliamentQueries,
+                  ParliamentStatsQueries, PersonQueries, graphene.ObjectType):
+
+        pass
 
-class Queries(FlatPageQueries, GeoQueries, ParliamentQueries, ParliamentStatsQueries,
-              PersonQueries, graphene.ObjectType):
+    return graphene.Schema(query=Queries)
 
-    pass
 
-SCHEMA = graphene.Schema(query=Queries)
+def __getattr__(name):
+    if name == 'SCHEMA':
+        global SCHEMA
+        SCHEMA = build_schema()
+        return SCHEMA
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
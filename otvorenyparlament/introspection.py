@@ -0,0 +1,76 @@
+"""
+Introspection result cache.
+
+Results of introspection operations depend on the schema only, so they are
+computed once per schema and served from cache until a deploy changes the
+schema, without validating or executing the operation again.
+"""
+
+from functools import lru_cache
+import hashlib
+import json
+
+from django.core.cache import cache
+from graphql import validate
+from graphql.execution import ExecutionResult, execute
+from graphql.language import ast
+from graphql.utils.introspection_query import introspection_query
+
+INTROSPECTION_KEY = 'introspection:{}'
+INTROSPECTION_FIELDS = ('__schema', '__type', '__typename')
+
+
+@lru_cache(maxsize=4)
+def schema_sdl(schema):
+    return str(schema)
+
+
+@lru_cache(maxsize=4)
+def schema_hash(schema):
+    return hashlib.sha256(schema_sdl(schema).encode()).hexdigest()
+
+
+def is_introspection(operation):
+    """Operation selects nothing but introspection fields"""
+    return operation.operation == 'query' and all(
+        isinstance(x, ast.Field) and x.name.value in INTROSPECTION_FIELDS
+        for x in operation.selection_set.selections
+    )
+
+
+def introspection_key(schema, query, variables=None, operation_name=None):
+    key = json.dumps(
+        [schema_hash(schema), query, variables, operation_name], sort_keys=True, default=str)
+    return INTROSPECTION_KEY.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+def execute_introspection(schema, document_ast, query, variables=None, operation_name=None):
+    """Result of introspection operation, executed only when it is not cached"""
+    key = introspection_key(schema, query, variables, operation_name)
+    data = cache.get(key)
+    if data is not None:
+        return ExecutionResult(data=data)
+
+    errors = validate(schema, document_ast)
+    if errors:
+        return ExecutionResult(errors=errors, invalid=True)
+    result = execute(
+        schema, document_ast, variable_values=variables, operation_name=operation_name)
+    if not result.errors and result.data is not None:
+        cache.set(key, result.data, None)
+    return result
+
+
+def introspection_result(schema):
+    """Full introspection result of schema, as fetched by GraphQL client tooling"""
+    result = schema.execute(introspection_query)
+    if result.errors:
+        raise result.errors[0]
+    return result.data
+
+
+def prime_cache(schema):
+    """Cache result of the standard introspection query of graphql-core"""
+    data = introspection_result(schema)
+    cache.set(introspection_key(schema, introspection_query), data, None)
+    return data
@@ -0,0 +1,63 @@
+"""
+List slow queries of GraphQL requests from the slow query log, worst
+first, to find resolvers missing indexes or prefetching.
+"""
+
+from django.core.management.base import BaseCommand
+
+from otvorenyparlament.slowlog import read_log
+
+
+class Command(BaseCommand):
+
+    help = 'List GraphQL field paths and queries with highest total time in slow query log'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            action='store',
+            type=int,
+            dest='top',
+            default=20,
+            help='Number of listed offenders'
+        )
+        parser.add_argument(
+            '--by',
+            action='store',
+            dest='by',
+            choices=('query', 'path'),
+            default='query',
+            help='Group by query and field path, or by field path only'
+        )
+        parser.add_argument(
+            '--plans',
+            action='store_true',
+            dest='plans',
+            help='Print the latest recorded plan of every offender'
+        )
+
+    def handle(self, *args, **options):
+        groups = {}
+        for entry in read_log():
+            key = (entry['path'], entry['sql'] if options['by'] == 'query' else None)
+            group = groups.setdefault(key, {'count': 0, 'total': 0, 'max': 0, 'entry': entry})
+            group['count'] += 1
+            group['total'] += entry['duration']
+            group['max'] = max(group['max'], entry['duration'])
+            if entry['plan'] or not group['entry']['plan']:
+                group['entry'] = entry
+
+        offenders = sorted(groups.items(), key=lambda x: x[1]['total'], reverse=True)
+        for (path, sql), group in offenders[:options['top']]:
+            self.stdout.write('{:10.1f} ms total {:6d}x {:8.1f} ms mean {:8.1f} ms max  {}'.format(
+                group['total'], group['count'], group['total'] / group['count'], group['max'],
+                path or '-'))
+            entry = group['entry']
+            if sql is not None:
+                self.stdout.write('    {}'.format(sql))
+            self.stdout.write('    variables {} params {}'.format(
+                entry['variables'], entry['params']))
+            if options['plans'] and entry['plan']:
+                self.stdout.write('\n'.join('      ' + x for x in entry['plan'].splitlines()))
+        if not offenders:
+            self.stdout.write('No slow queries logged')
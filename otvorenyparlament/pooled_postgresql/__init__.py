@@ -0,0 +1,6 @@
+"""
+PostgreSQL backend with process wide connection pool. Use as ENGINE
+'otvorenyparlament.pooled_postgresql' with CONN_MAX_AGE 0; connections are
+returned to the pool whenever Django would close them. Optional POOL dict
+of the database settings configures the pool, see pool.PoolOptions.
+"""
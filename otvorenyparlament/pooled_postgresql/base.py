@@ -0,0 +1,44 @@
+from functools import partial
+
+from django.db.backends.postgresql import base, creation
+
+from otvorenyparlament.pooled_postgresql.pool import PoolOptions, close_all, get_pool
+
+
+def connect(conn_params, isolation_level=None):
+    connection = base.Database.connect(**conn_params)
+    if isolation_level is not None and isolation_level != connection.isolation_level:
+        connection.set_session(isolation_level=isolation_level)
+    return connection
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # pooled connections to the test database would block dropping it
+        close_all()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    creation_class = DatabaseCreation
+    pool = None
+
+    def get_new_connection(self, conn_params):
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        self.pool = get_pool(
+            conn_params,
+            partial(connect, conn_params, isolation_level),
+            PoolOptions.from_settings(self.settings_dict)
+        )
+        connection = self.pool.acquire()
+        # must be set before autocommit is, see super
+        self.isolation_level = connection.isolation_level \
+            if isolation_level is None else isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
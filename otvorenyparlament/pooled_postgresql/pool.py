@@ -0,0 +1,161 @@
+"""
+Thread safe pool of psycopg2 connections
+"""
+
+from collections import namedtuple
+import atexit
+import logging
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+
+class PoolOptions(namedtuple('PoolOptions', (
+        'max_size', 'timeout', 'max_lifetime', 'health_check_interval'))):
+    """
+    max_size: connections open at once, acquire waits when all are taken
+    timeout: seconds to wait for a free connection before PoolTimeout
+    max_lifetime: seconds after which a connection is closed and replaced
+    health_check_interval: connections idle longer are checked before use
+    """
+
+    @classmethod
+    def from_settings(cls, settings_dict):
+        pool = settings_dict.get('POOL', {})
+        return cls(
+            max_size=pool.get('MAX_SIZE', 20),
+            timeout=pool.get('TIMEOUT', 10),
+            max_lifetime=pool.get('MAX_LIFETIME', 1800),
+            health_check_interval=pool.get('HEALTH_CHECK_INTERVAL', 30),
+        )
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection got free in time"""
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, options):
+        self.connect = connect
+        self.options = options
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+        # idle connections as (connection, created, released), most recent last
+        self.idle = []
+        # creation times of open connections by id, guarded by condition
+        self.created = {}
+        self.size = 0
+
+    def acquire(self):
+        deadline = time.monotonic() + self.options.timeout
+        while True:
+            with self.condition:
+                while not self.idle and self.size >= self.options.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout('No free database connection in {} s'.format(
+                            self.options.timeout))
+                    self.condition.wait(remaining)
+                if self.idle:
+                    connection, created, released = self.idle.pop()
+                else:
+                    connection = None
+                    self.size += 1
+
+            if connection is None:
+                return self._open()
+            if self._usable(connection, created, released):
+                return connection
+            self._discard(connection)
+
+    def release(self, connection):
+        if connection.closed:
+            self._discard(connection)
+            return
+        try:
+            if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            self._discard(connection)
+            return
+
+        with self.condition:
+            created = self.created[id(connection)]
+            if time.monotonic() - created <= self.options.max_lifetime:
+                self.idle.append((connection, created, time.monotonic()))
+                self.condition.notify()
+                return
+        self._discard(connection)
+
+    def close(self):
+        """Close idle connections, connections in use go back to the pool when released"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for connection, _, _ in idle:
+            self._discard(connection)
+
+    def _open(self):
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created[id(connection)] = time.monotonic()
+        return connection
+
+    def _usable(self, connection, created, released):
+        now = time.monotonic()
+        if connection.closed or now - created > self.options.max_lifetime:
+            return False
+        if now - released < self.options.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            connection.rollback()
+        except psycopg2.Error:
+            logger.info('Discarding broken pooled connection')
+            return False
+        return True
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+        with self.condition:
+            self.created.pop(id(connection), None)
+            self.size -= 1
+            self.condition.notify()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(conn_params, connect, options):
+    """Pool of connections with given parameters, pools are not inherited by forks"""
+    key = tuple(sorted((k, str(v)) for k, v in conn_params.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[key] = ConnectionPool(connect, options)
+    return pool
+
+
+@atexit.register
+def close_all():
+    """Close idle connections of all pools of this process"""
+    with _pools_lock:
+        pools = [x for x in _pools.values() if x.pid == os.getpid()]
+    for pool in pools:
+        pool.close()
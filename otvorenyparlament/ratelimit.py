@@ -0,0 +1,281 @@
+"""
+Per-client rate limiting of GraphQL requests.
+
+Every request is charged its estimated cost, the number of objects the
+query may return weighted by their depth, against a token bucket of the
+client refilled at GRAPHQL_RATE_LIMIT_RATE per second up to
+GRAPHQL_RATE_LIMIT_BURST. Clients are identified by an API token listed in
+GRAPHQL_RATE_LIMIT_TOKENS, otherwise by IP address. Requests answered
+with 304 Not Modified are not charged. Buckets live in the process, so
+with several workers a client gets the rate of each worker.
+"""
+
+from functools import wraps
+import ipaddress
+import json
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from graphene_django.settings import graphene_settings
+from graphene_django.views import HttpError
+from graphql.language import ast
+from graphql.type import GraphQLList, GraphQLNonNull, get_named_type
+from graphql.utils.get_operation_ast import get_operation_ast
+
+# buckets are dropped after being full for this many refills
+PRUNE_AFTER = 2
+
+
+def _argument_value(node, variables):
+    if isinstance(node, ast.Variable):
+        return (variables or {}).get(node.name.value)
+    if isinstance(node, ast.IntValue):
+        return int(node.value)
+    return None
+
+
+def _page_size(field_node, variables):
+    """Requested first or last of connection field, None when not paginated"""
+    sizes = [
+        _argument_value(x.value, variables) for x in field_node.arguments or ()
+        if x.name.value in ('first', 'last')
+    ]
+    sizes = [x for x in sizes if isinstance(x, int) and x >= 0]
+    if not sizes:
+        return None
+    return min(max(sizes), graphene_settings.RELAY_CONNECTION_MAX_LIMIT)
+
+
+def _selections_cost(parent_type, selection_set, context, nodes, depth, page):
+    schema, fragments, variables, seen = context
+    cost = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, ast.FragmentSpread):
+            fragment = fragments.get(selection.name.value)
+            if fragment is None or fragment.name.value in seen:
+                continue
+            cost += _selections_cost(
+                schema.get_type(fragment.type_condition.name.value), fragment.selection_set,
+                (schema, fragments, variables, seen | {fragment.name.value}), nodes, depth, page)
+        elif isinstance(selection, ast.InlineFragment):
+            fragment_type = parent_type
+            if selection.type_condition is not None:
+                fragment_type = schema.get_type(selection.type_condition.name.value)
+            cost += _selections_cost(
+                fragment_type, selection.selection_set, context, nodes, depth, page)
+        elif selection.selection_set is not None:
+            field = getattr(parent_type, 'fields', {}).get(selection.name.value)
+            if field is None:
+                # introspection and unknown fields, left to validation
+                continue
+            field_type = field.type
+            if isinstance(field_type, GraphQLNonNull):
+                field_type = field_type.of_type
+            field_nodes = nodes
+            if isinstance(field_type, GraphQLList):
+                field_nodes *= page or graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+            cost += field_nodes * depth
+            cost += _selections_cost(
+                get_named_type(field_type), selection.selection_set, context, field_nodes,
+                depth + 1, _page_size(selection, variables))
+    return cost
+
+
+def query_cost(schema, document_ast, variables=None, operation_name=None):
+    """
+    Estimated cost of operation, objects it may return weighted by depth.
+    Lists of unknown length count as the maximal connection page.
+    """
+    operation = get_operation_ast(document_ast, operation_name)
+    if operation is None:
+        return 1
+    root_type = schema.get_mutation_type() if operation.operation == 'mutation' \
+        else schema.get_query_type()
+    fragments = {
+        x.name.value: x for x in document_ast.definitions if isinstance(x, ast.FragmentDefinition)
+    }
+    return max(1, _selections_cost(
+        root_type, operation.selection_set, (schema, fragments, variables, frozenset()), 1, 1,
+        None))
+
+
+class TokenBucket:
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, cost, now):
+        """Seconds to wait until cost can be taken, 0 when it was taken"""
+        self.refill(now)
+        if cost <= self.tokens:
+            self.tokens -= cost
+            return 0
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets and running request counts of clients"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.running = {}
+        self.pruned = time.monotonic()
+
+    def prune(self, now):
+        idle = PRUNE_AFTER * settings.GRAPHQL_RATE_LIMIT_BURST / settings.GRAPHQL_RATE_LIMIT_RATE
+        if now - self.pruned < idle:
+            return
+        self.pruned = now
+        for client in [k for k, v in self.buckets.items() if now - v.updated > idle]:
+            del self.buckets[client]
+
+    def acquire(self, client, cost):
+        """Seconds client must wait, 0 when the request may run"""
+        now = time.monotonic()
+        with self.lock:
+            self.prune(now)
+            if self.running.get(client, 0) >= settings.GRAPHQL_RATE_LIMIT_CONCURRENCY:
+                return 1
+            bucket = self.buckets.get(client)
+            if bucket is None:
+                bucket = self.buckets[client] = TokenBucket(
+                    settings.GRAPHQL_RATE_LIMIT_RATE, settings.GRAPHQL_RATE_LIMIT_BURST)
+            wait = bucket.take(cost, now)
+            if not wait:
+                self.running[client] = self.running.get(client, 0) + 1
+            return wait
+
+    def refund(self, client, cost):
+        """Return cost taken by request of client"""
+        with self.lock:
+            bucket = self.buckets.get(client)
+            if bucket is not None:
+                bucket.tokens = min(bucket.capacity, bucket.tokens + cost)
+
+    def release(self, client):
+        with self.lock:
+            self.running[client] -= 1
+            if not self.running[client]:
+                del self.running[client]
+
+
+limiter = RateLimiter()
+
+
+def _whitelist():
+    networks, tokens = [], set()
+    for entry in settings.GRAPHQL_RATE_LIMIT_WHITELIST:
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            tokens.add(entry)
+    return networks, tokens
+
+
+def client_address(request):
+    """
+    Address of client, as appended to the forwarding header by the farthest
+    of GRAPHQL_TRUSTED_PROXY_COUNT proxies. Entries before it are sent by
+    the client and can be forged.
+    """
+    if settings.GRAPHQL_CLIENT_IP_HEADER and settings.GRAPHQL_TRUSTED_PROXY_COUNT > 0:
+        forwarded = [
+            x.strip() for x in request.META.get(settings.GRAPHQL_CLIENT_IP_HEADER, '').split(',')
+        ]
+        forwarded = [x for x in forwarded if x]
+        if len(forwarded) >= settings.GRAPHQL_TRUSTED_PROXY_COUNT:
+            return forwarded[-settings.GRAPHQL_TRUSTED_PROXY_COUNT]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def client_token(request):
+    scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    return token.strip() if scheme.lower() == 'bearer' else None
+
+
+def client_key(request):
+    """Bucket key of client, None for whitelisted clients"""
+    networks, tokens = _whitelist()
+    token = client_token(request)
+    if token and token in tokens:
+        return None
+    address = client_address(request)
+    try:
+        if any(ipaddress.ip_address(address) in x for x in networks):
+            return None
+    except ValueError:
+        pass
+    if token and token in settings.GRAPHQL_RATE_LIMIT_TOKENS:
+        return 'token:{}'.format(token)
+    return 'ip:{}'.format(address)
+
+
+def _error_response(status, message, retry_after=None):
+    response = HttpResponse(
+        json.dumps({'errors': [{'message': message}]}),
+        status=status,
+        content_type='application/json'
+    )
+    if retry_after is not None:
+        response['Retry-After'] = str(retry_after)
+    return response
+
+
+def request_cost(view, request):
+    """Cost of GraphQL request to view, 1 when it has no valid query"""
+    from otvorenyparlament.views import parse_query
+
+    try:
+        data = view.parse_body(request)
+        query, variables, operation_name, _ = view.get_graphql_params(request, data)
+    except HttpError:
+        # reported by the view
+        return 1
+    document_ast = parse_query(query) if query else None
+    if document_ast is None:
+        return 1
+    return query_cost(view.schema, document_ast, variables, operation_name)
+
+
+def rate_limited(view_func):
+    """Charge requests to GraphQL view against rate limit of their client"""
+    view_class = view_func.view_class
+    initkwargs = view_func.view_initkwargs
+
+    @wraps(view_func)
+    def view(request, *args, **kwargs):
+        if not settings.GRAPHQL_RATE_LIMIT_RATE:
+            return view_func(request, *args, **kwargs)
+        client = client_key(request)
+        if client is None:
+            return view_func(request, *args, **kwargs)
+
+        cost = request_cost(view_class(**initkwargs), request)
+        if cost > settings.GRAPHQL_RATE_LIMIT_BURST:
+            return _error_response(
+                400, 'Query cost {} exceeds limit {}.'.format(
+                    cost, settings.GRAPHQL_RATE_LIMIT_BURST))
+        wait = limiter.acquire(client, cost)
+        if wait:
+            return _error_response(
+                429, 'Rate limit exceeded, query cost {}.'.format(cost), math.ceil(wait))
+        try:
+            response = view_func(request, *args, **kwargs)
+        finally:
+            limiter.release(client)
+        if response.status_code == 304:
+            limiter.refund(client, cost)
+        return response
+
+    return view
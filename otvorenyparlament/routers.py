@@ -0,0 +1,111 @@
+"""
+Read replica routing. Reads made inside use_replicas() (GraphQL query
+execution and exports) go to one of DATABASE_REPLICAS, everything else,
+including management commands, admin and all writes, uses the primary.
+"""
+
+from contextlib import contextmanager
+import itertools
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = 'round-robin'
+LAG_AWARE = 'lag-aware'
+
+# replication lag in seconds, 0 on primary or fully replayed replica
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+        THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_state = threading.local()
+
+
+@contextmanager
+def use_replicas(alias=None):
+    """
+    Route reads of current thread to a replica, chosen once for the whole
+    block so that all its reads see the same state, or to given alias
+    """
+    previous = getattr(_state, 'alias', None)
+    _state.alias = alias or selector.choose()
+    try:
+        yield _state.alias
+    finally:
+        _state.alias = previous
+
+
+def read_alias():
+    """Database used for reads of current thread"""
+    return getattr(_state, 'alias', None) or DEFAULT_DB_ALIAS
+
+
+def on_replicas(iterable):
+    """Iterate with reads routed to replica, for content of streamed responses"""
+    with use_replicas():
+        yield from iterable
+
+
+class ReplicaSelector:
+    """Round-robin choice among replicas, optionally among those lagging less than allowed"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.lags = {}
+        self.checked = 0
+
+    def replica_lag(self, alias):
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = cursor.fetchone()[0]
+        except DatabaseError:
+            logger.warning('Replica %s is unavailable', alias, exc_info=True)
+            return float('inf')
+        return float(lag or 0)
+
+    def available(self, replicas):
+        if settings.DATABASE_REPLICA_SELECTION != LAG_AWARE:
+            return replicas
+        if time.monotonic() - self.checked > settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+            lags = {x: self.replica_lag(x) for x in replicas}
+            with self.lock:
+                self.lags = lags
+                self.checked = time.monotonic()
+        return [x for x in replicas if self.lags.get(x, 0) <= settings.DATABASE_REPLICA_MAX_LAG]
+
+    def choose(self):
+        replicas = self.available(settings.DATABASE_REPLICAS)
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        with self.lock:
+            return replicas[next(self.counter) % len(replicas)]
+
+
+selector = ReplicaSelector()
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same data as primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -39,12 +39,12 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.sites',
     'django.contrib.staticfiles',
-    'debug_toolbar',
     'django_filters',
-    'django_extensions',
     'graphene_django',
     'corsheaders',
     # otvorenyparlament apps
+    'otvorenyparlament',
+    'data_export',
     'geo',
     'parliament',
     'parliament_stats',
@@ -60,7 +60,6 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 CORS_ORIGIN_ALLOW_ALL = True
 
@@ -86,6 +85,15 @@ WSGI_APPLICATION = 'otvorenyparlament.wsgi.application'
 SITE_ID = 1
 
 
+# Read replicas, aliases of DATABASES serving GraphQL queries and exports
+DATABASE_ROUTERS = ['otvorenyparlament.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+# round-robin or lag-aware, lag-aware skips replicas lagging over max lag
+DATABASE_REPLICA_SELECTION = 'round-robin'
+DATABASE_REPLICA_MAX_LAG = 30
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = 5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
 
@@ -126,11 +134,51 @@ USE_TZ = False
 
 STATIC_URL = '/static/'
 
+# Dataset snapshots built by build_snapshots command
+SNAPSHOT_ROOT = os.path.join(os.path.dirname(BASE_DIR), 'snapshots')
+
+# Slow query log of GraphQL requests, threshold in milliseconds, None disables
+SLOW_QUERY_THRESHOLD = 200
+SLOW_QUERY_LOG = os.path.join(os.path.dirname(BASE_DIR), 'logs', 'slow_queries.jsonl')
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5
+# share of slow queries run again with EXPLAIN (ANALYZE, BUFFERS)
+SLOW_QUERY_EXPLAIN_SAMPLE = 0.05
+
+# Compression of stored debate transcripts, None or 'zstd' (requires zstandard)
+DEBATE_TRANSCRIPT_COMPRESSION = None
+DEBATE_TRANSCRIPT_COMPRESSION_LEVEL = 10
+
 
 # GraphQL
 GRAPHENE = {
     'SCHEMA': 'otvorenyparlament.graphql.SCHEMA',
     'MIDDLEWARE': [
-        'graphene_django.debug.DjangoDebugMiddleware',
-    ]
+        'otvorenyparlament.slowlog.SlowQueryMiddleware',
+    ],
 }
+# build schema when WSGI/ASGI application is loaded, with preloading
+# servers (gunicorn --preload) workers then share the schema of master
+GRAPHQL_PRELOAD_SCHEMA = False
+# threads resolving GraphQL root fields concurrently, always under ASGI,
+# under WSGI with GRAPHQL_PARALLEL_EXECUTION
+GRAPHQL_ORM_THREADS = 8
+GRAPHQL_PARALLEL_EXECUTION = False
+# root fields of one request resolved at once
+GRAPHQL_MAX_PARALLEL_FIELDS = 4
+# GraphQL rate limit, query cost points per second refilling bucket of
+# BURST points, None disables limiting. Requests costing more than BURST
+# are rejected.
+GRAPHQL_RATE_LIMIT_RATE = 1000
+GRAPHQL_RATE_LIMIT_BURST = 50000
+# requests of one client running at once
+GRAPHQL_RATE_LIMIT_CONCURRENCY = 4
+# API tokens (Authorization: Bearer) with buckets of their own
+GRAPHQL_RATE_LIMIT_TOKENS = []
+# IP addresses, networks and API tokens never limited, such as the frontend
+GRAPHQL_RATE_LIMIT_WHITELIST = []
+# META key holding client address behind proxy, e.g. HTTP_X_FORWARDED_FOR
+GRAPHQL_CLIENT_IP_HEADER = None
+# proxies in front of the application appending to GRAPHQL_CLIENT_IP_HEADER,
+# client address is the entry appended by the farthest of them
+GRAPHQL_TRUSTED_PROXY_COUNT = 1
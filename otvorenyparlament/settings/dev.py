@@ -2,20 +2,52 @@
 Dev server settings
 """
 
+import os
+
 from otvorenyparlament.settings.base import *
 
 ALLOWED_HOSTS = ['*']
 INTERNAL_IPS = ['127.0.0.1']
 DEBUG = True
 
+INSTALLED_APPS += [
+    'debug_toolbar',
+    'django_extensions',
+]
+MIDDLEWARE += [
+    'debug_toolbar.middleware.DebugToolbarMiddleware',
+]
+GRAPHENE['MIDDLEWARE'] += [
+    'graphene_django.debug.DjangoDebugMiddleware',
+]
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'otvorenyparlament.pooled_postgresql',
         'NAME': 'otvorenyparlament',
         'USER': 'otvorenyparlament',
         'PASSWORD': 'otvorenyparlament',
         'ATOMIC_REQUESTS': True,
+        # connections are returned to pool at the end of each request
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MAX_SIZE': 20,
+            'TIMEOUT': 10,
+            'MAX_LIFETIME': 1800,
+            'HEALTH_CHECK_INTERVAL': 30,
+        },
         'HOST': 'localhost',
         'PORT': 5432
     }
 }
+
+# Local stand-in replica, a copy of the primary database created with
+# createdb -T otvorenyparlament otvorenyparlament_replica
+if os.environ.get('REPLICA_DB_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['REPLICA_DB_NAME'],
+        'ATOMIC_REQUESTS': False,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS = ['replica']
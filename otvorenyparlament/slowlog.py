@@ -0,0 +1,162 @@
+"""
+Slow query log of GraphQL requests.
+
+SQL queries run during GraphQL execution taking longer than
+SLOW_QUERY_THRESHOLD milliseconds are written as JSON lines into the
+rotating SLOW_QUERY_LOG file, together with the path of the GraphQL field
+whose resolver ran them and the operation variables. Querysets returned by
+resolvers and results of their promises are evaluated under the path of
+the field, DataLoader batches run under the path of the field loading
+their first key (see graphql_utils.FieldDataLoader). A sample of slow
+SELECT queries is run again with EXPLAIN (ANALYZE, BUFFERS) to record the
+plan. The slow_queries command lists the worst ones.
+"""
+
+from contextlib import ExitStack, contextmanager
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+import os
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils import timezone
+from promise import Promise, is_thenable
+
+logger = logging.getLogger(__name__)
+# writes entries into SLOW_QUERY_LOG only
+store = logging.getLogger(__name__ + '.store')
+store.propagate = False
+
+_state = threading.local()
+_store_lock = threading.Lock()
+
+
+def field_path(path):
+    """Path of field without list indices, so that all items of list share it"""
+    return '.'.join(str(x) for x in path if not isinstance(x, int))
+
+
+def current_field():
+    """Path and variables of the field being resolved by current thread"""
+    return getattr(_state, 'field', None)
+
+
+@contextmanager
+def resolving(field):
+    """Attribute queries of the block to field, as given by current_field"""
+    previous = getattr(_state, 'field', None)
+    _state.field = field
+    try:
+        yield
+    finally:
+        _state.field = previous
+
+
+def _evaluated(field, value):
+    with resolving(field):
+        # querysets would be evaluated by the executor, outside of the field
+        if isinstance(value, QuerySet):
+            len(value)
+    return value
+
+
+class SlowQueryMiddleware:
+    """Graphene middleware remembering the field being resolved for the slow query log"""
+
+    def resolve(self, next, root, info, **args):
+        field = (info.path, info.variable_values)
+        with resolving(field):
+            result = next(root, info, **args)
+        if is_thenable(result):
+            return Promise.resolve(result).then(lambda value: _evaluated(field, value))
+        return _evaluated(field, result)
+
+
+def _open_store():
+    with _store_lock:
+        if not store.handlers:
+            os.makedirs(os.path.dirname(settings.SLOW_QUERY_LOG), exist_ok=True)
+            store.addHandler(RotatingFileHandler(
+                settings.SLOW_QUERY_LOG,
+                maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                encoding='utf-8'
+            ))
+            store.setLevel(logging.INFO)
+
+
+def _explain(connection, sql, params):
+    """Plan of query executed again, None when it can not be explained"""
+    if connection.in_atomic_block or sql.lstrip()[:6].upper() != 'SELECT':
+        # failing EXPLAIN would abort the transaction, ANALYZE would repeat writes
+        return None
+    try:
+        with connection.wrap_database_errors, connection.connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (ANALYZE, BUFFERS) ' + sql, params)
+            return '\n'.join(x[0] for x in cursor.fetchall())
+    except DatabaseError:
+        logger.warning('Slow query could not be explained', exc_info=True)
+        return None
+
+
+def record(connection, sql, params, duration):
+    path, variables = getattr(_state, 'field', None) or ((), None)
+    plan = None
+    if random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE:
+        plan = _explain(connection, sql, params)
+    entry = {
+        'time': timezone.now().isoformat(),
+        'alias': connection.alias,
+        'duration': round(duration, 3),
+        'path': field_path(path),
+        'variables': variables,
+        'sql': sql,
+        'params': params,
+        'plan': plan,
+    }
+    _open_store()
+    store.info(json.dumps(entry, default=str))
+
+
+def _capture(execute, sql, params, many, context):
+    start = time.monotonic()
+    result = execute(sql, params, many, context)
+    duration = (time.monotonic() - start) * 1000
+    if duration > settings.SLOW_QUERY_THRESHOLD and not many:
+        record(context['connection'], sql, params, duration)
+    return result
+
+
+@contextmanager
+def capture_slow_queries():
+    """Log slow queries made by current thread on any database"""
+    if settings.SLOW_QUERY_THRESHOLD is None:
+        yield
+        return
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(_capture))
+        yield
+
+
+def read_log():
+    """Entries of slow query log, oldest first"""
+    paths = [settings.SLOW_QUERY_LOG] + [
+        '{}.{}'.format(settings.SLOW_QUERY_LOG, x)
+        for x in range(1, settings.SLOW_QUERY_LOG_BACKUPS + 1)
+    ]
+    for path in reversed(paths):
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding='utf-8') as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # line cut by rotation of another process
+                    continue
@@ -0,0 +1,100 @@
+"""
+Startup profile of an API worker. Boots Django in a fresh interpreter with
+-X importtime and reports duration of boot phases, memory and import time
+per package and module.
+
+    python -m otvorenyparlament.startup_profile [--top 20] [--no-schema]
+
+Uses DJANGO_SETTINGS_MODULE of the environment, compare runs with dev and
+production settings to see cost of dev-only apps.
+"""
+
+import argparse
+from collections import defaultdict
+import json
+import os
+import subprocess
+import sys
+
+BOOT = """
+import json, resource, sys, time
+phases = []
+start = time.perf_counter()
+import django
+django.setup()
+phases.append(('django.setup', time.perf_counter() - start))
+start = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+phases.append(('urlconf', time.perf_counter() - start))
+if {schema}:
+    start = time.perf_counter()
+    from graphene_django.settings import graphene_settings
+    graphene_settings.SCHEMA
+    phases.append(('graphql schema', time.perf_counter() - start))
+sys.stdout.write(json.dumps({{
+    'phases': phases,
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+}}))
+"""
+
+
+def parse_importtime(output):
+    """(module, self us, cumulative us, depth) rows of -X importtime output"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile(schema=True):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT.format(schema=schema)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=os.environ.copy(),
+        universal_newlines=True,
+        check=True
+    )
+    return json.loads(result.stdout), parse_importtime(result.stderr)
+
+
+def report(stats, rows, top=20, out=sys.stdout):
+    out.write('Boot phases\n')
+    for phase, seconds in stats['phases']:
+        out.write('  {:<20} {:8.1f} ms\n'.format(phase, seconds * 1000))
+    # ru_maxrss is in kilobytes on Linux
+    out.write('  {:<20} {:8.1f} MB\n'.format('max RSS', stats['maxrss'] / 1024))
+    out.write('  {:<20} {:8d}\n'.format('modules loaded', stats['modules']))
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split('.')[0]] += self_us
+    total = sum(packages.values()) or 1
+    out.write('\nImport time by package (self time)\n')
+    for package, micros in sorted(packages.items(), key=lambda x: -x[1])[:top]:
+        out.write('  {:<30} {:8.1f} ms {:5.1f} %\n'.format(
+            package, micros / 1000, 100 * micros / total))
+
+    out.write('\nSlowest top-level imports (cumulative time)\n')
+    top_level = [x for x in rows if x[3] == 0]
+    for name, _, cumulative_us, _ in sorted(top_level, key=lambda x: -x[2])[:top]:
+        out.write('  {:<50} {:8.1f} ms\n'.format(name, cumulative_us / 1000))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report worker startup profile')
+    parser.add_argument('--top', type=int, default=20, help='Rows per table')
+    parser.add_argument('--no-schema', action='store_false', dest='schema',
+                        help='Do not build GraphQL schema')
+    args = parser.parse_args(argv)
+    report(*profile(args.schema), top=args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -16,17 +16,25 @@ Including another URLconf
 
 from django.conf import settings
 from django.contrib import admin
+from django.db import transaction
 from django.urls import include, path
 from django.views.decorators.csrf import csrf_exempt
-from graphene_django.views import GraphQLView
+
+from otvorenyparlament.ratelimit import rate_limited
+from otvorenyparlament.views import GraphQLView
 
 
 urlpatterns = [
-    path('graphql', csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path(
+        'graphql',
+        transaction.non_atomic_requests(
+            rate_limited(csrf_exempt(GraphQLView.as_view(graphiql=True))))
+    ),
     path('admin/', admin.site.urls),
+    path('export/', include('data_export.urls')),
 ]
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns = [
         path('__debug__/', include(debug_toolbar.urls)),
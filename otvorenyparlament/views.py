@@ -0,0 +1,220 @@
+"""
+GraphQL endpoint with conditional requests and automatic persisted queries.
+Under ASGI, or with parallel_execution under WSGI, root fields of query
+operations are resolved concurrently.
+
+Responses carry ETag derived from the query, its variables and data
+generations of models the query reads, so polling clients get 304 Not
+Modified until ingestion changes the data, without any resolver running.
+Introspection operations are answered from the introspection cache.
+"""
+
+import asyncio
+from functools import lru_cache
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from graphene.relay import Connection, PageInfo
+from graphene_django import DjangoObjectType
+from graphene_django.views import GraphQLView as BaseGraphQLView, HttpError
+from graphql import parse, validate
+from graphql.error import GraphQLError
+from graphql.execution import ExecutionResult
+from graphql.language.visitor import TypeInfoVisitor, Visitor, visit
+from graphql.type import (
+    GraphQLInterfaceType,
+    GraphQLObjectType,
+    GraphQLUnionType,
+    get_named_type
+)
+from graphql.utils.get_operation_ast import get_operation_ast
+from graphql.utils.type_info import TypeInfo
+
+from data_export.models import DataGeneration
+from otvorenyparlament.execution import (
+    ASGI_EVENT_LOOP,
+    execute_concurrently,
+    execute_parallel,
+    split_operation
+)
+from otvorenyparlament.introspection import execute_introspection, is_introspection, schema_hash
+from otvorenyparlament.routers import read_alias, use_replicas
+from otvorenyparlament.slowlog import capture_slow_queries
+
+PERSISTED_QUERY_KEY = 'persisted-query:{}'
+# types carrying no data of their own
+STRUCTURAL_TYPES = (Connection, PageInfo)
+COMPOSITE_TYPES = (GraphQLInterfaceType, GraphQLObjectType, GraphQLUnionType)
+
+
+class _DataSourceVisitor(Visitor):
+
+    def __init__(self, type_info):
+        self.type_info = type_info
+        self.labels = set()
+
+    def enter_Field(self, node, *args):
+        field_type = get_named_type(self.type_info.get_type())
+        if not isinstance(field_type, COMPOSITE_TYPES) or field_type.name.startswith('__'):
+            # scalars, unknown fields and introspection
+            return
+        graphene_type = getattr(field_type, 'graphene_type', None)
+        if not isinstance(graphene_type, type):
+            self.labels.add(DataGeneration.GLOBAL)
+        elif issubclass(graphene_type, DjangoObjectType):
+            self.labels.add(graphene_type._meta.model._meta.label_lower)
+        elif not issubclass(graphene_type, STRUCTURAL_TYPES) and not self.in_connection():
+            # plain object types, interfaces and unions may read any model
+            self.labels.add(DataGeneration.GLOBAL)
+
+    def in_connection(self):
+        """Field is edge of a connection"""
+        parent_type = getattr(self.type_info.get_parent_type(), 'graphene_type', None)
+        return isinstance(parent_type, type) and issubclass(parent_type, Connection)
+
+
+@lru_cache(maxsize=1024)
+def parse_query(query):
+    """Document of query, None on syntax error"""
+    try:
+        return parse(query)
+    except GraphQLError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def query_data_sources(schema, query):
+    """Model labels read by query, None when query is invalid"""
+    document = parse_query(query)
+    if document is None:
+        return None
+    type_info = TypeInfo(schema)
+    visitor = _DataSourceVisitor(type_info)
+    visit(document, TypeInfoVisitor(type_info, visitor))
+    return frozenset(visitor.labels)
+
+
+class GraphQLView(BaseGraphQLView):
+
+    # resolve root fields in ORM thread pool under WSGI too
+    parallel_execution = settings.GRAPHQL_PARALLEL_EXECUTION
+
+    def dispatch(self, request, *args, **kwargs):
+        # the same replica serves data generations and query
+        with use_replicas(), capture_slow_queries():
+            return self.dispatch_conditional(request, *args, **kwargs)
+
+    def dispatch_conditional(self, request, *args, **kwargs):
+        etag = None
+        if not self.batch and request.method in ('GET', 'POST'):
+            try:
+                etag = self.get_etag(request)
+            except HttpError:
+                # reported by regular dispatch
+                pass
+
+        if etag is not None and etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = super().dispatch(request, *args, **kwargs)
+            if etag is None or response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        # cached responses must be revalidated, data may change with any ingestion
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def get_etag(self, request):
+        data = self.parse_body(request)
+        if self.graphiql and self.can_display_graphiql(request, data):
+            return None
+        query, variables, operation_name, _ = self.get_graphql_params(request, data)
+        if not query:
+            return None
+        labels = query_data_sources(self.schema, query)
+        if labels is None:
+            return None
+
+        generations = DataGeneration.objects.current(labels)
+        key = json.dumps([
+            schema_hash(self.schema),
+            query,
+            variables,
+            operation_name,
+            sorted(generations.items()),
+        ], sort_keys=True, default=str)
+        return quote_etag(hashlib.sha256(key.encode()).hexdigest())
+
+    @staticmethod
+    def get_graphql_params(request, data):
+        query, variables, operation_name, id = BaseGraphQLView.get_graphql_params(request, data)
+
+        extensions = request.GET.get('extensions') or data.get('extensions')
+        if extensions and isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                raise HttpError(HttpResponseBadRequest('Extensions are invalid JSON.'))
+        persisted = (extensions or {}).get('persistedQuery')
+        if not persisted or 'sha256Hash' not in persisted:
+            return query, variables, operation_name, id
+
+        # automatic persisted queries, registered by first request sending the query
+        query_hash = persisted['sha256Hash']
+        if query:
+            if hashlib.sha256(query.encode()).hexdigest() != query_hash:
+                raise HttpError(HttpResponseBadRequest('Provided sha256Hash does not match query.'))
+            cache.set(PERSISTED_QUERY_KEY.format(query_hash), query, None)
+        else:
+            query = cache.get(PERSISTED_QUERY_KEY.format(query_hash))
+            if query is None:
+                raise HttpError(HttpResponse(), 'PersistedQueryNotFound')
+        return query, variables, operation_name, id
+
+    def execute_graphql_request(self, request, data, query, variables, operation_name,
+                                show_graphiql=False):
+        document_ast = parse_query(query) if query and not show_graphiql else None
+        if document_ast is None:
+            return super().execute_graphql_request(
+                request, data, query, variables, operation_name, show_graphiql)
+
+        operation = get_operation_ast(document_ast, operation_name)
+        if operation is not None and is_introspection(operation):
+            return execute_introspection(
+                self.schema, document_ast, query, variables, operation_name)
+        if operation is not None and operation.operation == 'mutation':
+            # GraphQL requests are not atomic, only mutations run in transaction
+            with use_replicas(DEFAULT_DB_ALIAS), transaction.atomic():
+                return super().execute_graphql_request(
+                    request, data, query, variables, operation_name, show_graphiql)
+
+        loop = request.META.get(ASGI_EVENT_LOOP)
+        branches = None
+        if loop is not None or self.parallel_execution:
+            branches = split_operation(document_ast, operation_name)
+        if branches is None:
+            return super().execute_graphql_request(
+                request, data, query, variables, operation_name, show_graphiql)
+
+        errors = validate(self.schema, document_ast)
+        if errors:
+            return ExecutionResult(errors=errors, invalid=True)
+        options = {
+            'root_value': self.get_root_value(request),
+            'context_value': self.get_context(request),
+            'variable_values': variables,
+            'operation_name': operation_name,
+            'middleware': self.get_middleware(request),
+            'database': read_alias(),
+        }
+        if loop is None:
+            return execute_parallel(self.schema, branches, **options)
+        # this request thread waits while the event loop runs the branches
+        return asyncio.run_coroutine_threadsafe(
+            execute_concurrently(self.schema, branches, **options), loop).result()
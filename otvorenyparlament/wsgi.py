@@ -9,8 +9,12 @@ https://docs.djangoproject.com/en/2.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'otvorenyparlament.settings')
 
 application = get_wsgi_application()
+
+if settings.GRAPHQL_PRELOAD_SCHEMA:
+    from otvorenyparlament.graphql import SCHEMA  # noqa: F401
@@ -0,0 +1,17 @@
+"""
+PostgreSQL aggregates missing in Django
+"""
+
+from django.db import models
+
+
+class Percentile(models.Aggregate):
+    """Continuous percentile of expression, fraction between 0 and 1"""
+
+    function = 'PERCENTILE_CONT'
+    name = 'Percentile'
+    template = '%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+    def __init__(self, expression, fraction, **extra):
+        super().__init__(
+            expression, fraction=float(fraction), output_field=models.FloatField(), **extra)
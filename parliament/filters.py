@@ -2,7 +2,10 @@
 Parliament filters
 """
 
-from django.db.models import F, Q
+import copy
+
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.constants import LOOKUP_SEP
 from django.utils import timezone
 import django_filters
 from django_filters.conf import settings as filter_settings
@@ -11,8 +14,64 @@ from django_filters.constants import EMPTY_VALUES
 from graphql_relay.node.node import from_global_id
 
 from parliament.models import (Amendment, AmendmentSubmitter, Bill, Club,
-                               ClubMember, CommitteeMember, Member,
-                               MemberChange, Period, VotingVote)
+                               ClubMember, CommitteeMember, Interpellation, Member,
+                               MemberActive, MemberChange, Period, VotingVote)
+
+
+def correlated_relation(model, field_name):
+    """
+    Queryset of the first multi-valued relation crossed by field_name,
+    correlated to the outer model row, and the rest of field_name relative
+    to it, None when field_name crosses no multi-valued relation
+    """
+    parts = field_name.split(LOOKUP_SEP)
+    opts = model._meta
+    for index, part in enumerate(parts):
+        field = opts.get_field(part)
+        if not field.is_relation:
+            return None
+        if field.one_to_many or field.many_to_many:
+            break
+        opts = field.related_model._meta
+    else:
+        return None
+
+    # reverse relations are auto created, their field is the relation of related model
+    back = field.field.name if field.auto_created else field.related_query_name()
+    outer = LOOKUP_SEP.join(parts[:index]) or 'pk'
+    related = field.related_model._base_manager.filter(**{back: OuterRef(outer)})
+    return related, LOOKUP_SEP.join(parts[index + 1:])
+
+
+class ExistsFilterSet(django_filters.FilterSet):
+    """
+    FilterSet filtering across multi-valued relations with EXISTS subqueries
+    instead of joins, rows are never repeated and results need no DISTINCT
+    """
+
+    def filter_queryset(self, queryset):
+        for name, value in self.form.cleaned_data.items():
+            filter_ = self.filters[name]
+            relation = None
+            if not filter_.method and value not in EMPTY_VALUES:
+                relation = correlated_relation(self._meta.model, filter_.field_name)
+            if relation is None:
+                queryset = filter_.filter(queryset, value)
+                continue
+
+            related, rest = relation
+            if filter_.lookup_expr == 'isnull' and not rest:
+                exists, expected = Exists(related), not value
+            else:
+                # the filter converts value (e.g. global IDs) and applies the lookup
+                related_filter = copy.copy(filter_)
+                related_filter.field_name = rest or 'pk'
+                related_filter.exclude = related_filter.distinct = False
+                exists = Exists(related_filter.filter(related, value))
+                expected = not filter_.exclude
+            alias = '{}_exists'.format(name)
+            queryset = queryset.annotate(**{alias: exists}).filter(**{alias: expected})
+        return queryset
 
 
 class AmendmentFilterSet(django_filters.FilterSet):
@@ -46,7 +105,7 @@ class AmendmentFilterSet(django_filters.FilterSet):
     #     return queryset
 
 
-class BillFilterSet(django_filters.FilterSet):
+class BillFilterSet(ExistsFilterSet):
 
     class Meta:
         model = Bill
@@ -63,12 +122,8 @@ class BillFilterSet(django_filters.FilterSet):
             'proposers__club_memberships__club': ('exact',)
         }
 
-    def filter_queryset(self, queryset):
-        queryset = super().filter_queryset(queryset)
-        return queryset.distinct()
-
 
-class ClubMemberFilterSet(django_filters.FilterSet):
+class ClubMemberFilterSet(ExistsFilterSet):
 
     is_current_member = django_filters.DateFilter(
         field_name='is_current_member', method='filter_is_current_member')
@@ -80,10 +135,6 @@ class ClubMemberFilterSet(django_filters.FilterSet):
         )
         return queryset
 
-    def filter_queryset(self, queryset):
-        queryset = super().filter_queryset(queryset)
-        return queryset.distinct()
-
     class Meta:
         model = ClubMember
         fields = {
@@ -94,7 +145,7 @@ class ClubMemberFilterSet(django_filters.FilterSet):
         }
 
 
-class CommitteeMemberFilterSet(django_filters.FilterSet):
+class CommitteeMemberFilterSet(ExistsFilterSet):
 
     is_current_member = django_filters.DateFilter(
         field_name='is_current_member', method='filter_is_current_member')
@@ -106,10 +157,6 @@ class CommitteeMemberFilterSet(django_filters.FilterSet):
         )
         return queryset
 
-    def filter_queryset(self, queryset):
-        queryset = super().filter_queryset(queryset)
-        return queryset.distinct()
-
     class Meta:
         model = CommitteeMember
         fields = {
@@ -120,15 +167,34 @@ class CommitteeMemberFilterSet(django_filters.FilterSet):
         }
 
 
-class MemberFilterSet(django_filters.FilterSet):
+class InterpellationFilterSet(ExistsFilterSet):
+
+    recipient = django_filters.CharFilter(field_name='recipients', method='filter_recipient')
+
+    def filter_recipient(self, queryset, name, value):
+        # array containment, served by GIN index on recipients
+        return queryset.filter(recipients__contains=[value])
+
+    class Meta:
+        model = Interpellation
+        fields = {
+            'id': ('exact',),
+            'asked_by': ('exact',),
+            'status': ('exact',),
+            'period__period_num': ('exact',),
+        }
+
+
+class MemberFilterSet(ExistsFilterSet):
 
     is_active = django_filters.DateFilter(field_name='is_active', method='filter_is_active')
 
     def filter_is_active(self, queryset, name, value):
-        queryset = queryset.filter(
-            Q(active__start__lte=value),
-            Q(active__end__gt=value) | Q(active__end__isnull=True)
-        )
+        queryset = queryset.annotate(is_active=Exists(MemberActive.objects.filter(
+            Q(member=OuterRef('pk')),
+            Q(start__lte=value),
+            Q(end__gt=value) | Q(end__isnull=True)
+        ))).filter(is_active=True)
         return queryset
 
 
@@ -2,20 +2,36 @@
 Parliament GraphQL Types and Queries
 """
 
+from django.db.models import Avg, Count, Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 import graphene
-from graphene.relay import Node
-from graphene_django import DjangoObjectType
+from graphene.relay import Node, PageInfo
+from graphene_django import DjangoConnectionField, DjangoObjectType
 from graphene_django.filter import DjangoFilterConnectionField
+from graphene_django.settings import graphene_settings
+from graphql_relay.node.node import from_global_id
+from graphql_relay.utils import base64, unbase64
 
-from graphql_utils import CountableConnectionBase, OrderedDjangoFilterConnectionField
+from graphql_utils import (
+    CountableConnectionBase, OrderedDjangoFilterConnectionField, cached, get_loader)
 from parliament.filters import (
     AmendmentFilterSet,
     BillFilterSet,
     ClubMemberFilterSet,
     CommitteeMemberFilterSet,
+    InterpellationFilterSet,
     MemberFilterSet,
     VotingVoteFilterSet
 )
+from parliament.aggregates import Percentile
+from parliament.loaders import (
+    CommitteeSessionPointLoader,
+    DebateTranscriptLoader,
+    DebateTranscriptPreviewLoader,
+    VotingClubTallyLoader,
+    VotingLiveCountsLoader
+)
 from parliament.models import (
     Amendment,
     AmendmentSignedMember,
@@ -23,6 +39,7 @@ from parliament.models import (
     Bill,
     BillProcessStep,
     BillProposer,
+    BillStage,
     Club,
     ClubMember,
     Committee,
@@ -36,9 +53,13 @@ from parliament.models import (
     Party,
     Period,
     Press,
+    PressDebate,
+    PressDebateAppearance,
+    PressDebateClub,
     # PressAttachment,
     Session,
     SessionProgram,
+    SessionProgress,
     # SessionAttachment,
     Voting,
     VotingVote,
@@ -121,6 +142,9 @@ class CommitteeSessionPointType(DjangoObjectType):
 
 class CommitteeSessionType(DjangoObjectType):
 
+    # points of all sessions in a page are loaded at once
+    points = DjangoConnectionField(CommitteeSessionPointType)
+
     class Meta:
         model = CommitteeSession
         description = 'Committee Session'
@@ -132,6 +156,9 @@ class CommitteeSessionType(DjangoObjectType):
         only_fields = ['committee', 'start', 'end', 'place', 'points']
         connection_class = CountableConnectionBase
 
+    def resolve_points(self, info, **kwargs):
+        return get_loader(info, CommitteeSessionPointLoader).load(self.id)
+
 
 class PeriodType(DjangoObjectType):
 
@@ -161,6 +188,9 @@ class PressType(DjangoObjectType):
 
 class DebateAppearanceType(DjangoObjectType):
 
+    text = graphene.String()
+    text_preview = graphene.String(length=graphene.Int(default_value=200))
+
     class Meta:
         interfaces = (Node,)
         model = DebateAppearance
@@ -170,6 +200,102 @@ class DebateAppearanceType(DjangoObjectType):
             'debater': ('exact',),
         }
 
+    def resolve_text(self, info):
+        return get_loader(info, DebateTranscriptLoader).load(self.id)
+
+    def resolve_text_preview(self, info, length):
+        return get_loader(info, DebateTranscriptPreviewLoader).load((self.id, max(length, 0)))
+
+
+class PressDebateClubType(graphene.ObjectType):
+
+    club = graphene.Field(ClubType)
+    appearance_count = graphene.Int()
+    speaker_count = graphene.Int()
+    seconds = graphene.Int()
+
+
+class PressDebateConnection(graphene.relay.Connection):
+    """Debate appearances on press in chronological order, with totals of all of them"""
+
+    appearance_count = graphene.Int()
+    speaker_count = graphene.Int()
+    seconds = graphene.Int()
+    clubs = graphene.List(PressDebateClubType, description='Totals per club, most seconds first')
+
+    class Meta:
+        node = DebateAppearanceType
+
+    def resolve_appearance_count(self, info):
+        return self.totals.appearance_count
+
+    def resolve_speaker_count(self, info):
+        return self.totals.speaker_count
+
+    def resolve_seconds(self, info):
+        return self.totals.seconds
+
+    def resolve_clubs(self, info):
+        return [
+            PressDebateClubType(
+                club=x.club, appearance_count=x.appearance_count,
+                speaker_count=x.speaker_count, seconds=x.seconds)
+            for x in PressDebateClub.objects.filter(
+                press=self.press_id).select_related('club').order_by('-seconds', 'club__name')
+        ]
+
+    @cached_property
+    def totals(self):
+        return PressDebate.objects.filter(press=self.press_id).first() or \
+            PressDebate(press_id=self.press_id)
+
+
+PRESS_DEBATE_CURSOR = 'PressDebate:{}|{}'
+
+
+def press_debate_cursor(entry):
+    return base64(PRESS_DEBATE_CURSOR.format(entry.start.isoformat(), entry.appearance_id))
+
+
+def press_debate_position(cursor):
+    """Start and appearance id of entry at cursor"""
+    try:
+        prefix, position = unbase64(cursor).split(':', 1)
+        start, appearance_id = position.split('|')
+        start, appearance_id = parse_datetime(start), int(appearance_id)
+    except (TypeError, ValueError):
+        raise Exception("Malformed cursor")
+    if prefix != 'PressDebate' or start is None:
+        raise Exception("Malformed cursor")
+    return start, appearance_id
+
+
+def press_debate(press_id, first, after=None):
+    """Page of debate on press after cursor, keyset paginated by debate index"""
+    entries = PressDebateAppearance.objects.filter(press=press_id)
+    if after is not None:
+        start, appearance_id = press_debate_position(after)
+        entries = entries.filter(
+            Q(start__gt=start) | Q(start=start, appearance__gt=appearance_id))
+    entries = list(entries.select_related('appearance').order_by(
+        'start', 'appearance')[:first + 1])
+
+    edges = [
+        PressDebateConnection.Edge(node=x.appearance, cursor=press_debate_cursor(x))
+        for x in entries[:first]
+    ]
+    connection = PressDebateConnection(
+        edges=edges,
+        page_info=PageInfo(
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            has_previous_page=after is not None,
+            has_next_page=len(entries) > first
+        )
+    )
+    connection.press_id = press_id
+    return connection
+
 
 class InterpellationType(DjangoObjectType):
 
@@ -223,18 +349,59 @@ class SessionProgramPointType(DjangoObjectType):
         }
 
 
+class SessionProgressStateType(graphene.ObjectType):
+
+    state = graphene.Int()
+    state_display = graphene.String()
+    point_count = graphene.Int()
+
+
+class SessionProgressType(graphene.ObjectType):
+    """Program point counters of session by state, read from one precomputed row"""
+
+    discussed = graphene.Int()
+    notdiscussed = graphene.Int()
+    moved = graphene.Int()
+    withdrawn = graphene.Int()
+    interrupted = graphene.Int()
+    point_count = graphene.Int()
+    next_point = graphene.Int(description='First program point not discussed yet')
+    states = graphene.List(SessionProgressStateType)
+
+    def resolve_states(self, info):
+        return [
+            SessionProgressStateType(
+                state=state,
+                state_display=SessionProgram.StateType.values[state],
+                point_count=getattr(self, counter)
+            )
+            for state, counter in SessionProgress.COUNTERS
+        ]
+
+
 class VotingChartSeriesType(graphene.ObjectType):
     labels = graphene.List(graphene.String)
     series = graphene.List(graphene.Int)
 
 
+class VotingClubChartSeriesType(graphene.ObjectType):
+    club = graphene.Field(ClubType)
+    labels = graphene.List(graphene.String)
+    series = graphene.List(graphene.Int)
+
+
 class VotingType(DjangoObjectType):
 
     chart_series = graphene.Field(VotingChartSeriesType)
+    chart_series_by_club = graphene.List(VotingClubChartSeriesType)
     result_display = graphene.String()
 
     class Meta:
         model = Voting
+        exclude_fields = [
+            'tallied', 'votes_for', 'votes_against', 'votes_abstain',
+            'votes_dnv', 'votes_absent', 'club_tallies'
+        ]
         connection_class = CountableConnectionBase
         interfaces = (Node, )
         filter_fields = {
@@ -264,7 +431,17 @@ class VotingType(DjangoObjectType):
         return CountableConnection
 
     def resolve_chart_series(self, info):
-        return VotingChartSeriesType(**self.chart_series())
+        if self.tallied:
+            return VotingChartSeriesType(**self.chart_series())
+        return get_loader(info, VotingLiveCountsLoader).load(self.id).then(
+            lambda counts: VotingChartSeriesType(**self.chart_series(counts)))
+
+    def resolve_chart_series_by_club(self, info):
+        return get_loader(info, VotingClubTallyLoader).load(self.id).then(
+            lambda tallies: [
+                VotingClubChartSeriesType(club=x.club, **x.chart_series()) for x in tallies
+            ]
+        )
 
 
 class VotingVoteType(DjangoObjectType):
@@ -330,6 +507,113 @@ class BillProcessStepType(DjangoObjectType):
         }
 
 
+class BillStageType(DjangoObjectType):
+
+    stage_display = graphene.String()
+
+    class Meta:
+        model = BillStage
+        description = 'Stage of Bill Timeline'
+        interfaces = (Node,)
+        only_fields = [
+            'bill', 'step', 'position', 'stage', 'outcome', 'entered', 'exited', 'duration',
+            'elapsed', 'final'
+        ]
+
+
+class BillStageDurationType(graphene.ObjectType):
+
+    stage = graphene.Int()
+    stage_display = graphene.String()
+    bill_count = graphene.Int()
+    mean_days = graphene.Float()
+    median_days = graphene.Float()
+    p90_days = graphene.Float()
+    median_elapsed_days = graphene.Float(
+        description='Median of days from delivery of bill to exit of stage')
+
+
+# Bill fields grouping the bill funnel
+FUNNEL_GROUPS = {
+    'proposer_type': 'proposer_type',
+    'category': 'category',
+    'club': 'clubs__club',
+    'coalition': 'clubs__club__coalition',
+}
+
+
+class BillFunnelGroup(graphene.Enum):
+
+    PROPOSER_TYPE = 'proposer_type'
+    CATEGORY = 'category'
+    CLUB = 'club'
+    COALITION = 'coalition'
+
+
+class BillFunnelStageType(graphene.ObjectType):
+
+    stage = graphene.Int()
+    stage_display = graphene.String()
+    bill_count = graphene.Int(description='Bills which reached the stage')
+    share = graphene.Float()
+
+
+class BillFunnelResultType(graphene.ObjectType):
+
+    result = graphene.Int()
+    result_display = graphene.String()
+    bill_count = graphene.Int()
+    share = graphene.Float()
+
+
+class BillFunnelType(graphene.ObjectType):
+    """Bills of a group by reached stages and final results"""
+
+    proposer_type = graphene.Int()
+    category = graphene.Int()
+    club = graphene.Field(ClubType)
+    coalition = graphene.Boolean()
+    bill_count = graphene.Int()
+    stages = graphene.List(BillFunnelStageType)
+    results = graphene.List(BillFunnelResultType)
+
+
+def bill_funnel(period_num, groups):
+    """
+    Bill counts of every group per reached stage and per final result as
+    plain data, computed in one grouped query. A bill of proposers from
+    several clubs counts in each of them.
+    """
+    fields = [FUNNEL_GROUPS[x] for x in groups]
+    aggregates = {'bill_count': Count('id', distinct=True)}
+    for stage in BillProcessStep.StepType.values:
+        aggregates['stage_{}'.format(stage)] = Count(
+            'id', distinct=True, filter=Q(timeline__stage=stage))
+    for result in Bill.Result.values:
+        aggregates['result_{}'.format(result)] = Count(
+            'id', distinct=True, filter=Q(result=result))
+
+    bills = Bill.objects.filter(press__period__period_num=period_num)
+    if fields:
+        rows = bills.values(*fields).annotate(**aggregates).order_by(*fields)
+    else:
+        rows = [bills.aggregate(**aggregates)]
+    return [
+        {
+            'groups': {x: row[FUNNEL_GROUPS[x]] for x in groups},
+            'bill_count': row['bill_count'],
+            'stages': [
+                (x, row['stage_{}'.format(x)]) for x in sorted(BillProcessStep.StepType.values)
+            ],
+            'results': [
+                (x, row['result_{}'.format(x)]) for x in sorted(Bill.Result.values)
+                if row['result_{}'.format(x)]
+            ],
+        }
+        for row in rows
+    ]
+
+
 class AmendmentSignedMemberType(DjangoObjectType):
 
     class Meta:
@@ -433,6 +717,7 @@ class ParliamentQueries(graphene.ObjectType):
     all_interpellations = OrderedDjangoFilterConnectionField(
         InterpellationType,
         orderBy=graphene.List(of_type=graphene.String),
+        filterset_class=InterpellationFilterSet,
         club=graphene.ID()
     )
 
@@ -462,6 +747,31 @@ class ParliamentQueries(graphene.ObjectType):
         orderBy=graphene.List(of_type=graphene.String),
     )
 
+    bill_timeline = graphene.List(BillStageType, bill=graphene.ID(required=True))
+    bill_stage_durations = graphene.List(
+        BillStageDurationType,
+        period_num=graphene.Int(required=True),
+        category=graphene.Int(),
+        proposer_type=graphene.Int(),
+        result=graphene.Int(description='Final result of bills')
+    )
+
+    bill_funnel = graphene.List(
+        BillFunnelType,
+        period_num=graphene.Int(required=True),
+        group_by=graphene.List(graphene.NonNull(BillFunnelGroup))
+    )
+
+    session_progress = graphene.Field(
+        SessionProgressType, session=graphene.ID(required=True))
+
+    press_debate = graphene.Field(
+        PressDebateConnection,
+        press=graphene.ID(required=True),
+        first=graphene.Int(),
+        after=graphene.String()
+    )
+
     amendment = Node.Field(AmendmentType)
     all_amendments = OrderedDjangoFilterConnectionField(
         AmendmentType,
@@ -469,3 +779,101 @@ class ParliamentQueries(graphene.ObjectType):
         filterset_class=AmendmentFilterSet,
         club=graphene.ID()
     )
+
+    def resolve_bill_timeline(self, info, bill):
+        try:
+            type_name, bill_id = from_global_id(bill)
+        except (TypeError, ValueError):
+            raise Exception("Malformed bill ID")
+        if type_name != 'BillType':
+            raise Exception("Malformed bill ID")
+        return BillStage.objects.filter(bill=bill_id).select_related('step')
+
+    def resolve_session_progress(self, info, session):
+        try:
+            type_name, session_id = from_global_id(session)
+        except (TypeError, ValueError):
+            raise Exception("Malformed session ID")
+        if type_name != 'SessionType':
+            raise Exception("Malformed session ID")
+        try:
+            # by primary key, first() would join sessions to order by them
+            return SessionProgress.objects.get(session=session_id)
+        except SessionProgress.DoesNotExist:
+            return None
+
+    def resolve_press_debate(self, info, press, first=None, after=None):
+        try:
+            type_name, press_id = from_global_id(press)
+        except (TypeError, ValueError):
+            raise Exception("Malformed press ID")
+        if type_name != 'PressType':
+            raise Exception("Malformed press ID")
+        max_limit = graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+        first = max_limit if first is None else max(min(first, max_limit), 0)
+        return press_debate(press_id, first, after)
+
+    def resolve_bill_stage_durations(self, info, period_num, category=None,
+                                     proposer_type=None, result=None):
+        stages = BillStage.objects.filter(period__period_num=period_num)
+        if category is not None:
+            stages = stages.filter(category=category)
+        if proposer_type is not None:
+            stages = stages.filter(proposer_type=proposer_type)
+        if result is not None:
+            stages = stages.filter(bill_result=result)
+
+        rows = stages.values('stage').annotate(
+            bill_count=Count('bill', distinct=True),
+            mean_days=Avg('duration'),
+            median_days=Percentile('duration', 0.5),
+            p90_days=Percentile('duration', 0.9),
+            median_elapsed_days=Percentile('elapsed', 0.5)
+        ).order_by('stage')
+        return [
+            BillStageDurationType(
+                stage_display=BillProcessStep.StepType.values[x['stage']], **x)
+            for x in rows
+        ]
+
+    def resolve_bill_funnel(self, info, period_num, group_by=None):
+        groups = sorted(set(group_by or ()))
+        funnel = cached(
+            ['bill-funnel', period_num, groups],
+            ['parliament.bill', 'parliament.billstage', 'parliament.billclub'],
+            lambda: bill_funnel(period_num, groups)
+        )
+        clubs = Club.objects.in_bulk(
+            [x['groups']['club'] for x in funnel if x['groups'].get('club')])
+
+        def share(count, total):
+            return count / total if total else None
+
+        return [
+            BillFunnelType(
+                **{
+                    **x['groups'],
+                    'club': clubs.get(x['groups'].get('club')),
+                },
+                bill_count=x['bill_count'],
+                stages=[
+                    BillFunnelStageType(
+                        stage=stage,
+                        stage_display=BillProcessStep.StepType.values[stage],
+                        bill_count=count,
+                        share=share(count, x['bill_count'])
+                    )
+                    for stage, count in x['stages']
+                ],
+                results=[
+                    BillFunnelResultType(
+                        result=result,
+                        result_display=Bill.Result.values[result],
+                        bill_count=count,
+                        share=share(count, x['bill_count'])
+                    )
+                    for result, count in x['results']
+                ]
+            )
+            for x in funnel
+        ]
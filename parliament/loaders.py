@@ -0,0 +1,60 @@
+"""
+Parliament DataLoaders batching related lookups of one GraphQL request
+"""
+
+from collections import defaultdict
+
+from promise import Promise
+
+from graphql_utils import FieldDataLoader
+from parliament.models import CommitteeSessionPoint, DebateTranscript, Voting, VotingClubTally
+
+
+class VotingClubTallyLoader(FieldDataLoader):
+    """Club tallies keyed by voting id"""
+
+    def batch_load_fn(self, keys):
+        tallies = defaultdict(list)
+        for tally in VotingClubTally.objects.filter(
+                voting__in=keys).select_related('club', 'club__period').order_by('club__name'):
+            tallies[tally.voting_id].append(tally)
+        return Promise.resolve([tallies[x] for x in keys])
+
+
+class VotingLiveCountsLoader(FieldDataLoader):
+    """Counters of votings not tallied yet counted from their votes, keyed by voting id"""
+
+    def batch_load_fn(self, keys):
+        counts = Voting.objects.live_counts(keys)
+        return Promise.resolve([counts[x] for x in keys])
+
+
+class DebateTranscriptLoader(FieldDataLoader):
+    """Transcript texts keyed by debate appearance id, empty when missing"""
+
+    def batch_load_fn(self, keys):
+        texts = DebateTranscript.objects.texts(keys)
+        return Promise.resolve([texts.get(x, '') for x in keys])
+
+
+class DebateTranscriptPreviewLoader(FieldDataLoader):
+    """Transcript beginnings keyed by (debate appearance id, length), empty when missing"""
+
+    def batch_load_fn(self, keys):
+        previews = {}
+        for length in {x[1] for x in keys}:
+            texts = DebateTranscript.objects.previews(
+                [x[0] for x in keys if x[1] == length], length)
+            previews.update(((k, length), v) for k, v in texts.items())
+        return Promise.resolve([previews.get(x, '') for x in keys])
+
+
+class CommitteeSessionPointLoader(FieldDataLoader):
+    """Points of committee sessions keyed by session id"""
+
+    def batch_load_fn(self, keys):
+        points = defaultdict(list)
+        for point in CommitteeSessionPoint.objects.filter(
+                session__in=keys).select_related('press').order_by('index', 'id'):
+            points[point.session_id].append(point)
+        return Promise.resolve([points[x] for x in keys])
@@ -0,0 +1,47 @@
+"""
+Refresh all data derived from ingested parliament data. Run once at the
+end of every ingestion run.
+"""
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+# commands in order of execution, later steps may use results of earlier ones
+STEPS = (
+    'update_voting_tallies',
+    'update_session_progress',
+    'recompress_transcripts',
+    'update_bill_timelines',
+    'update_press_debates',
+    'update_club_cohesion',
+    'update_ideal_points',
+    'update_cosponsorship',
+    'update_speaking_time',
+    'update_interpellation_responses',
+    'update_amendment_outcomes',
+    'update_committee_stats',
+    'build_snapshots',
+    'bump_data_generation',
+)
+
+
+class Command(BaseCommand):
+
+    help = 'Run all post-ingestion commands'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip',
+            action='append',
+            dest='skip',
+            choices=STEPS,
+            default=[],
+            help='Command to skip, can be repeated'
+        )
+
+    def handle(self, *args, **options):
+        for step in STEPS:
+            if step in options['skip']:
+                continue
+            self.stdout.write('Running {}'.format(step))
+            call_command(step, stdout=self.stdout, stderr=self.stderr)
@@ -0,0 +1,39 @@
+"""
+Store debate transcripts again with DEBATE_TRANSCRIPT_COMPRESSION. Run
+after ingestion and after changing the setting. Transcripts which
+ingestion wrote into DebateAppearance.text are moved into DebateTranscript
+first.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import DebateAppearance, DebateTranscript
+
+
+class Command(BaseCommand):
+
+    help = 'Recompress DebateTranscript rows stored with other than configured compression'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of transcripts recompressed at once'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = list(DebateAppearance.objects.exclude(text='').order_by(
+            'id').values_list('id', flat=True))
+        for offset in range(0, len(ids), batch_size):
+            DebateTranscript.objects.ingest(ids[offset:offset + batch_size])
+        self.stdout.write('Moved {} ingested transcripts'.format(len(ids)))
+
+        ids = list(DebateTranscript.objects.pending_compression().order_by(
+            'appearance').values_list('appearance', flat=True))
+        for offset in range(0, len(ids), batch_size):
+            DebateTranscript.objects.recompress(ids[offset:offset + batch_size])
+        self.stdout.write('Recompressed {} transcripts'.format(len(ids)))
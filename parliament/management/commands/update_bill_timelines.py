@@ -0,0 +1,60 @@
+"""
+Rebuild bill timelines from bill process steps and attribution of bills to
+clubs of their proposers. Run after each ingestion of bills, only bills
+with new or moved steps, changed result or unattributed proposers are
+processed unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Bill
+
+
+class Command(BaseCommand):
+
+    help = 'Update BillStage and BillClub rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Rebuild timelines of all bills, not only changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to bills of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of bills processed in one transaction'
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            timelines = clubs = Bill.objects.all()
+        else:
+            timelines = Bill.objects.pending_timelines()
+            clubs = Bill.objects.pending_clubs()
+        if options['period']:
+            timelines = timelines.filter(press__period__period_num=options['period'])
+            clubs = clubs.filter(press__period__period_num=options['period'])
+
+        total = self.update(timelines, Bill.objects.update_timelines, options['batch_size'])
+        self.stdout.write('Updated timelines of {} bills'.format(total))
+        total = self.update(clubs, Bill.objects.update_clubs, options['batch_size'])
+        self.stdout.write('Updated clubs of {} bills'.format(total))
+
+    def update(self, bills, update, batch_size):
+        ids = list(bills.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += update(Bill.objects.filter(id__in=ids[offset:offset + batch_size]))
+        return total
@@ -0,0 +1,49 @@
+"""
+Rebuild debate index and debate totals of presses from debate appearances
+on them. Run after each ingestion of debate appearances, only presses with
+new or removed appearances are processed unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Press
+
+
+class Command(BaseCommand):
+
+    help = 'Update PressDebateAppearance, PressDebate and PressDebateClub rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Rebuild debates of all presses, not only changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to presses of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of presses processed in one transaction'
+        )
+
+    def handle(self, *args, **options):
+        presses = Press.objects.all() if options['all'] else Press.objects.pending_debates()
+        if options['period']:
+            presses = presses.filter(period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(presses.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += Press.objects.update_debates(ids[offset:offset + batch_size])
+        self.stdout.write('Updated debates of {} presses'.format(total))
@@ -0,0 +1,49 @@
+"""
+Precompute program point counters of sessions. Run after each ingestion of
+session programs, only sessions whose program changed are processed
+unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Session
+
+
+class Command(BaseCommand):
+
+    help = 'Update SessionProgress rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Recompute progress of all sessions, not only changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to sessions of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of sessions processed in one transaction'
+        )
+
+    def handle(self, *args, **options):
+        sessions = Session.objects.all() if options['all'] else Session.objects.pending_progress()
+        if options['period']:
+            sessions = sessions.filter(period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(sessions.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += Session.objects.update_progress(ids[offset:offset + batch_size])
+        self.stdout.write('Updated progress of {} sessions'.format(total))
@@ -0,0 +1,50 @@
+"""
+Precompute vote counters of votings. Run after each ingestion of votings,
+only votings not tallied yet or with changed number of votes are processed
+unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Voting
+
+
+class Command(BaseCommand):
+
+    help = 'Update Voting counters and VotingClubTally rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Recompute tallies of all votings, not only new or changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to votings of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of votings processed in one transaction'
+        )
+
+    def handle(self, *args, **options):
+        votings = Voting.objects.all() if options['all'] else Voting.objects.pending_tallies()
+        if options['period']:
+            votings = votings.filter(session__period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(votings.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += Voting.objects.update_tallies(
+                Voting.objects.filter(id__in=ids[offset:offset + batch_size]))
+        self.stdout.write('Updated tallies of {} votings'.format(total))
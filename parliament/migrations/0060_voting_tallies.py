@@ -0,0 +1,60 @@
+# Generated by Django 2.2.12 on 2026-10-19 19:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0059_auto_20200410_1539'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voting',
+            name='tallied',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='voting',
+            name='votes_absent',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='voting',
+            name='votes_abstain',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='voting',
+            name='votes_against',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='voting',
+            name='votes_dnv',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='voting',
+            name='votes_for',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='VotingClubTally',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('votes_for', models.PositiveSmallIntegerField(default=0)),
+                ('votes_against', models.PositiveSmallIntegerField(default=0)),
+                ('votes_abstain', models.PositiveSmallIntegerField(default=0)),
+                ('votes_dnv', models.PositiveSmallIntegerField(default=0)),
+                ('votes_absent', models.PositiveSmallIntegerField(default=0)),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='voting_tallies', to='parliament.Club')),
+                ('voting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='club_tallies', to='parliament.Voting')),
+            ],
+            options={
+                'unique_together': {('voting', 'club')},
+            },
+        ),
+    ]
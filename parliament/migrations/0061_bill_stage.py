@@ -0,0 +1,41 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0060_voting_tallies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillStage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.SmallIntegerField(choices=[(0, 'Novela zákona'), (1, 'Návrh nového zákona'), (2, 'Iný typ'), (3, 'Petícia'), (4, 'Medzinárodná zmluva'), (5, 'Správa'), (6, 'Ústavný zákon'), (7, 'Informácia'), (8, 'Návrh zákona o štátnom rozpočte'), (9, 'Zákon vrátený prezidentom')])),
+                ('proposer_type', models.SmallIntegerField(blank=True, choices=[(0, 'Poslanci NR SR'), (1, 'Vláda'), (2, 'Výbor')], null=True)),
+                ('bill_result', models.SmallIntegerField(blank=True, choices=[(0, 'NR SR nebude pokračovať v rokovaní o návrhu zákona'), (1, 'NZ vzal navrhovateľ späť'), (2, 'Zápis uznesenia NR SR'), (3, 'NZ postúpil do redakcie'), (4, 'Zápis spoločnej správy výborov'), (5, 'NZ nebol schválený'), (6, 'Pripravená informácia k NZ'), (7, 'Zákon vyšiel v Zbierke zákonov'), (8, 'Zákon bol vrátený prezidentom'), (9, 'Zapísané uznesenie výboru'), (10, 'Výber právneho poradcu'), (11, 'NZ postúpil do II. čítania')], null=True)),
+                ('position', models.PositiveSmallIntegerField()),
+                ('stage', models.SmallIntegerField(choices=[(0, 'Podateľňa'), (1, 'Rozhodnutie predsedu NR SR'), (2, 'I. čítanie'), (3, 'Rokovanie výborov'), (4, 'Rokovanie gestorského výboru'), (5, 'II. čítanie'), (6, 'III. čítanie'), (7, 'Redakcia')])),
+                ('outcome', models.SmallIntegerField(choices=[(0, 'Zapísané rozhodnutie predsedu NR SR'), (1, 'Príprava informácie k NZ'), (2, 'NZ vzal navrhovateľ späť'), (3, 'NR SR nebude pokračovať v rokovaní o návrhu zákona'), (4, 'Zákon vyšiel v Zbierke zákonov.'), (5, 'NZ postupuje do redakcie'), (6, 'NZ postúpil do I. čítania'), (7, 'NZ postúpil do II. čítania'), (8, 'NZ postúpil do III. čítania'), (9, 'Zápis uznesenia / návrhu uznesenia výborov'), (10, 'NZ nebol schválený'), (11, 'Zákon bol vrátený prezidentom.')])),
+                ('entered', models.DateField(blank=True, null=True)),
+                ('exited', models.DateField(blank=True, null=True)),
+                ('duration', models.PositiveIntegerField(blank=True, null=True)),
+                ('elapsed', models.PositiveIntegerField(blank=True, null=True)),
+                ('final', models.BooleanField(default=False)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to='parliament.Bill')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Period')),
+                ('step', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stage', to='parliament.BillProcessStep')),
+            ],
+            options={
+                'ordering': ('bill', 'position'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='billstage',
+            index=models.Index(fields=['period', 'stage', 'category', 'proposer_type'], name='parliament__period__f41dd9_idx'),
+        ),
+    ]
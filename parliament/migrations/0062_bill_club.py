@@ -0,0 +1,26 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0061_bill_stage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillClub',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('proposer_count', models.PositiveSmallIntegerField()),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clubs', to='parliament.Bill')),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bills', to='parliament.Club')),
+            ],
+            options={
+                'unique_together': {('bill', 'club')},
+            },
+        ),
+    ]
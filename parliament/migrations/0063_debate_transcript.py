@@ -0,0 +1,39 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0062_bill_club'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DebateTranscript',
+            fields=[
+                ('appearance', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='transcript', serialize=False, to='parliament.DebateAppearance')),
+                ('compression', models.SmallIntegerField(choices=[(0, '-'), (1, 'zstd')], default=0)),
+                ('data', models.BinaryField()),
+            ],
+        ),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO parliament_debatetranscript (appearance_id, compression, data)
+            SELECT id, 0, convert_to(text, 'UTF8') FROM parliament_debateappearance
+            WHERE text <> '';
+            """,
+            # compressed transcripts are lost, run recompress_transcripts without compression first
+            reverse_sql="""
+            UPDATE parliament_debateappearance SET text = convert_from(t.data, 'UTF8')
+            FROM parliament_debatetranscript t
+            WHERE t.appearance_id = parliament_debateappearance.id AND t.compression = 0;
+            """
+        ),
+        migrations.RemoveField(
+            model_name='debateappearance',
+            name='text',
+        ),
+    ]
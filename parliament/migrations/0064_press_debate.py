@@ -0,0 +1,53 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0063_debate_transcript'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PressDebate',
+            fields=[
+                ('press', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='debate', serialize=False, to='parliament.Press')),
+                ('appearance_count', models.PositiveIntegerField(default=0)),
+                ('speaker_count', models.PositiveIntegerField(default=0)),
+                ('seconds', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PressDebateAppearance',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('seconds', models.PositiveIntegerField()),
+                ('appearance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.DebateAppearance')),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Club')),
+                ('debater', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Member')),
+                ('press', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='debate_appearances', to='parliament.Press')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PressDebateClub',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('appearance_count', models.PositiveIntegerField(default=0)),
+                ('speaker_count', models.PositiveIntegerField(default=0)),
+                ('seconds', models.PositiveIntegerField(default=0)),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Club')),
+                ('press', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='debate_clubs', to='parliament.Press')),
+            ],
+            options={
+                'unique_together': {('press', 'club')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pressdebateappearance',
+            index=models.Index(fields=['press', 'start', 'appearance'], name='parliament__press_i_1b62a8_idx'),
+        ),
+    ]
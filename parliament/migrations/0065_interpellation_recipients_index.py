@@ -0,0 +1,18 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:37
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0064_press_debate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interpellation',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['recipients'], name='parliament__recipie_42e3ac_gin'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0065_interpellation_recipients_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionProgress',
+            fields=[
+                ('session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress', serialize=False, to='parliament.Session')),
+                ('discussed', models.PositiveSmallIntegerField(default=0)),
+                ('notdiscussed', models.PositiveSmallIntegerField(default=0)),
+                ('moved', models.PositiveSmallIntegerField(default=0)),
+                ('withdrawn', models.PositiveSmallIntegerField(default=0)),
+                ('interrupted', models.PositiveSmallIntegerField(default=0)),
+                ('next_point', models.PositiveSmallIntegerField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='sessionprogram',
+            index=models.Index(fields=['session', 'state', 'point'], name='parliament__session_54e51d_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0066_session_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='debatetranscript',
+            name='compression_attempted',
+            field=models.SmallIntegerField(choices=[(0, '-'), (1, 'zstd')], default=0),
+        ),
+        # transcripts stored uncompressed are attempted once more
+        migrations.RunSQL(
+            sql='UPDATE parliament_debatetranscript SET compression_attempted = compression;',
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.12 on 2026-10-19 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0067_debate_transcript_compression_attempted'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='debateappearance',
+            name='text',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -2,14 +2,18 @@
 Parliament Models
 """
 
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime
 
 from django.contrib.postgres.fields import ArrayField
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
+from django.db.models.functions import Cast, Coalesce, Extract, Greatest, Substr, TruncDate
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from djchoices import DjangoChoices, ChoiceItem
 
+from parliament import transcripts
 from parliament.choices import DocumentCategory
 
 
@@ -98,11 +102,9 @@ class CommitteeMember(models.Model):
 
 
 class CommitteeSessionManager(models.Manager):
-    
+
     def get_queryset(self):
-        return super().get_queryset().select_related(
-            'committee'
-        ).prefetch_related('points')
+        return super().get_queryset().select_related('committee')
 
 
 class CommitteeSession(models.Model):
@@ -112,19 +114,19 @@ class CommitteeSession(models.Model):
     end = models.DateTimeField(null=True, blank=True)
     place = models.TextField()
 
-    objects = CommitteeSessionManager
+    objects = CommitteeSessionManager()
 
     class Meta:
         unique_together = (('committee', 'start'),)
 
     def __str__(self):
-        return '{} - {}'.format(self.start)
+        return '{} - {}'.format(self.committee, self.start)
 
 
 class CommitteeSessionPointManager(models.Manager):
 
     def get_queryset(self):
-        return super().get_queryset().select_related('committee', 'session')
+        return super().get_queryset().select_related('session__committee')
 
 
 class CommitteeSessionPoint(models.Model):
@@ -230,6 +232,19 @@ class ClubMemberManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().select_related('club', 'member', 'member__person')
 
+    def club_at(self, member, date):
+        """
+        Subquery resolving the club of outer ``member`` reference at outer ``date``
+        reference, None for members without club at that date
+        """
+        return models.Subquery(
+            self.filter(
+                models.Q(member=models.OuterRef(member)),
+                models.Q(start__lte=models.OuterRef(date)),
+                models.Q(end__gte=models.OuterRef(date)) | models.Q(end__isnull=True)
+            ).order_by('-start').values('club')[:1]
+        )
+
 
 class ClubMember(models.Model):
 
@@ -273,6 +288,86 @@ class PressManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().prefetch_related('votings')
 
+    def pending_debates(self):
+        """
+        Presses whose debate appearances differ from their debate index in
+        number, appearances, seconds or debaters, compared by sums
+        """
+        links = DebateAppearance.press_num.through.objects.filter(
+            press=models.OuterRef('pk')
+        ).annotate(
+            seconds=DebateAppearance.duration_seconds('debateappearance__')
+        ).order_by().values('press')
+        indexed = PressDebateAppearance.objects.filter(
+            press=models.OuterRef('pk')).order_by().values('press')
+        checksums = (
+            ('appearances', models.Count('id'), models.Count('id')),
+            ('appearance_ids', models.Sum('debateappearance'), models.Sum('appearance')),
+            ('seconds', models.Sum('seconds'), models.Sum('seconds')),
+            ('debaters', models.Sum('debateappearance__debater'), models.Sum('debater')),
+        )
+        annotations = {}
+        stale = models.Q()
+        for name, linked, stored in checksums:
+            annotations[name] = Coalesce(models.Subquery(
+                links.annotate(total=linked).values('total'),
+                output_field=models.IntegerField()), 0)
+            annotations['{}_indexed'.format(name)] = Coalesce(models.Subquery(
+                indexed.annotate(total=stored).values('total'),
+                output_field=models.IntegerField()), 0)
+            stale |= ~models.Q(**{name: models.F('{}_indexed'.format(name))})
+        return self.prefetch_related(None).annotate(**annotations).filter(stale)
+
+    def update_debates(self, presses):
+        """
+        Rebuild debate index and debate totals of given presses from debate
+        appearances on them. Appearances are attributed to the club of their
+        debater at the day of the appearance.
+        """
+        press_ids = [getattr(x, 'pk', x) for x in presses]
+        if not press_ids:
+            return 0
+        links = DebateAppearance.press_num.through.objects.filter(
+            press__in=press_ids
+        ).annotate(
+            day=TruncDate('debateappearance__start')
+        ).annotate(
+            club=ClubMember.objects.club_at('debateappearance__debater', 'day'),
+            seconds=DebateAppearance.duration_seconds('debateappearance__')
+        ).values_list(
+            'press', 'debateappearance', 'debateappearance__start', 'seconds',
+            'debateappearance__debater', 'debateappearance__debater_ext', 'club'
+        )
+
+        index = []
+        totals = {(x, None): PressDebate(press_id=x) for x in press_ids}
+        speakers = defaultdict(set)
+        for press, appearance, start, seconds, debater, debater_ext, club in links:
+            index.append(PressDebateAppearance(
+                press_id=press, appearance_id=appearance, start=start, debater_id=debater,
+                club_id=club, seconds=seconds))
+            keys = [(press, None)] if club is None else [(press, None), (press, club)]
+            for key in keys:
+                if key not in totals:
+                    totals[key] = PressDebateClub(press_id=press, club_id=club)
+                totals[key].appearance_count += 1
+                totals[key].seconds += seconds
+                if debater or debater_ext:
+                    speakers[key].add(debater or debater_ext)
+        for key, total in totals.items():
+            total.speaker_count = len(speakers[key])
+
+        with transaction.atomic():
+            PressDebateAppearance.objects.filter(press__in=press_ids).delete()
+            PressDebate.objects.filter(press__in=press_ids).delete()
+            PressDebateClub.objects.filter(press__in=press_ids).delete()
+            PressDebateAppearance.objects.bulk_create(index)
+            PressDebate.objects.bulk_create(
+                x for (_, club), x in totals.items() if club is None)
+            PressDebateClub.objects.bulk_create(
+                x for (_, club), x in totals.items() if club is not None)
+        return len(press_ids)
+
 
 class Press(models.Model):
     """
@@ -310,6 +405,51 @@ class PressAttachment(models.Model):
         return self.title
 
 
+class SessionManager(models.Manager):
+
+    def pending_progress(self):
+        """Sessions whose program differs from their progress counters"""
+        progress = SessionProgress.objects.filter(session=models.OuterRef('pk'))
+        for state, counter in SessionProgress.COUNTERS:
+            states = SessionProgram.objects.filter(session=models.OuterRef('pk'), state=state)
+            progress = progress.filter(**{counter: Coalesce(models.Subquery(
+                states.order_by().values('session').annotate(
+                    total=models.Count('id')).values('total')), 0)})
+        return self.annotate(
+            same_progress=models.Exists(progress)
+        ).filter(same_progress=False)
+
+    def update_progress(self, sessions):
+        """
+        Recompute SessionProgress rows of given sessions from their program,
+        next point is the first point not discussed yet
+        """
+        session_ids = [getattr(x, 'pk', x) for x in sessions]
+        if not session_ids:
+            return 0
+        counters = {
+            counter: models.Count('id', filter=models.Q(state=state))
+            for state, counter in SessionProgress.COUNTERS
+        }
+        rows = {
+            x.pop('session'): x
+            for x in SessionProgram.objects.filter(
+                session__in=session_ids
+            ).values('session').annotate(
+                next_point=models.Min(
+                    'point', filter=models.Q(state=SessionProgram.StateType.notdiscussed)),
+                **counters
+            ).order_by()
+        }
+        progress = [
+            SessionProgress(session_id=x, **rows.get(x, {})) for x in session_ids
+        ]
+        with transaction.atomic():
+            SessionProgress.objects.filter(session__in=session_ids).delete()
+            SessionProgress.objects.bulk_create(progress)
+        return len(session_ids)
+
+
 class Session(models.Model):
     """
     Parliament Sessions
@@ -320,6 +460,8 @@ class Session(models.Model):
     session_num = models.PositiveIntegerField(null=True, blank=True)
     url = models.URLField()
 
+    objects = SessionManager()
+
     class Meta:
         ordering = ('-period', '-session_num')
 
@@ -349,11 +491,40 @@ class SessionProgram(models.Model):
 
     class Meta:
         ordering = ('session', 'point')
+        indexes = [
+            models.Index(fields=['session', 'state', 'point']),
+        ]
 
     def __str__(self):
         return '{}. {}'.format(self.point, self.text1)
 
 
+class SessionProgress(models.Model):
+    """
+    Precomputed program point counters of a session by state
+    """
+    session = models.OneToOneField(
+        Session, on_delete=models.CASCADE, primary_key=True, related_name='progress')
+    discussed = models.PositiveSmallIntegerField(default=0)
+    notdiscussed = models.PositiveSmallIntegerField(default=0)
+    moved = models.PositiveSmallIntegerField(default=0)
+    withdrawn = models.PositiveSmallIntegerField(default=0)
+    interrupted = models.PositiveSmallIntegerField(default=0)
+    next_point = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    COUNTERS = (
+        (SessionProgram.StateType.discussed, 'discussed'),
+        (SessionProgram.StateType.notdiscussed, 'notdiscussed'),
+        (SessionProgram.StateType.moved, 'moved'),
+        (SessionProgram.StateType.withdrawn, 'withdrawn'),
+        (SessionProgram.StateType.interrupted, 'interrupted'),
+    )
+
+    @property
+    def point_count(self):
+        return sum(getattr(self, x[1]) for x in self.COUNTERS)
+
+
 class SessionAttachment(models.Model):
     """
     Parliament Session Attachments
@@ -366,13 +537,114 @@ class SessionAttachment(models.Model):
         return '{} {}'.format(self.session, self.title)
 
 
+class VoteCounts(models.Model):
+    """
+    Precomputed vote counters of a voting
+    """
+    votes_for = models.PositiveSmallIntegerField(default=0)
+    votes_against = models.PositiveSmallIntegerField(default=0)
+    votes_abstain = models.PositiveSmallIntegerField(default=0)
+    votes_dnv = models.PositiveSmallIntegerField(default=0)
+    votes_absent = models.PositiveSmallIntegerField(default=0)
+
+    COUNTERS = (
+        (0, 'votes_for'),
+        (1, 'votes_against'),
+        (2, 'votes_abstain'),
+        (3, 'votes_dnv'),
+        (4, 'votes_absent'),
+    )
+
+    class Meta:
+        abstract = True
+
+    def vote_counts(self):
+        """Totals keyed by counter name"""
+        return {counter: getattr(self, counter) for _, counter in self.COUNTERS}
+
+    def chart_series(self, counts=None):
+        series = []
+        labels = []
+        counts = self.vote_counts() if counts is None else counts
+        for label, counter in zip(VotingVote.OPTIONS, self.COUNTERS):
+            total = counts[counter[1]]
+            if total:
+                labels.append(label[1])
+                series.append(total)
+        return {'series': series, 'labels': labels}
+
+
 class VotingManager(models.Manager):
 
     def get_queryset(self):
         return super().get_queryset().select_related('session', 'press')
 
-
-class Voting(models.Model):
+    def pending_tallies(self):
+        """Votings not tallied yet or with votes of any option differing from their counters"""
+        votes = VotingVote.objects.filter(voting=models.OuterRef('pk'))
+        stale = models.Q(tallied=False)
+        annotations = {}
+        for vote, counter in VoteCounts.COUNTERS:
+            annotations['{}_live'.format(counter)] = Coalesce(models.Subquery(
+                votes.filter(vote=vote).order_by().values('voting').annotate(
+                    total=models.Count('id')).values('total'),
+                output_field=models.IntegerField()), 0)
+            stale |= ~models.Q(**{counter: models.F('{}_live'.format(counter))})
+        return self.annotate(**annotations).filter(stale)
+
+    def live_counts(self, voting_ids):
+        """Counters of given votings counted from their votes, keyed by voting id"""
+        counters = dict(VoteCounts.COUNTERS)
+        counts = {x: {counter: 0 for _, counter in VoteCounts.COUNTERS} for x in voting_ids}
+        for row in VotingVote.objects.filter(voting__in=voting_ids).values(
+                'voting', 'vote').annotate(total=models.Count('id')).order_by():
+            counts[row['voting']][counters[row['vote']]] = row['total']
+        return counts
+
+    def update_tallies(self, votings):
+        """
+        Recompute VoteCounts of given votings and their VotingClubTally rows
+        """
+        votings = list(votings)
+        if not votings:
+            return 0
+        counters = {
+            counter: models.Count('id', filter=models.Q(vote=vote))
+            for vote, counter in VoteCounts.COUNTERS
+        }
+        sums = VotingVote.objects.filter(
+            voting__in=votings
+        ).annotate(
+            voting_date=TruncDate('voting__timestamp')
+        ).annotate(
+            club=ClubMember.objects.club_at('voter', 'voting_date')
+        ).values('voting', 'club').annotate(**counters).order_by()
+
+        tallies = []
+        totals = {x.id: {counter: 0 for _, counter in VoteCounts.COUNTERS} for x in votings}
+        for row in sums:
+            tallies.append(VotingClubTally(**{
+                'voting_id': row.pop('voting'),
+                'club_id': row.pop('club'),
+                **row
+            }))
+            for counter, total in row.items():
+                totals[tallies[-1].voting_id][counter] += total
+
+        for voting in votings:
+            for counter, total in totals[voting.id].items():
+                setattr(voting, counter, total)
+            voting.tallied = True
+
+        with transaction.atomic():
+            VotingClubTally.objects.filter(voting__in=votings).delete()
+            VotingClubTally.objects.bulk_create(tallies)
+            self.bulk_update(
+                votings, [x[1] for x in VoteCounts.COUNTERS] + ['tallied'])
+        return len(votings)
+
+
+class Voting(VoteCounts):
     PASSED = 0
     DID_NOT_PASS = 1
     INQUORATE = 2
@@ -395,6 +667,7 @@ class Voting(models.Model):
     timestamp = models.DateTimeField()
     result = models.SmallIntegerField(choices=RESULTS)
     url = models.URLField()
+    tallied = models.BooleanField(default=False, db_index=True)
     objects = VotingManager()
 
     class Meta:
@@ -404,18 +677,28 @@ class Voting(models.Model):
     def result_display(self):
         return self.get_result_display()
 
-    def chart_series(self):
-        display = {
-            x[0]: x[1]
-            for x in VotingVote._meta.get_field('vote').flatchoices
-        }
-        sums = self.votes.values('vote').annotate(total=models.Count('vote')).order_by('vote')
-        series = []
-        labels = []
-        for dct in sums:
-            labels.append(display[dct['vote']])
-            series.append(dct['total'])
-        return {'series': series, 'labels': labels}
+    def vote_counts(self):
+        """
+        Counters, counted from votes until the voting is tallied. Lists of
+        votings should batch the count with VotingManager.live_counts.
+        """
+        if self.tallied:
+            return super().vote_counts()
+        return Voting.objects.live_counts([self.id])[self.id]
+
+
+class VotingClubTally(VoteCounts):
+    """
+    Vote counters of club members in a voting, club membership is taken
+    at the date of the voting
+    """
+    voting = models.ForeignKey(
+        Voting, on_delete=models.CASCADE, related_name='club_tallies')
+    club = models.ForeignKey(
+        'Club', on_delete=models.CASCADE, null=True, blank=True, related_name='voting_tallies')
+
+    class Meta:
+        unique_together = (('voting', 'club'),)
 
 
 class VotingVoteManager(models.Manager):
@@ -468,6 +751,133 @@ class BillManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().select_related('press')
 
+    def pending_timelines(self):
+        """
+        Bills with process steps, step dates, delivery or final result not
+        reflected in their timeline
+        """
+        stages = BillStage.objects.filter(bill=models.OuterRef('pk'))
+        moved = stages.annotate(
+            step_date=Coalesce(
+                'step__meeting_resolution_date', 'step__coordinator_meeting_date',
+                'step__sent_label'),
+            delivered=models.F('bill__delivered')
+        ).filter(
+            models.Q(stage=BillProcessStep.StepType.registry) & (
+                models.Q(entered__isnull=True) | ~models.Q(entered=models.F('delivered'))) |
+            ~models.Q(stage=BillProcessStep.StepType.registry) & models.Q(
+                step_date__isnull=False) & (
+                    models.Q(entered__isnull=True) | ~models.Q(entered=models.F('step_date')))
+        )
+        return self.annotate(
+            new_steps=models.Exists(BillProcessStep.objects.filter(
+                bill=models.OuterRef('pk'), stage__isnull=True)),
+            moved_steps=models.Exists(moved),
+            has_timeline=models.Exists(stages),
+            same_result=models.Exists(stages.filter(bill_result=models.OuterRef('result'))),
+            without_result=models.Exists(stages.filter(bill_result__isnull=True))
+        ).filter(
+            models.Q(new_steps=True) | models.Q(moved_steps=True) |
+            models.Q(has_timeline=True) & ~(
+                models.Q(same_result=True) | models.Q(result__isnull=True, without_result=True))
+        )
+
+    def update_timelines(self, bills):
+        """
+        Rebuild BillStage rows of given bills from their process steps. A stage
+        is entered at the date of its step, the registry at the delivery of the
+        bill, and exited when the next stage is entered. The last stage of
+        a concluded bill is exited when entered.
+        """
+        bills = list(bills)
+        if not bills:
+            return 0
+        steps = defaultdict(list)
+        for step in BillProcessStep.objects.filter(bill__in=bills).order_by('external_id'):
+            steps[step.bill_id].append(step)
+
+        stages = []
+        for bill in bills:
+            timeline = []
+            entered = None
+            for step in steps[bill.id]:
+                if step.step_type == BillProcessStep.StepType.registry:
+                    entered = bill.delivered
+                else:
+                    entered = step.meeting_resolution_date or step.coordinator_meeting_date \
+                        or step.sent_label or entered
+                timeline.append((entered or date.min, step.step_type, step, entered))
+            timeline.sort(key=lambda x: x[:2])
+
+            for position, (_entered_sort, _step_type, step, entered) in enumerate(timeline):
+                if position + 1 < len(timeline):
+                    exited = timeline[position + 1][3]
+                elif bill.result in Bill.CONCLUDED:
+                    exited = entered
+                else:
+                    exited = None
+                stages.append(BillStage(
+                    bill=bill,
+                    step=step,
+                    period_id=bill.press.period_id,
+                    category=bill.category,
+                    proposer_type=bill.proposer_type,
+                    bill_result=bill.result,
+                    position=position,
+                    stage=step.step_type,
+                    outcome=step.step_result,
+                    entered=entered,
+                    exited=exited,
+                    # step dates of ingested bills are not always in order
+                    duration=max((exited - entered).days, 0) if entered and exited else None,
+                    elapsed=max((exited - bill.delivered).days, 0) if exited else None,
+                    final=position + 1 == len(timeline)
+                ))
+
+        with transaction.atomic():
+            BillStage.objects.filter(bill__in=bills).delete()
+            BillStage.objects.bulk_create(stages)
+        return len(bills)
+
+    def pending_clubs(self):
+        """Bills with proposers in clubs not matching their club attribution"""
+        attributed = BillClub.objects.filter(
+            bill=models.OuterRef('pk')
+        ).order_by().values('bill').annotate(total=models.Sum('proposer_count')).values('total')
+        in_clubs = BillProposer.objects.filter(
+            bill=models.OuterRef('pk')
+        ).annotate(
+            club=ClubMember.objects.club_at('member', 'bill__delivered')
+        ).filter(
+            club__isnull=False
+        ).order_by().values('bill').annotate(total=models.Count('id')).values('total')
+        return self.annotate(
+            attributed=Coalesce(
+                models.Subquery(attributed, output_field=models.IntegerField()), 0),
+            in_clubs=Coalesce(models.Subquery(in_clubs, output_field=models.IntegerField()), 0)
+        ).exclude(attributed=models.F('in_clubs'))
+
+    def update_clubs(self, bills):
+        """Rebuild BillClub rows of given bills from clubs of proposers at delivery"""
+        bills = list(bills)
+        if not bills:
+            return 0
+        attribution = BillProposer.objects.filter(
+            bill__in=bills
+        ).annotate(
+            club=ClubMember.objects.club_at('member', 'bill__delivered')
+        ).filter(
+            club__isnull=False
+        ).values('bill', 'club').annotate(proposer_count=models.Count('id')).order_by()
+
+        with transaction.atomic():
+            BillClub.objects.filter(bill__in=bills).delete()
+            BillClub.objects.bulk_create([
+                BillClub(bill_id=x['bill'], club_id=x['club'], proposer_count=x['proposer_count'])
+                for x in attribution
+            ])
+        return len(bills)
+
 
 class Bill(models.Model):
 
@@ -506,6 +916,11 @@ class Bill(models.Model):
         government = ChoiceItem(1, 'Vláda')
         committee = ChoiceItem(2, 'Výbor')
 
+    # results after which the bill does not move to another stage
+    CONCLUDED = (
+        Result.wont_continue, Result.taken_back, Result.wasnot_approved, Result.published
+    )
+
     external_id = models.PositiveIntegerField(unique=True)
     category = models.SmallIntegerField(choices=Category.choices)
     press = models.ForeignKey(Press, on_delete=models.CASCADE)
@@ -533,6 +948,19 @@ class BillProposer(models.Model):
         unique_together = (('bill', 'member'),)
 
 
+class BillClub(models.Model):
+    """
+    Club of bill proposers at delivery of the bill, a bill is attributed
+    to every club one of its proposers was member of
+    """
+    bill = models.ForeignKey(Bill, on_delete=models.CASCADE, related_name='clubs')
+    club = models.ForeignKey('Club', on_delete=models.CASCADE, related_name='bills')
+    proposer_count = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = (('bill', 'club'),)
+
+
 class BillProcessStep(models.Model):
 
     class StepType(DjangoChoices):
@@ -583,6 +1011,48 @@ class BillProcessStep(models.Model):
     sent_label = models.DateField(null=True, blank=True)
     act_num_label = models.CharField(max_length=12)
 
+
+class BillStageManager(models.Manager):
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('bill', 'bill__press')
+
+
+class BillStage(models.Model):
+    """
+    Stage of bill timeline derived from its process step, with bill
+    attributes copied for aggregations over stages. Durations and elapsed
+    time since delivery of the bill are in days.
+    """
+    bill = models.ForeignKey(Bill, on_delete=models.CASCADE, related_name='timeline')
+    step = models.OneToOneField(BillProcessStep, on_delete=models.CASCADE, related_name='stage')
+    period = models.ForeignKey('Period', on_delete=models.CASCADE, related_name='+')
+    category = models.SmallIntegerField(choices=Bill.Category.choices)
+    proposer_type = models.SmallIntegerField(
+        choices=Bill.Proposer.choices, null=True, blank=True)
+    bill_result = models.SmallIntegerField(choices=Bill.Result.choices, null=True, blank=True)
+    position = models.PositiveSmallIntegerField()
+    stage = models.SmallIntegerField(choices=BillProcessStep.StepType.choices)
+    outcome = models.SmallIntegerField(choices=BillProcessStep.ResultType.choices)
+    entered = models.DateField(null=True, blank=True)
+    exited = models.DateField(null=True, blank=True)
+    duration = models.PositiveIntegerField(null=True, blank=True)
+    elapsed = models.PositiveIntegerField(null=True, blank=True)
+    final = models.BooleanField(default=False)
+
+    objects = BillStageManager()
+
+    class Meta:
+        ordering = ('bill', 'position')
+        indexes = [
+            models.Index(fields=['period', 'stage', 'category', 'proposer_type']),
+        ]
+
+    @property
+    def stage_display(self):
+        return self.get_stage_display()
+
+
 # class BillAmendment(models.Model):
 #     bill_step = models.ForeignKey(BillProcessStep, on_delete=models.CASCADE)
 #     date = models.DateField()
@@ -626,11 +1096,162 @@ class DebateAppearance(models.Model):
     appearance_addition = models.CharField(max_length=128, default='', blank=True)
     debater_ext = models.CharField(max_length=128, default='', blank=True)
     debater_role = models.TextField(default='', blank=True)
+    # transcript written by ingestion, moved into DebateTranscript by
+    # recompress_transcripts; ingestion should use DebateTranscript.objects.store
     text = models.TextField(default='', blank=True)
 
     class Meta:
         ordering = ('external_id',)
 
+    @staticmethod
+    def duration_seconds(prefix=''):
+        """
+        Expression of whole seconds of appearance at prefix, appearances
+        ending before their start are ingestion errors and count 0
+        """
+        duration = models.ExpressionWrapper(
+            models.F(prefix + 'end') - models.F(prefix + 'start'),
+            output_field=models.DurationField())
+        return Greatest(
+            Cast(Extract(duration, 'epoch'), models.IntegerField()), models.Value(0),
+            output_field=models.IntegerField())
+
+
+class DebateTranscriptManager(models.Manager):
+
+    def texts(self, appearance_ids):
+        """Transcript texts keyed by appearance id, appearances without transcript left out"""
+        return {
+            appearance_id: transcripts.decompress(compression, data)
+            for appearance_id, compression, data in self.filter(
+                appearance__in=appearance_ids).values_list('appearance', 'compression', 'data')
+        }
+
+    def previews(self, appearance_ids, length):
+        """
+        Transcript beginnings of given length keyed by appearance id, only
+        bytes of the beginning of uncompressed transcripts are read
+        """
+        previews = {}
+        # UTF-8 characters take at most 4 bytes, a cut character is dropped
+        for appearance_id, data in self.filter(
+                appearance__in=appearance_ids, compression=transcripts.NONE
+        ).annotate(
+            beginning=Substr('data', 1, 4 * length)
+        ).values_list('appearance', 'beginning'):
+            previews[appearance_id] = bytes(data).decode('utf-8', 'ignore')[:length]
+        for appearance_id, compression, data in self.filter(
+                appearance__in=appearance_ids).exclude(compression=transcripts.NONE).values_list(
+                    'appearance', 'compression', 'data'):
+            previews[appearance_id] = transcripts.decompress(compression, data)[:length]
+        return previews
+
+    @transaction.atomic
+    def store(self, texts):
+        """
+        Replace transcripts of appearances by texts keyed by appearance id.
+        Entry point of ingestion, texts are compressed with
+        DEBATE_TRANSCRIPT_COMPRESSION.
+        """
+        self.filter(appearance__in=texts).delete()
+        attempted = transcripts.compression()
+        self.bulk_create([
+            DebateTranscript(
+                appearance_id=appearance_id, compression=compression,
+                compression_attempted=attempted, data=data)
+            for appearance_id, (compression, data) in (
+                (k, transcripts.compress(v, attempted)) for k, v in texts.items() if v
+            )
+        ])
+
+    def pending_compression(self):
+        """
+        Transcripts not yet stored with configured compression, transcripts
+        which did not shrink when compressed are stored as they are and not
+        attempted again
+        """
+        return self.exclude(compression_attempted=transcripts.compression())
+
+    @transaction.atomic
+    def ingest(self, appearance_ids):
+        """Move transcripts written into DebateAppearance.text of given appearances"""
+        appearances = DebateAppearance.objects.filter(id__in=appearance_ids).exclude(text='')
+        self.store(dict(appearances.values_list('id', 'text')))
+        appearances.update(text='')
+
+    @transaction.atomic
+    def recompress(self, appearance_ids):
+        """Store transcripts again with configured compression"""
+        self.store(self.texts(appearance_ids))
+
+
+class DebateTranscript(models.Model):
+    """
+    Transcript of debate appearance, kept apart so that queries of
+    appearances never read transcript bytes
+    """
+
+    class CompressionType(DjangoChoices):
+        none = ChoiceItem(transcripts.NONE, "-")
+        zstd = ChoiceItem(transcripts.ZSTD, "zstd")
+
+    appearance = models.OneToOneField(
+        DebateAppearance, on_delete=models.CASCADE, primary_key=True, related_name='transcript')
+    compression = models.SmallIntegerField(
+        choices=CompressionType.choices, default=CompressionType.none)
+    # configured compression when stored, differs from compression when
+    # the transcript did not shrink
+    compression_attempted = models.SmallIntegerField(
+        choices=CompressionType.choices, default=CompressionType.none)
+    data = models.BinaryField()
+
+    objects = DebateTranscriptManager()
+
+    @property
+    def text(self):
+        return transcripts.decompress(self.compression, self.data)
+
+
+class PressDebateAppearance(models.Model):
+    """
+    Debate appearance on press, denormalized from DebateAppearance.press_num
+    so that speeches on a press are paged chronologically by index
+    """
+    press = models.ForeignKey(Press, on_delete=models.CASCADE, related_name='debate_appearances')
+    appearance = models.ForeignKey(DebateAppearance, on_delete=models.CASCADE, related_name='+')
+    start = models.DateTimeField()
+    debater = models.ForeignKey(
+        'Member', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    club = models.ForeignKey(
+        'Club', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    seconds = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['press', 'start', 'appearance']),
+        ]
+
+
+class PressDebate(models.Model):
+    """Totals of debate appearances on press"""
+    press = models.OneToOneField(
+        Press, on_delete=models.CASCADE, primary_key=True, related_name='debate')
+    appearance_count = models.PositiveIntegerField(default=0)
+    speaker_count = models.PositiveIntegerField(default=0)
+    seconds = models.PositiveIntegerField(default=0)
+
+
+class PressDebateClub(models.Model):
+    """Totals of debate appearances on press by members of club"""
+    press = models.ForeignKey(Press, on_delete=models.CASCADE, related_name='debate_clubs')
+    club = models.ForeignKey('Club', on_delete=models.CASCADE, related_name='+')
+    appearance_count = models.PositiveIntegerField(default=0)
+    speaker_count = models.PositiveIntegerField(default=0)
+    seconds = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = (('press', 'club'),)
+
 
 class Interpellation(models.Model):
 
@@ -657,6 +1278,11 @@ class Interpellation(models.Model):
     url = models.URLField()
     description = models.TextField()
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['recipients']),
+        ]
+
     @property
     def status_display(self):
         return self.get_status_display()
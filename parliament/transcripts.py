@@ -0,0 +1,53 @@
+"""
+Compression of debate transcripts.
+
+Transcripts are stored as UTF-8 bytes, compressed with zstd when
+DEBATE_TRANSCRIPT_COMPRESSION is 'zstd'. The zstandard package is needed
+only to write or read compressed transcripts.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+NONE = 0
+ZSTD = 1
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImproperlyConfigured('zstd compressed transcripts require zstandard')
+    return zstandard
+
+
+def compression():
+    """Compression of newly stored transcripts"""
+    if settings.DEBATE_TRANSCRIPT_COMPRESSION is None:
+        return NONE
+    if settings.DEBATE_TRANSCRIPT_COMPRESSION == 'zstd':
+        return ZSTD
+    raise ImproperlyConfigured('Unknown DEBATE_TRANSCRIPT_COMPRESSION {!r}'.format(
+        settings.DEBATE_TRANSCRIPT_COMPRESSION))
+
+
+def compress(text, method=None):
+    """Compression method and stored bytes of transcript text"""
+    method = compression() if method is None else method
+    data = text.encode('utf-8')
+    if method == ZSTD:
+        zstandard = _import_zstandard()
+        compressed = zstandard.ZstdCompressor(
+            level=settings.DEBATE_TRANSCRIPT_COMPRESSION_LEVEL).compress(data)
+        # short transcripts do not shrink
+        if len(compressed) < len(data):
+            return ZSTD, compressed
+    return NONE, data
+
+
+def decompress(method, data):
+    """Transcript text of stored bytes"""
+    data = bytes(data)
+    if method == ZSTD:
+        data = _import_zstandard().ZstdDecompressor().decompress(data)
+    return data.decode('utf-8')
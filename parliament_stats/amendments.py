@@ -0,0 +1,71 @@
+"""
+Outcomes of amendments. Every amendment is stored with the club of its
+main submitter at the date of amendment and the result of the voting
+deciding it, so that success rates of clubs, coalition and opposition are
+aggregations of one table without joining submitters, memberships and
+votings.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+
+from parliament.models import Amendment, AmendmentSubmitter, Club, ClubMember
+from parliament_stats.models import AmendmentOutcome
+
+
+def pending_amendments():
+    """Amendments without outcome or with changed voting or voting result"""
+    outcomes = AmendmentOutcome.objects.filter(amendment=OuterRef('pk'))
+    return Amendment.objects.annotate(
+        has_outcome=Exists(outcomes),
+        same_outcome=Exists(outcomes.filter(
+            voting=OuterRef('voting'), result=OuterRef('voting__result'))),
+        without_voting=Exists(outcomes.filter(voting__isnull=True))
+    ).exclude(
+        Q(has_outcome=True) & (
+            Q(same_outcome=True) | Q(voting__isnull=True, without_voting=True))
+    )
+
+
+def update_amendment_outcomes(amendment_ids):
+    """Recompute and store outcomes of given amendments"""
+    amendment_ids = list(amendment_ids)
+    if not amendment_ids:
+        return 0
+    main = AmendmentSubmitter.objects.filter(amendment=OuterRef('pk'), main=True)
+    submitters = AmendmentSubmitter.objects.filter(
+        amendment=OuterRef('pk')
+    ).order_by().values('amendment').annotate(total=Count('id')).values('total')
+    rows = Amendment.objects.filter(
+        id__in=amendment_ids
+    ).annotate(
+        member=Subquery(main.values('member')[:1]),
+        submitter_count=Subquery(submitters)
+    ).annotate(
+        club=ClubMember.objects.club_at('member', 'date')
+    ).values_list(
+        'id', 'press__period', 'date', 'member', 'club', 'submitter_count', 'voting',
+        'voting__result'
+    )
+    rows = list(rows)
+    coalition = dict(Club.objects.filter(
+        id__in={x[4] for x in rows if x[4]}).values_list('id', 'coalition'))
+
+    outcomes = [
+        AmendmentOutcome(
+            amendment_id=id_,
+            period_id=period,
+            date=date,
+            member_id=member,
+            club_id=club,
+            coalition=coalition.get(club),
+            submitter_count=submitter_count or 0,
+            voting_id=voting,
+            result=result
+        )
+        for id_, period, date, member, club, submitter_count, voting, result in rows
+    ]
+    with transaction.atomic():
+        AmendmentOutcome.objects.filter(amendment__in=amendment_ids).delete()
+        AmendmentOutcome.objects.bulk_create(outcomes)
+    return len(amendment_ids)
@@ -0,0 +1,145 @@
+"""
+Club cohesion analytics. Votes of a batch of votings are loaded as a vote
+matrix and Rice indices, club majorities and rebellions are computed with
+NumPy for all votings and clubs at once.
+"""
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import Coalesce, TruncDate
+import numpy as np
+
+from parliament.models import ClubMember, Voting, VotingVote
+from parliament_stats.models import ClubCohesion, CohesionVoting, MemberRebellion
+
+# for, against and abstain are the votes taking a position
+POSITIONS = (VotingVote.FOR, VotingVote.AGAINST, VotingVote.ABSTAIN)
+NO_CLUB = 0
+NO_MAJORITY = -1
+
+
+def pending_votings():
+    """Votings with votes not yet processed"""
+    return Voting.objects.annotate(
+        has_votes=Exists(VotingVote.objects.filter(voting=OuterRef('pk'))),
+        processed=Exists(CohesionVoting.objects.filter(voting=OuterRef('pk')))
+    ).filter(has_votes=True, processed=False)
+
+
+def load_vote_matrix(voting_ids):
+    """
+    Votes of given votings as (voting, member, vote, club) int64 columns,
+    club is the club of the member at the date of the voting
+    """
+    rows = VotingVote.objects.filter(
+        voting__in=voting_ids
+    ).annotate(
+        voting_date=TruncDate('voting__timestamp')
+    ).annotate(
+        club=Coalesce(ClubMember.objects.club_at('voter', 'voting_date'), Value(NO_CLUB))
+    ).values_list('voting', 'voter', 'vote', 'club').order_by()
+
+    matrix = np.array(list(rows), dtype=np.int64).reshape(-1, 4)
+    return matrix[:, 0], matrix[:, 1], matrix[:, 2], matrix[:, 3]
+
+
+def compute_cohesion(votings, members, votes, clubs):
+    """
+    Compute cohesion of every (voting, club) pair present in the vote columns.
+
+    Returns tuple of cohesion rows (voting, club, majority, rice, members, rebels)
+    and rebellion rows (voting, member, club, vote, club vote) as NumPy arrays.
+    """
+    in_club = clubs != NO_CLUB
+    votings, members, votes, clubs = (
+        votings[in_club], members[in_club], votes[in_club], clubs[in_club])
+
+    voting_keys, voting_idx = np.unique(votings, return_inverse=True)
+    club_keys, club_idx = np.unique(clubs, return_inverse=True)
+    shape = (len(voting_keys), len(club_keys))
+
+    member_counts = np.zeros(shape, dtype=np.int64)
+    np.add.at(member_counts, (voting_idx, club_idx), 1)
+
+    positioned = np.isin(votes, POSITIONS)
+    counts = np.zeros(shape + (len(POSITIONS),), dtype=np.int64)
+    np.add.at(
+        counts,
+        (voting_idx[positioned], club_idx[positioned], votes[positioned]),
+        1
+    )
+
+    ranked = np.sort(counts, axis=2)
+    majority = np.where(
+        ranked[:, :, -1] > ranked[:, :, -2],
+        counts.argmax(axis=2),
+        NO_MAJORITY
+    )
+
+    votes_for = counts[:, :, VotingVote.FOR]
+    votes_against = counts[:, :, VotingVote.AGAINST]
+    decisive = votes_for + votes_against
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rice = np.where(
+            decisive > 0,
+            np.abs(votes_for - votes_against) / decisive,
+            np.nan
+        )
+
+    club_vote = majority[voting_idx, club_idx]
+    rebel = positioned & (club_vote != NO_MAJORITY) & (votes != club_vote)
+    rebel_counts = np.zeros(shape, dtype=np.int64)
+    np.add.at(rebel_counts, (voting_idx[rebel], club_idx[rebel]), 1)
+
+    present = member_counts > 0
+    cohesion = (
+        voting_keys[np.nonzero(present)[0]],
+        club_keys[np.nonzero(present)[1]],
+        majority[present],
+        rice[present],
+        member_counts[present],
+        rebel_counts[present],
+    )
+    rebellions = (
+        votings[rebel], members[rebel], clubs[rebel], votes[rebel], club_vote[rebel]
+    )
+    return cohesion, rebellions
+
+
+def update_cohesion(voting_ids):
+    """Recompute and store cohesion and rebellions of given votings"""
+    voting_ids = list(voting_ids)
+    if not voting_ids:
+        return 0
+    cohesion, rebellions = compute_cohesion(*load_vote_matrix(voting_ids))
+
+    cohesion_objs = [
+        ClubCohesion(
+            voting_id=int(voting),
+            club_id=int(club),
+            majority_vote=None if majority == NO_MAJORITY else int(majority),
+            rice_index=None if np.isnan(rice) else float(rice),
+            member_count=int(member_count),
+            rebel_count=int(rebel_count)
+        )
+        for voting, club, majority, rice, member_count, rebel_count in zip(*cohesion)
+    ]
+    rebellion_objs = [
+        MemberRebellion(
+            voting_id=int(voting),
+            member_id=int(member),
+            club_id=int(club),
+            vote=int(vote),
+            club_vote=int(club_vote)
+        )
+        for voting, member, club, vote, club_vote in zip(*rebellions)
+    ]
+
+    with transaction.atomic():
+        ClubCohesion.objects.filter(voting__in=voting_ids).delete()
+        MemberRebellion.objects.filter(voting__in=voting_ids).delete()
+        ClubCohesion.objects.bulk_create(cohesion_objs)
+        MemberRebellion.objects.bulk_create(rebellion_objs)
+        CohesionVoting.objects.filter(voting__in=voting_ids).delete()
+        CohesionVoting.objects.bulk_create([CohesionVoting(voting_id=x) for x in voting_ids])
+    return len(voting_ids)
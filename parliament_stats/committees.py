@@ -0,0 +1,144 @@
+"""
+Committee workload. Sessions, session points and presses of committees
+are counted per month together with days of memberships, and presses are
+listed per committee with their first and last session, so that
+committee stats of any date range are sums over a few rows.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+
+from parliament.models import (
+    Committee,
+    CommitteeMember,
+    CommitteeSession,
+    CommitteeSessionPoint
+)
+from parliament_stats.models import CommitteeMonth, CommitteePress
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def month_number(prefix):
+    """Expression numbering month of date or datetime at prefix, consecutive over years"""
+    return ExtractYear(prefix) * 12 + ExtractMonth(prefix)
+
+
+def pending_committees():
+    """
+    Committees whose sessions and points differ from their months and
+    presses in number, months or presses, compared by sums
+    """
+    def total(queryset, expression):
+        return Coalesce(Subquery(queryset.filter(
+            committee=OuterRef('pk')
+        ).order_by().values('committee').annotate(
+            total=expression
+        ).values('total'), output_field=IntegerField()), 0)
+
+    sessions = CommitteeSession.objects.all()
+    points = CommitteeSessionPoint.objects.annotate(committee=F('session__committee'))
+    months = CommitteeMonth.objects.all()
+    presses = CommitteePress.objects.all()
+    checksums = (
+        ('sessions', total(sessions, Count('id')), total(months, Sum('session_count'))),
+        ('points', total(points, Count('id')), total(months, Sum('point_count'))),
+        ('session_months', total(sessions, Sum(month_number('start'))), total(months, Sum(
+            F('session_count') * month_number('month'), output_field=IntegerField()))),
+        ('point_months', total(points, Sum(month_number('session__start'))), total(months, Sum(
+            F('point_count') * month_number('month'), output_field=IntegerField()))),
+        ('presses', total(points, Sum('press')), total(presses, Sum(
+            F('press') * F('point_count'), output_field=IntegerField()))),
+    )
+    annotations = {}
+    stale = Q()
+    for name, live, counted in checksums:
+        annotations[name] = live
+        annotations['counted_{}'.format(name)] = counted
+        stale |= ~Q(**{name: F('counted_{}'.format(name))})
+    return Committee.objects.annotate(**annotations).filter(stale)
+
+
+def member_days(memberships, month):
+    """Days of memberships in month, open memberships last until today"""
+    end = next_month(month)
+    days = 0
+    for start, stop in memberships:
+        stop = stop + timedelta(days=1) if stop else date.today()
+        days += max((min(stop, end) - max(start, month)).days, 0)
+    return days
+
+
+def update_committee_stats(committee_ids):
+    """Recompute and store months and presses of given committees"""
+    committee_ids = list(committee_ids)
+    if not committee_ids:
+        return 0
+    sessions = defaultdict(set)
+    points = defaultdict(int)
+    presses = defaultdict(set)
+    handled = {}
+    for committee, session, start, press in CommitteeSessionPoint.objects.filter(
+            session__committee__in=committee_ids).values_list(
+                'session__committee', 'session', 'session__start', 'press'):
+        day = start.date()
+        month = month_start(day)
+        sessions[committee, month].add(session)
+        points[committee, month] += 1
+        if press is None:
+            continue
+        presses[committee, month].add(press)
+        entry = handled.setdefault((committee, press), {
+            'sessions': set(), 'point_count': 0, 'first_date': day, 'last_date': day})
+        entry['sessions'].add(session)
+        entry['point_count'] += 1
+        entry['first_date'] = min(entry['first_date'], day)
+        entry['last_date'] = max(entry['last_date'], day)
+    # sessions without points
+    for committee, session, start in CommitteeSession.objects.filter(
+            committee__in=committee_ids, points__isnull=True).values_list(
+                'committee', 'id', 'start'):
+        sessions[committee, month_start(start.date())].add(session)
+
+    memberships = defaultdict(list)
+    for committee, start, end in CommitteeMember.objects.filter(
+            committee__in=committee_ids).values_list('committee', 'start', 'end'):
+        memberships[committee].append((start, end))
+
+    months = []
+    for (committee, month), month_sessions in sorted(sessions.items()):
+        months.append(CommitteeMonth(
+            committee_id=committee,
+            month=month,
+            session_count=len(month_sessions),
+            point_count=points[committee, month],
+            press_count=len(presses[committee, month]),
+            member_days=member_days(memberships[committee], month)
+        ))
+    committee_presses = [
+        CommitteePress(
+            committee_id=committee,
+            press_id=press,
+            session_count=len(x['sessions']),
+            point_count=x['point_count'],
+            first_date=x['first_date'],
+            last_date=x['last_date']
+        )
+        for (committee, press), x in handled.items()
+    ]
+    with transaction.atomic():
+        CommitteeMonth.objects.filter(committee__in=committee_ids).delete()
+        CommitteePress.objects.filter(committee__in=committee_ids).delete()
+        CommitteeMonth.objects.bulk_create(months)
+        CommitteePress.objects.bulk_create(committee_presses)
+    return len(committee_ids)
@@ -2,16 +2,49 @@
 Graphene Stats
 """
 
-from django.db.models import F, Sum
+from datetime import date
+
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
 
 import graphene
 from graphene import ObjectType
+from graphene.relay import Node
 from graphene.utils.str_converters import to_snake_case
-from graphql_relay.node.node import from_global_id
-
-from parliament.graphql import ClubType
-from parliament.models import Club, Member, Period
-from parliament_stats.models import ClubStats, GlobalStats, MemberStats
+from graphene_django import DjangoObjectType
+from graphql_relay.node.node import from_global_id, to_global_id
+
+from graphql_utils import CountableConnectionBase, OrderedDjangoFilterConnectionField
+from parliament.graphql import ClubType, CommitteeType, MemberType, PressType, SessionType
+from parliament.aggregates import Percentile
+from parliament.models import (
+    Club,
+    Committee,
+    CommitteeMember,
+    DebateAppearance,
+    Interpellation,
+    Member,
+    Period,
+    Session,
+    Voting
+)
+from parliament_stats.models import (
+    AmendmentOutcome,
+    ClubCohesion,
+    ClubStats,
+    CommitteeMonth,
+    CommitteePress,
+    CosponsorshipEdge,
+    CosponsorshipNetwork,
+    CosponsorshipNode,
+    GlobalStats,
+    InterpellationResponse,
+    MemberIdealPoint,
+    MemberRebellion,
+    MemberStats,
+    SpeakingTime
+)
+from parliament_stats.committees import month_start, next_month
 from parliament_stats.types import ColumnStatsType
 
 
@@ -56,6 +89,433 @@ class MemberStatsType(ColumnStatsType):
         exclude_fields = ['id', 'date']
 
 
+class ClubCohesionConnection(CountableConnectionBase):
+    """Adds averageRiceIndex of filtered votings"""
+
+    class Meta:
+        abstract = True
+
+    average_rice_index = graphene.Float()
+
+    def resolve_average_rice_index(self, info, **kwargs):
+        return self.iterable.aggregate(average=Avg('rice_index'))['average']
+
+
+class ClubCohesionType(DjangoObjectType):
+
+    class Meta:
+        model = ClubCohesion
+        description = 'Club Cohesion in Voting'
+        interfaces = (Node,)
+        connection_class = ClubCohesionConnection
+        filter_fields = {
+            'club': ('exact',),
+            'voting': ('exact',),
+            'voting__session__period__period_num': ('exact',),
+        }
+
+
+class MemberRebellionType(DjangoObjectType):
+
+    class Meta:
+        model = MemberRebellion
+        description = 'MP Vote Against Club Majority'
+        interfaces = (Node,)
+        connection_class = CountableConnectionBase
+        filter_fields = {
+            'member': ('exact',),
+            'club': ('exact',),
+            'voting': ('exact',),
+            'voting__session__period__period_num': ('exact',),
+        }
+
+
+class MemberIdealPointType(DjangoObjectType):
+
+    class Meta:
+        model = MemberIdealPoint
+        description = 'MP Ideal Point'
+        interfaces = (Node,)
+        only_fields = ['member', 'dim1', 'dim2', 'correct_share', 'vote_count']
+
+
+class CosponsorshipNodeType(DjangoObjectType):
+
+    class Meta:
+        model = CosponsorshipNode
+        description = 'MP in Co-sponsorship Network'
+        only_fields = [
+            'member', 'club', 'degree', 'strength', 'eigenvector', 'community', 'cross_club_ratio'
+        ]
+
+
+class CosponsorshipEdgeType(ObjectType):
+
+    source = graphene.ID(description='MemberType ID')
+    target = graphene.ID(description='MemberType ID')
+    weight = graphene.Int()
+    bills = graphene.Int()
+    amendments = graphene.Int()
+
+
+class CosponsorshipNetworkType(ObjectType):
+
+    bill_count = graphene.Int()
+    amendment_count = graphene.Int()
+    community_count = graphene.Int()
+    cross_club_ratio = graphene.Float()
+    nodes = graphene.List(CosponsorshipNodeType)
+    edges = graphene.List(CosponsorshipEdgeType, min_weight=graphene.Int())
+
+    def resolve_nodes(self, info):
+        return CosponsorshipNode.objects.filter(period=self.period_id).order_by('-eigenvector')
+
+    def resolve_edges(self, info, min_weight=None):
+        edges = CosponsorshipEdge.objects.filter(period=self.period_id)
+        if min_weight:
+            edges = edges.filter(weight__gte=min_weight)
+        return [
+            CosponsorshipEdgeType(
+                source=to_global_id('MemberType', source),
+                target=to_global_id('MemberType', target),
+                weight=weight,
+                bills=bills,
+                amendments=amendments
+            )
+            for source, target, weight, bills, amendments in edges.values_list(
+                'source', 'target', 'weight', 'bills', 'amendments').order_by('-weight')
+        ]
+
+
+def model_id(global_id, type_name, name):
+    """Model id of global ID of given type"""
+    try:
+        id_type, id_ = from_global_id(global_id)
+    except (TypeError, ValueError):
+        id_type = None
+    if id_type != type_name:
+        raise Exception("Malformed {} ID".format(name))
+    return id_
+
+
+# SpeakingTime fields or expressions grouping the speaking time
+SPEAKING_TIME_GROUPS = {
+    'member': 'member',
+    'club': 'club',
+    'session': 'session',
+    'appearance_type': 'appearance_type',
+    'date': 'date',
+    'month': TruncMonth('date'),
+}
+
+
+class SpeakingTimeGroup(graphene.Enum):
+
+    MEMBER = 'member'
+    CLUB = 'club'
+    SESSION = 'session'
+    APPEARANCE_TYPE = 'appearance_type'
+    DATE = 'date'
+    MONTH = 'month'
+
+
+class SpeakingTimeFilter(graphene.InputObjectType):
+
+    period_num = graphene.Int()
+    member = graphene.ID()
+    club = graphene.ID()
+    session = graphene.ID()
+    appearance_types = graphene.List(graphene.NonNull(graphene.Int))
+    date_from = graphene.Date()
+    date_to = graphene.Date()
+
+
+class SpeakingTimeType(ObjectType):
+    """Speaking time of a group, fields not grouped by are null"""
+
+    member = graphene.Field(MemberType)
+    club = graphene.Field(ClubType)
+    session = graphene.Field(SessionType)
+    appearance_type = graphene.Int()
+    appearance_type_display = graphene.String()
+    date = graphene.Date()
+    month = graphene.Date()
+    appearance_count = graphene.Int()
+    seconds = graphene.Int()
+
+
+def speaking_time(groups, filters, order_by=None, limit=None, ranked=False):
+    """
+    Speaking time summed over cube rows matching filters, per group. Ranked
+    groups leave out rows with null group fields.
+    """
+    filters = filters or {}
+    cube = SpeakingTime.objects.all()
+    if filters.get('period_num') is not None:
+        cube = cube.filter(period__period_num=filters['period_num'])
+    if filters.get('member'):
+        cube = cube.filter(member=model_id(filters['member'], 'MemberType', 'member'))
+    if filters.get('club'):
+        cube = cube.filter(club=model_id(filters['club'], 'ClubType', 'club'))
+    if filters.get('session'):
+        cube = cube.filter(session=model_id(filters['session'], 'SessionType', 'session'))
+    if filters.get('appearance_types'):
+        cube = cube.filter(appearance_type__in=filters['appearance_types'])
+    if filters.get('date_from'):
+        cube = cube.filter(date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        cube = cube.filter(date__lte=filters['date_to'])
+
+    sums = {'appearance_count': Sum('appearance_count'), 'seconds': Sum('seconds')}
+    if groups:
+        # groups are annotations, month is no field of the cube
+        aliases = {x: '{}_group'.format(x) for x in groups}
+        cube = cube.annotate(**{
+            aliases[x]: F(SPEAKING_TIME_GROUPS[x]) if isinstance(SPEAKING_TIME_GROUPS[x], str)
+            else SPEAKING_TIME_GROUPS[x]
+            for x in groups
+        })
+        if ranked:
+            cube = cube.filter(**{'{}__isnull'.format(aliases[x]): False for x in groups})
+        rows = cube.values(*aliases.values()).annotate(**sums)
+
+        def ordering(field):
+            name = field.lstrip('-')
+            return field[:len(field) - len(name)] + aliases.get(name, name)
+
+        rows = rows.order_by(*[ordering(x) for x in order_by or groups])
+        rows = list(rows[:limit] if limit is not None else rows)
+    else:
+        rows = [cube.aggregate(**sums)]
+
+    related = {
+        'member': Member.objects.select_related('person'),
+        'club': Club.objects.all(),
+        'session': Session.objects.all(),
+    }
+    objects = {
+        x: related[x].in_bulk([row['{}_group'.format(x)] for row in rows])
+        for x in groups if x in related
+    }
+    results = []
+    for row in rows:
+        values = {x: row.pop('{}_group'.format(x)) for x in groups}
+        for name, instances in objects.items():
+            values[name] = instances.get(values[name])
+        if 'appearance_type' in values:
+            values['appearance_type_display'] = \
+                DebateAppearance.AppearanceType.values[values['appearance_type']]
+        results.append(SpeakingTimeType(
+            appearance_count=row['appearance_count'] or 0,
+            seconds=row['seconds'] or 0,
+            **values
+        ))
+    return results
+
+
+class InterpellationStatsGroup(graphene.Enum):
+
+    RECIPIENT = 'recipient'
+    CLUB = 'club'
+    STATUS = 'status'
+
+
+class InterpellationStatsType(ObjectType):
+    """Interpellations of a group, fields not grouped by are null. Latencies are in days."""
+
+    recipient = graphene.String()
+    club = graphene.Field(ClubType)
+    status = graphene.Int()
+    status_display = graphene.String()
+    interpellation_count = graphene.Int()
+    responded_count = graphene.Int()
+    mean_latency = graphene.Float()
+    median_latency = graphene.Float()
+    p90_latency = graphene.Float()
+
+
+def interpellation_stats(period_num, groups):
+    """Counts and response latency percentiles of interpellations per group"""
+    responses = InterpellationResponse.objects.filter(period__period_num=period_num)
+    if 'recipient' not in groups:
+        # interpellation with several recipients counts once
+        responses = responses.filter(primary=True)
+    aggregates = {
+        'interpellation_count': Count('id'),
+        'responded_count': Count('id', filter=Q(latency__isnull=False)),
+        'mean_latency': Avg('latency'),
+        'median_latency': Percentile('latency', 0.5),
+        'p90_latency': Percentile('latency', 0.9),
+    }
+    if groups:
+        rows = list(responses.values(*groups).annotate(**aggregates).order_by(*groups))
+    else:
+        rows = [responses.aggregate(**aggregates)]
+
+    clubs = Club.objects.in_bulk([x['club'] for x in rows if x.get('club')]) \
+        if 'club' in groups else {}
+    results = []
+    for row in rows:
+        if 'club' in groups:
+            row['club'] = clubs.get(row['club'])
+        if 'status' in groups:
+            row['status_display'] = Interpellation.StatusType.values[row['status']]
+        results.append(InterpellationStatsType(**row))
+    return results
+
+
+class AmendmentSuccessGroup(graphene.Enum):
+
+    MEMBER = 'member'
+    CLUB = 'club'
+    COALITION = 'coalition'
+
+
+class AmendmentSuccessType(ObjectType):
+    """Amendments of a group by voting result, fields not grouped by are null"""
+
+    member = graphene.Field(MemberType)
+    club = graphene.Field(ClubType)
+    coalition = graphene.Boolean()
+    amendment_count = graphene.Int()
+    voted_count = graphene.Int()
+    passed_count = graphene.Int()
+    success_rate = graphene.Float(description='Share of voted amendments that passed')
+
+
+def amendment_success(period_num, groups):
+    """Counts of voted and passed amendments per group of main submitter"""
+    outcomes = AmendmentOutcome.objects.filter(period__period_num=period_num)
+    aggregates = {
+        'amendment_count': Count('amendment'),
+        'voted_count': Count('amendment', filter=Q(result__isnull=False)),
+        'passed_count': Count('amendment', filter=Q(result=Voting.PASSED)),
+    }
+    if groups:
+        rows = list(outcomes.values(*groups).annotate(**aggregates).order_by(*groups))
+    else:
+        rows = [outcomes.aggregate(**aggregates)]
+
+    related = {
+        'member': Member.objects.select_related('person'),
+        'club': Club.objects.all(),
+    }
+    objects = {
+        x: related[x].in_bulk([row[x] for row in rows if row[x]])
+        for x in groups if x in related
+    }
+    results = []
+    for row in rows:
+        for name, instances in objects.items():
+            row[name] = instances.get(row[name])
+        row['success_rate'] = row['passed_count'] / row['voted_count'] \
+            if row['voted_count'] else None
+        results.append(AmendmentSuccessType(**row))
+    return results
+
+
+class CommitteeMonthType(ObjectType):
+
+    month = graphene.Date()
+    session_count = graphene.Int()
+    point_count = graphene.Int()
+    press_count = graphene.Int()
+    mean_member_count = graphene.Float()
+
+
+class CommitteePressType(ObjectType):
+
+    press = graphene.Field(PressType)
+    session_count = graphene.Int()
+    point_count = graphene.Int()
+    first_date = graphene.Date()
+    last_date = graphene.Date()
+
+
+class CommitteeTenureType(ObjectType):
+
+    member = graphene.Field(MemberType)
+    days = graphene.Int(description='Days of membership in date range')
+    membership = graphene.Int()
+    membership_display = graphene.String()
+
+
+class CommitteeStatsType(ObjectType):
+    """
+    Workload of committee in whole months of date range, presses handled
+    in the range and tenure of its members
+    """
+
+    committee = graphene.Field(CommitteeType)
+    session_count = graphene.Int()
+    point_count = graphene.Int()
+    points_per_session = graphene.Float()
+    press_count = graphene.Int()
+    mean_member_count = graphene.Float()
+    months = graphene.List(CommitteeMonthType)
+    presses = graphene.List(CommitteePressType, description='Presses, most points first')
+    members = graphene.List(CommitteeTenureType, description='Members, longest tenure first')
+
+
+def committee_stats(committee, date_from=None, date_to=None):
+    """Stats of committee from its months, presses and memberships"""
+    months = CommitteeMonth.objects.filter(committee=committee).order_by('month')
+    presses = CommitteePress.objects.filter(committee=committee)
+    memberships = CommitteeMember.objects.filter(committee=committee)
+    if date_from is not None:
+        months = months.filter(month__gte=month_start(date_from))
+        presses = presses.filter(last_date__gte=date_from)
+        memberships = memberships.exclude(end__lt=date_from)
+    if date_to is not None:
+        months = months.filter(month__lte=date_to)
+        presses = presses.filter(first_date__lte=date_to)
+        memberships = memberships.filter(start__lte=date_to)
+
+    month_types = [
+        CommitteeMonthType(
+            month=x.month,
+            session_count=x.session_count,
+            point_count=x.point_count,
+            press_count=x.press_count,
+            mean_member_count=x.member_days / (next_month(x.month) - x.month).days
+        )
+        for x in months
+    ]
+    days = sum((next_month(x.month) - x.month).days for x in month_types)
+
+    tenure = {}
+    for membership in memberships.select_related('member', 'member__person').order_by('start'):
+        start = max(membership.start, date_from) if date_from else membership.start
+        end = min(x for x in (membership.end, date_to, date.today()) if x is not None)
+        entry = tenure.setdefault(membership.member_id, CommitteeTenureType(
+            member=membership.member, days=0))
+        entry.days += max((end - start).days + 1, 0)
+        # latest membership wins
+        entry.membership = membership.membership
+        entry.membership_display = membership.get_membership_display()
+
+    session_count = sum(x.session_count for x in month_types)
+    point_count = sum(x.point_count for x in month_types)
+    return CommitteeStatsType(
+        committee=committee,
+        session_count=session_count,
+        point_count=point_count,
+        points_per_session=point_count / session_count if session_count else None,
+        press_count=presses.count(),
+        mean_member_count=sum(
+            x.mean_member_count * (next_month(x.month) - x.month).days for x in month_types
+        ) / days if days else None,
+        months=month_types,
+        presses=[
+            CommitteePressType(
+                press=x.press, session_count=x.session_count, point_count=x.point_count,
+                first_date=x.first_date, last_date=x.last_date)
+            for x in presses.select_related('press').order_by('-point_count', 'first_date')
+        ],
+        members=sorted(tenure.values(), key=lambda x: -x.days)
+    )
+
+
 class ParliamentStatsQueries(ObjectType):
 
     club_stats = graphene.Field(ClubStatsType, club=graphene.ID(required=True))
@@ -64,6 +524,41 @@ class ParliamentStatsQueries(ObjectType):
     global_club_stats = graphene.relay.ConnectionField(
         GlobalClubStatsConnection, period_num=graphene.Int(required=True))
     member_stats = graphene.Field(MemberStatsType, member=graphene.ID(required=True))
+    club_cohesion = OrderedDjangoFilterConnectionField(
+        ClubCohesionType, orderBy=graphene.List(of_type=graphene.String))
+    member_rebellions = OrderedDjangoFilterConnectionField(
+        MemberRebellionType, orderBy=graphene.List(of_type=graphene.String))
+    member_ideal_points = graphene.List(
+        MemberIdealPointType, period_num=graphene.Int(required=True))
+    cosponsorship_network = graphene.Field(
+        CosponsorshipNetworkType, period_num=graphene.Int(required=True))
+    speaking_time = graphene.List(
+        SpeakingTimeType,
+        group_by=graphene.List(graphene.NonNull(SpeakingTimeGroup)),
+        filters=SpeakingTimeFilter()
+    )
+    amendment_success = graphene.List(
+        AmendmentSuccessType,
+        period_num=graphene.Int(required=True),
+        group_by=graphene.List(graphene.NonNull(AmendmentSuccessGroup))
+    )
+    committee_stats = graphene.Field(
+        CommitteeStatsType,
+        committee=graphene.ID(required=True),
+        date_from=graphene.Date(name='from'),
+        date_to=graphene.Date(name='to')
+    )
+    interpellation_stats = graphene.List(
+        InterpellationStatsType,
+        period_num=graphene.Int(required=True),
+        group_by=graphene.List(graphene.NonNull(InterpellationStatsGroup))
+    )
+    speaking_time_leaderboard = graphene.List(
+        SpeakingTimeType,
+        group_by=SpeakingTimeGroup(default_value=SpeakingTimeGroup.MEMBER.value),
+        filters=SpeakingTimeFilter(),
+        first=graphene.Int(default_value=10)
+    )
 
     def resolve_club_stats(self, info, club):
         try:
@@ -160,3 +655,35 @@ class ParliamentStatsQueries(ObjectType):
         member_stats = list(member.member_stats.all().values('member').annotate(**sums))[0]
         member_stats['member'] = member
         return MemberStatsType(**member_stats)
+
+    def resolve_member_ideal_points(self, info, period_num):
+        return MemberIdealPoint.objects.filter(
+            member__period__period_num=period_num,
+            dim1__isnull=False
+        ).order_by('dim1')
+
+    def resolve_cosponsorship_network(self, info, period_num):
+        if not Period.objects.filter(period_num=period_num).exists():
+            raise Exception("Requested period does not exist")
+        # network of period is built by update_cosponsorship
+        return CosponsorshipNetwork.objects.filter(period__period_num=period_num).first()
+
+    def resolve_speaking_time(self, info, group_by=None, filters=None):
+        return speaking_time(sorted(set(group_by or ())), filters)
+
+    def resolve_speaking_time_leaderboard(self, info, group_by, filters=None, first=10):
+        # speakers who are not MPs have no member and no club, they are not ranked
+        return speaking_time([group_by], filters, ['-seconds', group_by], max(first, 0), True)
+
+    def resolve_interpellation_stats(self, info, period_num, group_by=None):
+        return interpellation_stats(period_num, sorted(set(group_by or ())))
+
+    def resolve_amendment_success(self, info, period_num, group_by=None):
+        return amendment_success(period_num, sorted(set(group_by or ())))
+
+    def resolve_committee_stats(self, info, committee, date_from=None, date_to=None):
+        committee = Committee.objects.filter(
+            id=model_id(committee, 'CommitteeType', 'committee')).first()
+        if committee is None:
+            return None
+        return committee_stats(committee, date_from, date_to)
@@ -0,0 +1,207 @@
+"""
+Spatial scaling of MPs from roll-call votes. Each period is estimated
+separately: the votings x members matrix (for = 1, against or abstain = -1,
+other votes missing) is factored by alternating least squares into voting
+parameters and 1D/2D member ideal points. Estimation itself works on NumPy
+arrays only, so periods can be estimated in parallel worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections, transaction
+from django.db.models import Max
+import numpy as np
+
+from parliament.models import ClubMember, Period, Voting, VotingVote
+from parliament_stats.models import MemberIdealPoint
+
+VOTE_VALUES = {
+    VotingVote.FOR: 1.0,
+    VotingVote.AGAINST: -1.0,
+    VotingVote.ABSTAIN: -1.0,
+}
+# votings where minority is smaller than this share carry no spatial information
+LOPSIDED_SHARE = 0.025
+MIN_MEMBER_VOTES = 20
+RIDGE = 1e-3
+
+
+def load_roll_calls(period):
+    """
+    Roll-call matrix of period as (member ids, votings x members matrix,
+    observed mask, orientation reference)
+    """
+    rows = VotingVote.objects.filter(
+        voting__session__period=period,
+        vote__in=list(VOTE_VALUES)
+    ).values_list('voting', 'voter', 'vote').order_by()
+    data = np.array(list(rows), dtype=np.int64).reshape(-1, 3)
+
+    voting_keys, voting_idx = np.unique(data[:, 0], return_inverse=True)
+    member_keys, member_idx = np.unique(data[:, 1], return_inverse=True)
+    matrix = np.zeros((len(voting_keys), len(member_keys)))
+    mask = np.zeros(matrix.shape, dtype=bool)
+    values = np.zeros(len(data))
+    for vote, value in VOTE_VALUES.items():
+        values[data[:, 2] == vote] = value
+    matrix[voting_idx, member_idx] = values
+    mask[voting_idx, member_idx] = True
+
+    coalition = set(ClubMember.objects.filter(
+        member__in=member_keys.tolist(), club__coalition=True, end__isnull=True
+    ).values_list('member', flat=True))
+    reference = np.array([1.0 if x in coalition else -1.0 for x in member_keys])
+    return member_keys, matrix, mask, reference
+
+
+def _solve(weights, design, targets):
+    """Batched ridge least squares, one system per row of weights"""
+    gram = np.einsum('rn,nk,nl->rkl', weights, design, design)
+    gram += RIDGE * np.eye(design.shape[1])
+    rhs = np.einsum('rn,rn,nk->rk', weights, targets, design)
+    return np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]
+
+
+def _solve_members(weights, design, targets):
+    """Batched ridge least squares, one system per column of weights"""
+    gram = np.einsum('rn,rk,rl->nkl', weights, design, design)
+    gram += RIDGE * np.eye(design.shape[1])
+    rhs = np.einsum('rn,rn,rk->nk', weights, targets, design)
+    return np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]
+
+
+def estimate(matrix, mask, dimensions=2, start=None, reference=None,
+             max_iterations=200, tolerance=1e-5):
+    """
+    Estimate member ideal points from votings x members roll-call matrix.
+
+    ``start`` (members x dimensions, NaN rows unknown) warm-starts the
+    estimation from previous solution. Returns (points, correct share,
+    member vote counts, iterations), points of members with too few votes
+    are NaN.
+    """
+    decided = mask.sum(axis=1)
+    minority = np.minimum(((matrix > 0) & mask).sum(axis=1), ((matrix < 0) & mask).sum(axis=1))
+    used = (decided > 0) & (minority >= np.maximum(1, LOPSIDED_SHARE * decided))
+    matrix, mask = matrix[used], mask[used]
+    vote_counts = mask.sum(axis=0)
+    active = vote_counts >= MIN_MEMBER_VOTES
+
+    points = np.full((matrix.shape[1], dimensions), np.nan)
+    correct = np.full(matrix.shape[1], np.nan)
+    if active.sum() <= dimensions or not used.any():
+        return points, correct, vote_counts, 0
+
+    values, weights = matrix[:, active], mask[:, active].astype(float)
+    # SVD of row-centered, zero-filled matrix gives the cold start
+    centered = values - (values * weights).sum(axis=1, keepdims=True) / weights.sum(axis=1, keepdims=True)
+    centered *= weights
+    _, singular, right = np.linalg.svd(centered, full_matrices=False)
+    x = right[:dimensions].T * singular[:dimensions] / np.sqrt(weights.sum(axis=0))[:, None]
+    if start is not None:
+        known = ~np.isnan(start[active]).any(axis=1)
+        x[known] = start[active][known]
+
+    iteration = 0
+    loss = np.inf
+    for iteration in range(1, max_iterations + 1):
+        design = np.hstack([np.ones((x.shape[0], 1)), x])
+        params = _solve(weights, design, values)
+        intercepts, slopes = params[:, 0], params[:, 1:]
+        x = _solve_members(weights, slopes, values - intercepts[:, None])
+        # ideal points are identified only up to location and scale
+        x -= x.mean(axis=0)
+        x /= np.linalg.norm(x, axis=1).max() or 1.0
+        residuals = (values - intercepts[:, None] - slopes @ x.T) * weights
+        new_loss = (residuals ** 2).sum()
+        if loss - new_loss <= tolerance * new_loss:
+            break
+        loss = new_loss
+
+    # orthogonalize and scale into unit hypersphere
+    _, _, rotation = np.linalg.svd(x, full_matrices=False)
+    x = x @ rotation.T
+    x /= np.linalg.norm(x, axis=1).max() or 1.0
+
+    if start is not None and known.any():
+        signs = np.sign((x[known] * start[active][known]).sum(axis=0))
+    elif reference is not None:
+        signs = np.sign(x.T @ reference[active])
+    else:
+        signs = np.ones(dimensions)
+    x *= np.where(signs == 0, 1.0, signs)
+
+    design = np.hstack([np.ones((x.shape[0], 1)), x])
+    params = _solve(weights, design, values)
+    predicted = np.sign(params[:, :1] + params[:, 1:] @ x.T)
+    correct[active] = ((predicted == values) * weights).sum(axis=0) / weights.sum(axis=0)
+    points[active] = x
+    return points, correct, vote_counts, iteration
+
+
+def _estimate_job(args):
+    member_keys, matrix, mask, reference, dimensions, start = args
+    points, correct, vote_counts, iterations = estimate(
+        matrix, mask, dimensions=dimensions, start=start, reference=reference)
+    return member_keys, points, correct, vote_counts, iterations
+
+
+def pending_periods():
+    """Periods with votings newer than their ideal points"""
+    pending = []
+    for period in Period.objects.all():
+        last_voting = Voting.objects.filter(session__period=period).aggregate(
+            last=Max('id'))['last']
+        if last_voting is None:
+            continue
+        estimated = MemberIdealPoint.objects.filter(member__period=period).aggregate(
+            last=Max('last_voting'))['last']
+        if estimated is None or estimated < last_voting:
+            pending.append(period)
+    return pending
+
+
+def update_ideal_points(periods, dimensions=2, workers=None, warm_start=True):
+    """Estimate ideal points of given periods in a process pool and store them"""
+    jobs = []
+    last_votings = []
+    for period in periods:
+        member_keys, matrix, mask, reference = load_roll_calls(period)
+        start = None
+        if warm_start:
+            previous = {
+                x.member_id: [x.dim1, x.dim2]
+                for x in MemberIdealPoint.objects.filter(member__in=member_keys.tolist())
+                if x.dim1 is not None
+            }
+            if previous:
+                start = np.array([
+                    previous.get(x, [np.nan, np.nan])[:dimensions] for x in member_keys
+                ], dtype=float)
+        jobs.append((member_keys, matrix, mask, reference, dimensions, start))
+        last_votings.append(Voting.objects.filter(
+            session__period=period).aggregate(last=Max('id'))['last'])
+
+    # forked workers must not share open database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_estimate_job, jobs))
+
+    for last_voting, (member_keys, points, correct, vote_counts, iterations) in zip(
+            last_votings, results):
+        objs = []
+        for member, point, share, count in zip(member_keys, points, correct, vote_counts):
+            estimated = not np.isnan(point).any()
+            objs.append(MemberIdealPoint(
+                member_id=int(member),
+                dim1=float(point[0]) if estimated else None,
+                dim2=float(point[1]) if estimated and dimensions > 1 else None,
+                correct_share=float(share) if estimated else None,
+                vote_count=int(count),
+                iterations=iterations,
+                last_voting=last_voting
+            ))
+        with transaction.atomic():
+            MemberIdealPoint.objects.filter(member__in=member_keys.tolist()).delete()
+            MemberIdealPoint.objects.bulk_create(objs)
+    return len(jobs)
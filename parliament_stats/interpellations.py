@@ -0,0 +1,85 @@
+"""
+Response times of interpellations. Every interpellation is stored once per
+recipient with its status and the days passed until the session it was
+answered in, so that counts and latency percentiles per recipient, club
+or status are aggregations of one small table.
+"""
+
+from django.db import transaction
+from django.db.models import DateField, Exists, F, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Least, TruncDate
+
+from parliament.models import ClubMember, DebateAppearance, Interpellation, Voting
+from parliament_stats.models import InterpellationResponse
+
+
+def session_start(session):
+    """Subquery of first day of outer session reference, None for sessions without records"""
+    def first_day(queryset, field):
+        return Subquery(queryset.filter(
+            session=OuterRef(session)
+        ).order_by().values('session').annotate(
+            day=Min(TruncDate(field))
+        ).values('day'), output_field=DateField())
+
+    votings = first_day(Voting.objects.all(), 'timestamp')
+    appearances = first_day(DebateAppearance.objects.all(), 'start')
+    # LEAST ignores nulls
+    return Least(votings, appearances, output_field=DateField())
+
+
+def pending_interpellations():
+    """Interpellations without responses or with changed status or response session"""
+    responses = InterpellationResponse.objects.filter(interpellation=OuterRef('pk'))
+    return Interpellation.objects.annotate(
+        has_responses=Exists(responses),
+        same_response=Exists(responses.filter(
+            status=OuterRef('status'), response_session=OuterRef('response_session'))),
+        without_response=Exists(responses.filter(
+            status=OuterRef('status'), response_session__isnull=True))
+    ).exclude(
+        Q(has_responses=True) & (
+            Q(same_response=True) | Q(response_session__isnull=True, without_response=True))
+    )
+
+
+def update_interpellation_responses(interpellation_ids):
+    """Recompute and store responses of given interpellations"""
+    interpellation_ids = list(interpellation_ids)
+    if not interpellation_ids:
+        return 0
+    rows = Interpellation.objects.filter(
+        id__in=interpellation_ids
+    ).annotate(
+        club=ClubMember.objects.club_at('asked_by', 'date'),
+        asked_session=Coalesce(
+            session_start('interpellation_session'), F('date'), output_field=DateField()),
+        responded=session_start('response_session')
+    ).values_list(
+        'id', 'period', 'recipients', 'club', 'status', 'response_session', 'asked_session',
+        'responded'
+    )
+
+    responses = []
+    for id_, period, recipients, club, status, response_session, asked, responded in rows:
+        latency = None
+        if responded is not None:
+            # responses recorded before the interpellation are ingestion errors
+            latency = max((responded - asked).days, 0)
+        for position, recipient in enumerate(recipients or ['']):
+            responses.append(InterpellationResponse(
+                interpellation_id=id_,
+                period_id=period,
+                recipient=recipient,
+                primary=position == 0,
+                club_id=club,
+                status=status,
+                response_session_id=response_session,
+                asked=asked,
+                responded=responded,
+                latency=latency
+            ))
+    with transaction.atomic():
+        InterpellationResponse.objects.filter(interpellation__in=interpellation_ids).delete()
+        InterpellationResponse.objects.bulk_create(responses)
+    return len(interpellation_ids)
@@ -0,0 +1,50 @@
+"""
+Store outcomes of amendments. Run after each ingestion of amendments and
+votings, only amendments not stored yet or with changed voting or voting
+result are processed unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Amendment
+from parliament_stats.amendments import pending_amendments, update_amendment_outcomes
+
+
+class Command(BaseCommand):
+
+    help = 'Update AmendmentOutcome rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Recompute outcomes of all amendments, not only changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to amendments of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of amendments processed at once'
+        )
+
+    def handle(self, *args, **options):
+        amendments = Amendment.objects.all() if options['all'] else pending_amendments()
+        if options['period']:
+            amendments = amendments.filter(press__period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(amendments.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += update_amendment_outcomes(ids[offset:offset + batch_size])
+        self.stdout.write('Updated outcomes of {} amendments'.format(total))
@@ -0,0 +1,50 @@
+"""
+Compute club cohesion and MP rebellions of votings. Run after each
+ingestion of votings, only votings not processed yet are computed
+unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Voting
+from parliament_stats.cohesion import pending_votings, update_cohesion
+
+
+class Command(BaseCommand):
+
+    help = 'Update ClubCohesion and MemberRebellion rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Recompute cohesion of all votings, not only new ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to votings of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of votings processed at once'
+        )
+
+    def handle(self, *args, **options):
+        votings = Voting.objects.all() if options['all'] else pending_votings()
+        if options['period']:
+            votings = votings.filter(session__period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(votings.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += update_cohesion(ids[offset:offset + batch_size])
+        self.stdout.write('Updated cohesion of {} votings'.format(total))
@@ -0,0 +1,51 @@
+"""
+Count committee sessions, points and presses per month. Run after each
+ingestion of committee sessions, only committees with new or removed
+sessions or points are processed unless --all is given. Use --all after
+changes of committee memberships.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Committee
+from parliament_stats.committees import pending_committees, update_committee_stats
+
+
+class Command(BaseCommand):
+
+    help = 'Update CommitteeMonth and CommitteePress rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Recompute stats of all committees, not only changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to committees of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=20,
+            help='Number of committees processed at once'
+        )
+
+    def handle(self, *args, **options):
+        committees = Committee.objects.all() if options['all'] else pending_committees()
+        if options['period']:
+            committees = committees.filter(period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(committees.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += update_committee_stats(ids[offset:offset + batch_size])
+        self.stdout.write('Updated stats of {} committees'.format(total))
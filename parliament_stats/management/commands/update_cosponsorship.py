@@ -0,0 +1,42 @@
+"""
+Build co-sponsorship networks of periods. Only periods with changed
+numbers of bills or amendments are rebuilt unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Period
+from parliament_stats.network import build_network, pending_periods
+
+
+class Command(BaseCommand):
+
+    help = 'Update CosponsorshipNetwork, CosponsorshipNode and CosponsorshipEdge rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Rebuild networks of all periods'
+        )
+        parser.add_argument(
+            '--period',
+            action='append',
+            dest='periods',
+            type=int,
+            help='Period number to rebuild, can be repeated'
+        )
+
+    def handle(self, *args, **options):
+        if options['periods']:
+            periods = Period.objects.filter(period_num__in=options['periods'])
+        elif options['all']:
+            periods = Period.objects.all()
+        else:
+            periods = pending_periods()
+
+        for period in periods:
+            nodes, edges = build_network(period)
+            self.stdout.write('Period {}: {} nodes, {} edges'.format(
+                period.period_num, nodes, edges))
@@ -0,0 +1,67 @@
+"""
+Estimate MP ideal points from roll-call votes. Only periods with new
+votings are estimated unless --period or --all is given, estimation
+warm-starts from stored ideal points unless --cold is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Period
+from parliament_stats.ideal_points import pending_periods, update_ideal_points
+
+
+class Command(BaseCommand):
+
+    help = 'Update MemberIdealPoint rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Estimate all periods, not only periods with new votings'
+        )
+        parser.add_argument(
+            '--period',
+            action='append',
+            dest='periods',
+            type=int,
+            help='Period number to estimate, can be repeated'
+        )
+        parser.add_argument(
+            '--dimensions',
+            action='store',
+            dest='dimensions',
+            type=int,
+            choices=(1, 2),
+            default=2,
+        )
+        parser.add_argument(
+            '--workers',
+            action='store',
+            dest='workers',
+            type=int,
+            help='Number of worker processes, defaults to number of CPUs'
+        )
+        parser.add_argument(
+            '--cold',
+            action='store_false',
+            dest='warm_start',
+            help='Do not start from previously stored ideal points'
+        )
+
+    def handle(self, *args, **options):
+        if options['periods']:
+            periods = Period.objects.filter(period_num__in=options['periods'])
+        elif options['all']:
+            periods = Period.objects.all()
+        else:
+            periods = pending_periods()
+
+        total = update_ideal_points(
+            periods,
+            dimensions=options['dimensions'],
+            workers=options['workers'],
+            warm_start=options['warm_start']
+        )
+        self.stdout.write('Estimated ideal points of {} periods'.format(total))
@@ -0,0 +1,54 @@
+"""
+Store response times of interpellations per recipient. Run after each
+ingestion of interpellations, only interpellations not stored yet or with
+changed status or response session are processed unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Interpellation
+from parliament_stats.interpellations import (
+    pending_interpellations,
+    update_interpellation_responses
+)
+
+
+class Command(BaseCommand):
+
+    help = 'Update InterpellationResponse rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Recompute responses of all interpellations, not only changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to interpellations of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=500,
+            help='Number of interpellations processed at once'
+        )
+
+    def handle(self, *args, **options):
+        interpellations = Interpellation.objects.all() if options['all'] \
+            else pending_interpellations()
+        if options['period']:
+            interpellations = interpellations.filter(period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(interpellations.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += update_interpellation_responses(ids[offset:offset + batch_size])
+        self.stdout.write('Updated responses of {} interpellations'.format(total))
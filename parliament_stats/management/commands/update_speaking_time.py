@@ -0,0 +1,50 @@
+"""
+Sum debate appearances into the speaking time cube. Run after each
+ingestion of debate appearances, only sessions with new or removed
+appearances are processed unless --all is given.
+"""
+
+from django.core.management.base import BaseCommand
+
+from parliament.models import Session
+from parliament_stats.speaking import pending_sessions, update_speaking_time
+
+
+class Command(BaseCommand):
+
+    help = 'Update SpeakingTime rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            help='Recompute speaking time of all sessions, not only changed ones'
+        )
+        parser.add_argument(
+            '--period',
+            action='store',
+            dest='period',
+            type=int,
+            help='Limit to sessions of given period number'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=50,
+            help='Number of sessions processed at once'
+        )
+
+    def handle(self, *args, **options):
+        sessions = Session.objects.all() if options['all'] else pending_sessions()
+        if options['period']:
+            sessions = sessions.filter(period__period_num=options['period'])
+
+        batch_size = options['batch_size']
+        ids = list(sessions.order_by('id').values_list('id', flat=True))
+        total = 0
+        for offset in range(0, len(ids), batch_size):
+            total += update_speaking_time(ids[offset:offset + batch_size])
+        self.stdout.write('Updated speaking time of {} sessions'.format(total))
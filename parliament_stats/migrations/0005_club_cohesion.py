@@ -0,0 +1,48 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0060_voting_tallies'),
+        ('parliament_stats', '0004_auto_20190106_2231'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberRebellion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vote', models.SmallIntegerField(choices=[(0, 'Za'), (1, 'Proti'), (2, 'Zdržal(a) sa'), (3, 'Nehlasoval(a)'), (4, 'Neprítomná/ý')])),
+                ('club_vote', models.SmallIntegerField(choices=[(0, 'Za'), (1, 'Proti'), (2, 'Zdržal(a) sa'), (3, 'Nehlasoval(a)'), (4, 'Neprítomná/ý')])),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rebellions', to='parliament.Club')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rebellions', to='parliament.Member')),
+                ('voting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rebellions', to='parliament.Voting')),
+            ],
+            options={
+                'verbose_name': 'MP Rebellion',
+                'verbose_name_plural': 'MP Rebellions',
+                'unique_together': {('voting', 'member')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ClubCohesion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('majority_vote', models.SmallIntegerField(blank=True, choices=[(0, 'Za'), (1, 'Proti'), (2, 'Zdržal(a) sa'), (3, 'Nehlasoval(a)'), (4, 'Neprítomná/ý')], null=True)),
+                ('rice_index', models.FloatField(blank=True, null=True)),
+                ('member_count', models.PositiveSmallIntegerField()),
+                ('rebel_count', models.PositiveSmallIntegerField()),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cohesion', to='parliament.Club')),
+                ('voting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='club_cohesion', to='parliament.Voting')),
+            ],
+            options={
+                'verbose_name': 'Club Cohesion',
+                'verbose_name_plural': 'Club Cohesion',
+                'unique_together': {('voting', 'club')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0060_voting_tallies'),
+        ('parliament_stats', '0005_club_cohesion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberIdealPoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dim1', models.FloatField(blank=True, null=True)),
+                ('dim2', models.FloatField(blank=True, null=True)),
+                ('correct_share', models.FloatField(blank=True, null=True)),
+                ('vote_count', models.PositiveIntegerField()),
+                ('iterations', models.PositiveSmallIntegerField()),
+                ('last_voting', models.PositiveIntegerField()),
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ideal_point', to='parliament.Member')),
+            ],
+            options={
+                'verbose_name': 'MP Ideal Point',
+                'verbose_name_plural': 'MP Ideal Points',
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0060_voting_tallies'),
+        ('parliament_stats', '0006_member_ideal_point'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CosponsorshipNode',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('degree', models.PositiveIntegerField()),
+                ('strength', models.PositiveIntegerField()),
+                ('eigenvector', models.FloatField()),
+                ('community', models.PositiveIntegerField()),
+                ('cross_club_ratio', models.FloatField(blank=True, null=True)),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Club')),
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cosponsorship', to='parliament.Member')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Period')),
+            ],
+            options={
+                'verbose_name': 'Co-sponsorship Node',
+                'verbose_name_plural': 'Co-sponsorship Nodes',
+            },
+        ),
+        migrations.CreateModel(
+            name='CosponsorshipNetwork',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bill_count', models.PositiveIntegerField()),
+                ('amendment_count', models.PositiveIntegerField()),
+                ('community_count', models.PositiveIntegerField()),
+                ('cross_club_ratio', models.FloatField(blank=True, null=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('period', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cosponsorship_network', to='parliament.Period')),
+            ],
+            options={
+                'verbose_name': 'Co-sponsorship Network',
+                'verbose_name_plural': 'Co-sponsorship Networks',
+            },
+        ),
+        migrations.CreateModel(
+            name='CosponsorshipEdge',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.PositiveIntegerField()),
+                ('bills', models.PositiveIntegerField()),
+                ('amendments', models.PositiveIntegerField()),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Period')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Member')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Member')),
+            ],
+            options={
+                'verbose_name': 'Co-sponsorship Edge',
+                'verbose_name_plural': 'Co-sponsorship Edges',
+                'unique_together': {('source', 'target')},
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0062_bill_club'),
+        ('parliament_stats', '0007_cosponsorship_network'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpeakingTime',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('appearance_type', models.SmallIntegerField(choices=[(0, '-'), (1, 'Doplňujúca otázka / reakcia zadávajúceho'), (2, 'Prednesenie interpelácie'), (3, 'Prednesenie otázky'), (4, 'Uvádzajúci uvádza bod'), (5, 'Vstup predsedajúceho'), (6, 'Vystúpenie'), (7, 'Vystúpenie s faktickou poznámkou'), (8, 'Vystúpenie s procedurálnym návrhom'), (9, 'Vystúpenie spoločného spravodajcu'), (10, 'Vystúpenie v rozprave'), (11, 'Zodpovedanie otázky')])),
+                ('date', models.DateField()),
+                ('appearance_count', models.PositiveIntegerField()),
+                ('seconds', models.PositiveIntegerField()),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Club')),
+                ('member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='speaking_time', to='parliament.Member')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Period')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='speaking_time', to='parliament.Session')),
+            ],
+            options={
+                'verbose_name': 'Speaking Time',
+                'verbose_name_plural': 'Speaking Time',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='speakingtime',
+            index=models.Index(fields=['period', 'date'], name='parliament__period__081515_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='speakingtime',
+            index=models.Index(fields=['member', 'date'], name='parliament__member__60ef7b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='speakingtime',
+            index=models.Index(fields=['club', 'date'], name='parliament__club_id_9120e8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='speakingtime',
+            index=models.Index(fields=['session', 'appearance_type'], name='parliament__session_0cca28_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0065_interpellation_recipients_index'),
+        ('parliament_stats', '0008_speaking_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterpellationResponse',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.CharField(blank=True, max_length=64)),
+                ('primary', models.BooleanField(default=False)),
+                ('status', models.SmallIntegerField(choices=[(0, 'Príjem odpovede na interpeláciu'), (1, 'Rokovanie o interpelácii'), (2, 'Uzavretá odpoveď na interpeláciu'), (3, 'Interpelácia na expedíciu')])),
+                ('asked', models.DateField()),
+                ('responded', models.DateField(blank=True, null=True)),
+                ('latency', models.PositiveIntegerField(blank=True, null=True)),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Club')),
+                ('interpellation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='parliament.Interpellation')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Period')),
+                ('response_session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Session')),
+            ],
+            options={
+                'verbose_name': 'Interpellation Response',
+                'verbose_name_plural': 'Interpellation Responses',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='interpellationresponse',
+            index=models.Index(fields=['period', 'recipient'], name='parliament__period__d4e2f4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interpellationresponse',
+            index=models.Index(fields=['period', 'club'], name='parliament__period__de5646_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0065_interpellation_recipients_index'),
+        ('parliament_stats', '0009_interpellation_response'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AmendmentOutcome',
+            fields=[
+                ('amendment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='outcome', serialize=False, to='parliament.Amendment')),
+                ('date', models.DateField()),
+                ('coalition', models.NullBooleanField()),
+                ('submitter_count', models.PositiveSmallIntegerField()),
+                ('result', models.SmallIntegerField(blank=True, choices=[(0, 'Návrh prešiel'), (1, 'Návrh neprešiel'), (2, 'Parlament nebol uznášaniaschopný')], null=True)),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Club')),
+                ('member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Member')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Period')),
+                ('voting', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Voting')),
+            ],
+            options={
+                'verbose_name': 'Amendment Outcome',
+                'verbose_name_plural': 'Amendment Outcomes',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='amendmentoutcome',
+            index=models.Index(fields=['period', 'club'], name='parliament__period__a739f5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='amendmentoutcome',
+            index=models.Index(fields=['period', 'coalition'], name='parliament__period__8cd9ac_idx'),
+        ),
+    ]
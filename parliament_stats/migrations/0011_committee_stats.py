@@ -0,0 +1,59 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0065_interpellation_recipients_index'),
+        ('parliament_stats', '0010_amendment_outcome'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommitteePress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_count', models.PositiveIntegerField()),
+                ('point_count', models.PositiveIntegerField()),
+                ('first_date', models.DateField()),
+                ('last_date', models.DateField()),
+                ('committee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='handled_presses', to='parliament.Committee')),
+                ('press', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parliament.Press')),
+            ],
+            options={
+                'verbose_name': 'Committee Press',
+                'verbose_name_plural': 'Committee Presses',
+            },
+        ),
+        migrations.CreateModel(
+            name='CommitteeMonth',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('session_count', models.PositiveIntegerField()),
+                ('point_count', models.PositiveIntegerField()),
+                ('press_count', models.PositiveIntegerField()),
+                ('member_days', models.PositiveIntegerField()),
+                ('committee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='months', to='parliament.Committee')),
+            ],
+            options={
+                'verbose_name': 'Committee Month',
+                'verbose_name_plural': 'Committee Months',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='committeepress',
+            index=models.Index(fields=['committee', 'first_date'], name='parliament__committ_d391d7_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='committeepress',
+            unique_together={('committee', 'press')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='committeemonth',
+            unique_together={('committee', 'month')},
+        ),
+    ]
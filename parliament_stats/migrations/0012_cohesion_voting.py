@@ -0,0 +1,33 @@
+# Generated by Django 2.2.12 on 2026-10-19 20:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0067_debate_transcript_compression_attempted'),
+        ('parliament_stats', '0011_committee_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohesionVoting',
+            fields=[
+                ('voting', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='parliament.Voting')),
+                ('computed', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Cohesion Voting',
+                'verbose_name_plural': 'Cohesion Votings',
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO parliament_stats_cohesionvoting (voting_id, computed)
+            SELECT DISTINCT voting_id, now() FROM parliament_stats_clubcohesion;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -4,6 +4,8 @@ Aggregated stats from parliament app
 
 from django.db import models
 
+from parliament.models import DebateAppearance, Interpellation, Voting, VotingVote
+
 
 class GlobalStats(models.Model):
 
@@ -98,3 +100,302 @@ class MemberStats(models.Model):
         unique_together = (('member', 'date',))
         verbose_name = 'MP Stats'
         verbose_name_plural = verbose_name
+
+
+class ClubCohesionManager(models.Manager):
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('voting', 'club')
+
+
+class ClubCohesion(models.Model):
+    """
+    Cohesion of club in a voting. Rice index is computed from for and
+    against votes, majority is the most common of for, against and abstain
+    votes (null on tie or when no member voted)
+    """
+    voting = models.ForeignKey(
+        'parliament.Voting', on_delete=models.CASCADE, related_name='club_cohesion')
+    club = models.ForeignKey(
+        'parliament.Club', on_delete=models.CASCADE, related_name='cohesion')
+    majority_vote = models.SmallIntegerField(
+        choices=VotingVote.OPTIONS, null=True, blank=True)
+    rice_index = models.FloatField(null=True, blank=True)
+    member_count = models.PositiveSmallIntegerField()
+    rebel_count = models.PositiveSmallIntegerField()
+
+    objects = ClubCohesionManager()
+
+    class Meta:
+        unique_together = (('voting', 'club',))
+        verbose_name = 'Club Cohesion'
+        verbose_name_plural = verbose_name
+
+
+class CohesionVoting(models.Model):
+    """
+    Voting processed by cohesion analytics, also votings whose voters
+    were in no club and have no ClubCohesion rows
+    """
+    voting = models.OneToOneField(
+        'parliament.Voting', on_delete=models.CASCADE, primary_key=True, related_name='+')
+    computed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Cohesion Voting'
+        verbose_name_plural = 'Cohesion Votings'
+
+
+class MemberRebellionManager(models.Manager):
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('voting', 'member', 'club')
+
+
+class MemberRebellion(models.Model):
+    """
+    Vote of club member against the majority of the club
+    """
+    voting = models.ForeignKey(
+        'parliament.Voting', on_delete=models.CASCADE, related_name='rebellions')
+    member = models.ForeignKey(
+        'parliament.Member', on_delete=models.CASCADE, related_name='rebellions')
+    club = models.ForeignKey(
+        'parliament.Club', on_delete=models.CASCADE, related_name='rebellions')
+    vote = models.SmallIntegerField(choices=VotingVote.OPTIONS)
+    club_vote = models.SmallIntegerField(choices=VotingVote.OPTIONS)
+
+    objects = MemberRebellionManager()
+
+    class Meta:
+        unique_together = (('voting', 'member',))
+        verbose_name = 'MP Rebellion'
+        verbose_name_plural = 'MP Rebellions'
+
+
+class MemberIdealPointManager(models.Manager):
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'member', 'member__person', 'member__period', 'member__stood_for_party')
+
+
+class MemberIdealPoint(models.Model):
+    """
+    MP ideal point estimated from roll-call votes of the period,
+    coordinates are null for MPs with too few votes
+    """
+    member = models.OneToOneField(
+        'parliament.Member', on_delete=models.CASCADE, related_name='ideal_point')
+    dim1 = models.FloatField(null=True, blank=True)
+    dim2 = models.FloatField(null=True, blank=True)
+    correct_share = models.FloatField(null=True, blank=True)
+    vote_count = models.PositiveIntegerField()
+    iterations = models.PositiveSmallIntegerField()
+    last_voting = models.PositiveIntegerField()
+
+    objects = MemberIdealPointManager()
+
+    class Meta:
+        verbose_name = 'MP Ideal Point'
+        verbose_name_plural = 'MP Ideal Points'
+
+
+class CosponsorshipNetwork(models.Model):
+    """
+    Summary of period co-sponsorship network, document counts tell
+    whether the stored network is up to date
+    """
+    period = models.OneToOneField(
+        'parliament.Period', on_delete=models.CASCADE, related_name='cosponsorship_network')
+    bill_count = models.PositiveIntegerField()
+    amendment_count = models.PositiveIntegerField()
+    community_count = models.PositiveIntegerField()
+    cross_club_ratio = models.FloatField(null=True, blank=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Co-sponsorship Network'
+        verbose_name_plural = 'Co-sponsorship Networks'
+
+
+class CosponsorshipNodeManager(models.Manager):
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'member', 'member__person', 'member__period', 'member__stood_for_party', 'club')
+
+
+class CosponsorshipNode(models.Model):
+    """
+    MP in co-sponsorship network with centrality, community and share of
+    co-sponsorships with MPs of other clubs
+    """
+    period = models.ForeignKey(
+        'parliament.Period', on_delete=models.CASCADE, related_name='+')
+    member = models.OneToOneField(
+        'parliament.Member', on_delete=models.CASCADE, related_name='cosponsorship')
+    club = models.ForeignKey(
+        'parliament.Club', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    degree = models.PositiveIntegerField()
+    strength = models.PositiveIntegerField()
+    eigenvector = models.FloatField()
+    community = models.PositiveIntegerField()
+    cross_club_ratio = models.FloatField(null=True, blank=True)
+
+    objects = CosponsorshipNodeManager()
+
+    class Meta:
+        verbose_name = 'Co-sponsorship Node'
+        verbose_name_plural = 'Co-sponsorship Nodes'
+
+
+class CosponsorshipEdge(models.Model):
+    """
+    Number of bills and amendments co-sponsored by two MPs,
+    source is always the MP with lower id
+    """
+    period = models.ForeignKey(
+        'parliament.Period', on_delete=models.CASCADE, related_name='+')
+    source = models.ForeignKey('parliament.Member', on_delete=models.CASCADE, related_name='+')
+    target = models.ForeignKey('parliament.Member', on_delete=models.CASCADE, related_name='+')
+    weight = models.PositiveIntegerField()
+    bills = models.PositiveIntegerField()
+    amendments = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = (('source', 'target'),)
+        verbose_name = 'Co-sponsorship Edge'
+        verbose_name_plural = 'Co-sponsorship Edges'
+
+
+class SpeakingTime(models.Model):
+    """
+    Debate appearances of MP (null for speakers who are not MPs) in session
+    on a day by appearance type, club is the club of MP at that day
+    """
+    period = models.ForeignKey(
+        'parliament.Period', on_delete=models.CASCADE, related_name='+')
+    session = models.ForeignKey(
+        'parliament.Session', on_delete=models.CASCADE, related_name='speaking_time')
+    member = models.ForeignKey(
+        'parliament.Member', on_delete=models.CASCADE, null=True, blank=True,
+        related_name='speaking_time')
+    club = models.ForeignKey(
+        'parliament.Club', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    appearance_type = models.SmallIntegerField(
+        choices=DebateAppearance.AppearanceType.choices)
+    date = models.DateField()
+    appearance_count = models.PositiveIntegerField()
+    seconds = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['period', 'date']),
+            models.Index(fields=['member', 'date']),
+            models.Index(fields=['club', 'date']),
+            models.Index(fields=['session', 'appearance_type']),
+        ]
+        verbose_name = 'Speaking Time'
+        verbose_name_plural = verbose_name
+
+
+class InterpellationResponse(models.Model):
+    """
+    Interpellation addressed to recipient, one row per recipient, primary
+    for the first one. Club is the club of asking MP at the date of
+    interpellation. Sessions start on their first voting or debate
+    appearance, latency is in days from start of interpellation session to
+    start of response session.
+    """
+    interpellation = models.ForeignKey(
+        'parliament.Interpellation', on_delete=models.CASCADE, related_name='responses')
+    period = models.ForeignKey(
+        'parliament.Period', on_delete=models.CASCADE, related_name='+')
+    recipient = models.CharField(max_length=64, blank=True)
+    primary = models.BooleanField(default=False)
+    club = models.ForeignKey(
+        'parliament.Club', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    status = models.SmallIntegerField(choices=Interpellation.StatusType.choices)
+    response_session = models.ForeignKey(
+        'parliament.Session', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    asked = models.DateField()
+    responded = models.DateField(null=True, blank=True)
+    latency = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['period', 'recipient']),
+            models.Index(fields=['period', 'club']),
+        ]
+        verbose_name = 'Interpellation Response'
+        verbose_name_plural = 'Interpellation Responses'
+
+
+class AmendmentOutcome(models.Model):
+    """
+    Amendment with its main submitter, club of main submitter at the date
+    of amendment and result of voting deciding it, null when not voted on
+    """
+    amendment = models.OneToOneField(
+        'parliament.Amendment', on_delete=models.CASCADE, primary_key=True,
+        related_name='outcome')
+    period = models.ForeignKey(
+        'parliament.Period', on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    member = models.ForeignKey(
+        'parliament.Member', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    club = models.ForeignKey(
+        'parliament.Club', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    coalition = models.NullBooleanField()
+    submitter_count = models.PositiveSmallIntegerField()
+    voting = models.ForeignKey(
+        'parliament.Voting', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    result = models.SmallIntegerField(choices=Voting.RESULTS, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['period', 'club']),
+            models.Index(fields=['period', 'coalition']),
+        ]
+        verbose_name = 'Amendment Outcome'
+        verbose_name_plural = 'Amendment Outcomes'
+
+
+class CommitteeMonth(models.Model):
+    """
+    Sessions and session points of committee in a month. Presses are
+    counted once per month, member days are days of all memberships in the
+    month.
+    """
+    committee = models.ForeignKey(
+        'parliament.Committee', on_delete=models.CASCADE, related_name='months')
+    month = models.DateField()
+    session_count = models.PositiveIntegerField()
+    point_count = models.PositiveIntegerField()
+    press_count = models.PositiveIntegerField()
+    member_days = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = (('committee', 'month'),)
+        verbose_name = 'Committee Month'
+        verbose_name_plural = 'Committee Months'
+
+
+class CommitteePress(models.Model):
+    """Press handled by committee with its first and last session on it"""
+    committee = models.ForeignKey(
+        'parliament.Committee', on_delete=models.CASCADE, related_name='handled_presses')
+    press = models.ForeignKey('parliament.Press', on_delete=models.CASCADE, related_name='+')
+    session_count = models.PositiveIntegerField()
+    point_count = models.PositiveIntegerField()
+    first_date = models.DateField()
+    last_date = models.DateField()
+
+    class Meta:
+        unique_together = (('committee', 'press'),)
+        indexes = [
+            models.Index(fields=['committee', 'first_date']),
+        ]
+        verbose_name = 'Committee Press'
+        verbose_name_plural = 'Committee Presses'
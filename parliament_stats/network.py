@@ -0,0 +1,192 @@
+"""
+Co-sponsorship network analytics. Bills (proposers) and amendments
+(submitters and signed members) of a period form a sparse documents x
+members incidence matrix, the members x members adjacency is its product
+weighted by the number of shared bills and amendments.
+"""
+
+from django.db import transaction
+from django.db.models import Count
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh
+
+from parliament.models import (
+    AmendmentSignedMember,
+    AmendmentSubmitter,
+    BillProposer,
+    ClubMember,
+    Period
+)
+from parliament_stats.models import CosponsorshipEdge, CosponsorshipNetwork, CosponsorshipNode
+
+NO_CLUB = 0
+MAX_PROPAGATION_ROUNDS = 100
+
+
+def document_counts(period):
+    """Numbers of co-sponsored documents, network is rebuilt when they change"""
+    bill_count = BillProposer.objects.filter(
+        bill__press__period=period).aggregate(total=Count('bill', distinct=True))['total']
+    amendment_count = AmendmentSubmitter.objects.filter(
+        amendment__press__period=period).aggregate(total=Count('amendment', distinct=True))['total']
+    return bill_count, amendment_count
+
+
+def pending_periods():
+    """Periods whose stored network is missing or outdated"""
+    networks = {x.period_id: x for x in CosponsorshipNetwork.objects.all()}
+    pending = []
+    for period in Period.objects.all():
+        network = networks.get(period.id)
+        counts = document_counts(period)
+        if network is None or (network.bill_count, network.amendment_count) != counts:
+            pending.append(period)
+    return pending
+
+
+def incidence(pairs, members):
+    """Sparse documents x members matrix from (document, member) pairs"""
+    pairs = np.array(list(pairs), dtype=np.int64).reshape(-1, 2)
+    _, document_idx = np.unique(pairs[:, 0], return_inverse=True)
+    member_idx = np.searchsorted(members, pairs[:, 1])
+    return sparse.csr_matrix(
+        (np.ones(len(pairs)), (document_idx, member_idx)),
+        shape=(document_idx.max() + 1 if len(pairs) else 0, len(members))
+    )
+
+
+def co_occurrence(matrix):
+    """Members x members co-sponsorship counts without self loops"""
+    adjacency = (matrix.T @ matrix).tocsr()
+    if not adjacency.shape[0]:
+        # period without co-sponsored documents
+        return adjacency
+    adjacency = adjacency - sparse.diags(adjacency.diagonal(), format='csr')
+    adjacency.eliminate_zeros()
+    return adjacency
+
+
+def eigenvector_centrality(adjacency):
+    """Leading eigenvector of adjacency scaled to max 1"""
+    if adjacency.shape[0] < 3 or adjacency.nnz == 0:
+        strength = np.asarray(adjacency.sum(axis=1), dtype=float).ravel()
+        return strength / (strength.max(initial=0) or 1.0)
+    try:
+        _, vectors = eigsh(adjacency.astype(float), k=1, which='LA')
+        vector = np.abs(vectors[:, 0])
+    except ArpackNoConvergence as exc:
+        vector = np.abs(exc.eigenvectors[:, 0]) if exc.eigenvectors.size else \
+            np.asarray(adjacency.sum(axis=1)).ravel()
+    return vector / (vector.max() or 1.0)
+
+
+def label_propagation(adjacency):
+    """
+    Communities by weighted label propagation. Every node adopts the label
+    with highest weight among itself and its neighbours until labels settle.
+    """
+    size = adjacency.shape[0]
+    labels = np.arange(size)
+    if not size:
+        return labels
+    weights = adjacency + sparse.identity(size, format='csr')
+    for _ in range(MAX_PROPAGATION_ROUNDS):
+        membership = sparse.csr_matrix((np.ones(size), (np.arange(size), labels)), shape=(size, size))
+        scores = weights @ membership
+        new_labels = np.asarray(scores.argmax(axis=1)).ravel()
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    # renumber communities from 0 by size
+    keys, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    order = np.argsort(-counts, kind='stable')
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[order] = np.arange(len(keys))
+    return rank[inverse]
+
+
+def member_clubs(period, members):
+    """Last club of each member in the period"""
+    clubs = {}
+    for member, club in ClubMember.objects.filter(
+            member__period=period).order_by('start').values_list('member', 'club'):
+        clubs[member] = club
+    return np.array([clubs.get(x, NO_CLUB) for x in members], dtype=np.int64)
+
+
+def build_network(period):
+    """Compute and store co-sponsorship network of period"""
+    bill_pairs = list(BillProposer.objects.filter(
+        bill__press__period=period).values_list('bill', 'member').order_by())
+    amendment_pairs = list(AmendmentSubmitter.objects.filter(
+        amendment__press__period=period).values_list('amendment', 'member').order_by())
+    amendment_pairs += list(AmendmentSignedMember.objects.filter(
+        amendment__press__period=period).values_list('amendment', 'member').order_by())
+    # submitter may also be among signed members
+    amendment_pairs = list(set(amendment_pairs))
+
+    members = np.unique(np.array(
+        [x[1] for x in bill_pairs] + [x[1] for x in amendment_pairs], dtype=np.int64))
+    bills = co_occurrence(incidence(bill_pairs, members))
+    amendments = co_occurrence(incidence(amendment_pairs, members))
+    adjacency = (bills + amendments).tocsr()
+
+    clubs = member_clubs(period, members)
+    strength = np.asarray(adjacency.sum(axis=1)).ravel()
+    degree = np.diff(adjacency.indptr)
+    centrality = eigenvector_centrality(adjacency)
+    communities = label_propagation(adjacency)
+
+    coo = sparse.triu(adjacency, k=1).tocoo()
+    cross = (clubs[coo.row] != clubs[coo.col]) & (clubs[coo.row] != NO_CLUB) & \
+        (clubs[coo.col] != NO_CLUB)
+    cross_strength = np.zeros(len(members))
+    np.add.at(cross_strength, coo.row[cross], coo.data[cross])
+    np.add.at(cross_strength, coo.col[cross], coo.data[cross])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cross_ratio = np.where(strength > 0, cross_strength / strength, np.nan)
+    total_weight = coo.data.sum()
+    edge_bills = np.asarray(bills[coo.row, coo.col]).ravel()
+    edge_amendments = np.asarray(amendments[coo.row, coo.col]).ravel()
+
+    bill_count, amendment_count = document_counts(period)
+    nodes = [
+        CosponsorshipNode(
+            period=period,
+            member_id=int(member),
+            club_id=int(club) if club != NO_CLUB else None,
+            degree=int(member_degree),
+            strength=int(member_strength),
+            eigenvector=float(member_centrality),
+            community=int(community),
+            cross_club_ratio=None if np.isnan(ratio) else float(ratio)
+        )
+        for member, club, member_degree, member_strength, member_centrality, community, ratio
+        in zip(members, clubs, degree, strength, centrality, communities, cross_ratio)
+    ]
+    edges = [
+        CosponsorshipEdge(
+            period=period,
+            source_id=int(members[row]),
+            target_id=int(members[col]),
+            weight=int(weight),
+            bills=int(shared_bills),
+            amendments=int(shared_amendments)
+        )
+        for row, col, weight, shared_bills, shared_amendments
+        in zip(coo.row, coo.col, coo.data, edge_bills, edge_amendments)
+    ]
+
+    with transaction.atomic():
+        CosponsorshipNode.objects.filter(period=period).delete()
+        CosponsorshipEdge.objects.filter(period=period).delete()
+        CosponsorshipNode.objects.bulk_create(nodes)
+        CosponsorshipEdge.objects.bulk_create(edges)
+        CosponsorshipNetwork.objects.update_or_create(period=period, defaults={
+            'bill_count': bill_count,
+            'amendment_count': amendment_count,
+            'community_count': int(communities.max()) + 1 if len(communities) else 0,
+            'cross_club_ratio': float(coo.data[cross].sum() / total_weight) if total_weight else None,
+        })
+    return len(nodes), len(edges)
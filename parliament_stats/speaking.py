@@ -0,0 +1,78 @@
+"""
+Speaking time cube. Debate appearances are summed per MP, session,
+appearance type and day, so that speaking time of any slice is a lookup
+or a small aggregation of the cube instead of a scan of appearances.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+from parliament.models import ClubMember, DebateAppearance, Session
+from parliament_stats.models import SpeakingTime
+
+
+def pending_sessions():
+    """
+    Sessions whose appearances differ from the cube in number, seconds,
+    appearance types or debaters, compared by sums over the session
+    """
+    appearances = DebateAppearance.objects.filter(
+        session=OuterRef('pk')
+    ).annotate(seconds=DebateAppearance.duration_seconds()).order_by().values('session')
+    summed = SpeakingTime.objects.filter(session=OuterRef('pk')).order_by().values('session')
+    checksums = (
+        ('appearances', Count('id'), Sum('appearance_count')),
+        ('seconds', Sum('seconds'), Sum('seconds')),
+        ('types', Sum('appearance_type'), Sum(
+            F('appearance_type') * F('appearance_count'), output_field=IntegerField())),
+        ('debaters', Sum('debater'), Sum(
+            F('member') * F('appearance_count'), output_field=IntegerField())),
+    )
+    annotations = {}
+    stale = Q()
+    for name, live, stored in checksums:
+        annotations[name] = Coalesce(Subquery(
+            appearances.annotate(total=live).values('total'), output_field=IntegerField()), 0)
+        annotations['{}_summed'.format(name)] = Coalesce(Subquery(
+            summed.annotate(total=stored).values('total'), output_field=IntegerField()), 0)
+        stale |= ~Q(**{name: F('{}_summed'.format(name))})
+    return Session.objects.annotate(**annotations).filter(stale)
+
+
+def update_speaking_time(session_ids):
+    """Recompute and store cube rows of given sessions"""
+    session_ids = list(session_ids)
+    if not session_ids:
+        return 0
+    rows = DebateAppearance.objects.filter(
+        session__in=session_ids
+    ).annotate(
+        day=TruncDate('start')
+    ).annotate(
+        club=ClubMember.objects.club_at('debater', 'day'),
+        seconds=DebateAppearance.duration_seconds()
+    ).values(
+        'session', 'session__period', 'debater', 'club', 'appearance_type', 'day'
+    ).annotate(
+        appearance_count=Count('id'),
+        total=Sum('seconds')
+    ).order_by()
+
+    cube = [
+        SpeakingTime(
+            period_id=x['session__period'],
+            session_id=x['session'],
+            member_id=x['debater'],
+            club_id=x['club'],
+            appearance_type=x['appearance_type'],
+            date=x['day'],
+            appearance_count=x['appearance_count'],
+            seconds=x['total']
+        )
+        for x in rows
+    ]
+    with transaction.atomic():
+        SpeakingTime.objects.filter(session__in=session_ids).delete()
+        SpeakingTime.objects.bulk_create(cube)
+    return len(session_ids)
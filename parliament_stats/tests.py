@@ -1,3 +1,55 @@
+from datetime import date, datetime
+
 from django.test import TestCase
+from django.utils import timezone
+
+from otvorenyparlament.graphql import SCHEMA
+from parliament.models import Club, ClubMember, DebateAppearance, Member, Party, Period, Session
+from parliament_stats.graphql import SpeakingTimeGroup
+from parliament_stats.speaking import update_speaking_time
+from person.models import Person
+
+
+class SpeakingTimeTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        period = Period.objects.create(period_num=1, start_date=date(2020, 1, 1))
+        session = Session.objects.create(
+            name='1. schôdza', external_id=1, period=period, session_num=1,
+            url='https://example.com/session')
+        club = Club.objects.create(period=period, name='Klub')
+        member = Member.objects.create(
+            person=Person.objects.create(forename='Ján', surname='Novák', external_id=1),
+            period=period, stood_for_party=Party.objects.create(name='Strana'),
+            url='https://example.com/member')
+        ClubMember.objects.create(club=club, member=member, start=date(2020, 1, 1))
+        for external_id, debater, minutes in ((1, member, 5), (2, None, 3)):
+            start = timezone.make_aware(datetime(2020, 2, 3, 10, 0))
+            DebateAppearance.objects.create(
+                external_id=external_id, session=session, start=start,
+                end=start + timezone.timedelta(minutes=minutes), debater=debater,
+                appearance_type=DebateAppearance.AppearanceType.appearance,
+                video_url='https://example.com/video')
+        update_speaking_time([session.id])
+
+    def execute(self, query):
+        result = SCHEMA.execute(query, context_value=type('Context', (), {})())
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def test_speaking_time_groups(self):
+        for group in SpeakingTimeGroup._meta.enum:
+            with self.subTest(group=group.name):
+                data = self.execute(
+                    '{ speakingTime(groupBy: [%s]) { appearanceCount seconds } }' % group.name)
+                self.assertEqual(sum(x['seconds'] for x in data['speakingTime']), 480)
 
-# Create your tests here.
+    def test_speaking_time_leaderboard_groups(self):
+        for group in SpeakingTimeGroup._meta.enum:
+            with self.subTest(group=group.name):
+                data = self.execute(
+                    '{ speakingTimeLeaderboard(groupBy: %s) { seconds } }' % group.name)
+                # the speaker who is not an MP is not ranked by member or club
+                expected = 300 if group.name in ('MEMBER', 'CLUB') else 480
+                self.assertEqual(data['speakingTimeLeaderboard'][0]['seconds'], expected)